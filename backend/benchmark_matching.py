@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the BharatVapari matching engine
+Generates a synthetic catalog in a scratch database, times the scoring
+functions and the matching endpoints, and compares against stored baselines
+
+Usage:
+    python benchmark_matching.py --users 10000 --jobs 2000
+    python benchmark_matching.py --users 10000 --jobs 2000 --save-baseline main
+    python benchmark_matching.py --users 10000 --jobs 2000 --compare main
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+from dotenv import load_dotenv
+
+# Load environment variables
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+DEFAULT_BASELINE_FILE = ROOT_DIR / 'benchmark_baselines.json'
+INSERT_BATCH_SIZE = 5000
+
+SKILLS = [
+    "python", "javascript", "react", "node.js", "fastapi", "django", "mongodb", "sql",
+    "aws", "docker", "kubernetes", "java", "go", "rust", "typescript", "figma",
+    "product management", "marketing", "sales", "content writing", "seo", "excel",
+    "data analysis", "machine learning", "deep learning", "nlp", "flutter", "kotlin",
+    "swift", "ui/ux", "graphql", "redis", "c++", "tableau", "finance", "operations"
+]
+LOCATIONS = ["Bangalore", "Mumbai", "Delhi", "Pune", "Hyderabad", "Chennai", "Kolkata", "Remote", "Hybrid - Bangalore", "Hybrid - Pune"]
+JOB_TYPES = ["full-time", "part-time", "internship", "contract", "freelance"]
+WORK_TYPES = ["remote", "on-site", "hybrid"]
+EXPERIENCE_LEVELS = ["student", "fresher", "1-3yrs", "3-5yrs", "5+yrs"]
+TITLE_PREFIXES = ["Junior", "Senior", "Lead", "Associate", "Intern -", ""]
+TITLE_ROLES = ["Backend Engineer", "Frontend Developer", "Data Analyst", "Product Manager", "Designer", "Marketing Associate", "Growth Hacker"]
+CAREER_GOALS = ["learning", "growth", "leadership", "stability", "entrepreneurship"]
+STARTUP_STAGES = ["idea", "mvp", "early", "growth", "scale"]
+
+
+def salary_range_for(rng: random.Random):
+    """Salary strings in the shapes posted by real startups"""
+    kind = rng.random()
+    if kind < 0.15:
+        return None
+    if kind < 0.5:
+        low = rng.randrange(10, 80) * 1000
+        return f"₹{low:,} - ₹{low + rng.randrange(5, 40) * 1000:,}"
+    if kind < 0.8:
+        low = rng.randrange(3, 20)
+        return f"{low}-{low + rng.randrange(1, 10)} LPA"
+    return f"₹{rng.randrange(5, 60)}k/month"
+
+
+def make_seeker(rng: random.Random, now: str) -> tuple[dict, dict]:
+    user_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+    skills = rng.sample(SKILLS, rng.randint(2, 8))
+    salary_min = rng.choice([None, rng.randrange(10, 60) * 1000])
+    user = {
+        "id": user_id,
+        "email": f"bench-{user_id}@example.com",
+        "full_name": f"Bench Seeker {user_id[:8]}",
+        "role": "job_seeker",
+        "skills": skills,
+        "created_at": now,
+        "updated_at": now
+    }
+    preferences = {
+        "user_id": user_id,
+        "job_types": rng.sample(JOB_TYPES, rng.randint(1, 3)),
+        "preferred_domains": [],
+        "experience_level": rng.choice(EXPERIENCE_LEVELS),
+        "work_type": rng.sample(WORK_TYPES, rng.randint(1, 2)),
+        "preferred_locations": rng.sample(LOCATIONS, rng.randint(0, 3)),
+        "salary_min": salary_min,
+        "salary_max": salary_min + rng.randrange(5, 40) * 1000 if salary_min else None,
+        "working_hours": "flexible",
+        "availability": rng.choice(["immediate", "within_x_days"]),
+        "availability_days": None,
+        "hard_skills": skills[:rng.randint(1, len(skills))],
+        "soft_skills": [],
+        "career_goals": rng.sample(CAREER_GOALS, rng.randint(1, 2)),
+        "completed": True,
+        "updated_at": now
+    }
+    return user, preferences
+
+
+def make_job(rng: random.Random, posted_by: str, now: str) -> tuple[dict, dict]:
+    job_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+    requirements = rng.sample(SKILLS, rng.randint(2, 6))
+    title = f"{rng.choice(TITLE_PREFIXES)} {rng.choice(TITLE_ROLES)}".strip()
+    job = {
+        "id": job_id,
+        "title": title,
+        "company": f"Bench Startup {posted_by[:6]}",
+        "description": f"{title} at a fast growing startup",
+        "requirements": requirements,
+        "location": rng.choice(LOCATIONS),
+        "job_type": rng.choice(JOB_TYPES),
+        "salary_range": salary_range_for(rng),
+        "posted_by": posted_by,
+        "created_at": now,
+        "status": "active"
+    }
+    job_prefs = {
+        "job_id": job_id,
+        "ideal_experience": rng.choice(EXPERIENCE_LEVELS[1:]),
+        "must_have_skills": requirements[:rng.randint(1, len(requirements))],
+        "good_to_have_skills": rng.sample(SKILLS, rng.randint(0, 3)),
+        "hiring_priorities": [],
+        "team_size": rng.randint(2, 50),
+        "startup_stage": rng.choice(STARTUP_STAGES),
+        "immediate_joiner": rng.random() < 0.3,
+        "flexibility_days": None,
+        "updated_at": now
+    }
+    return job, job_prefs
+
+
+async def insert_pairs(first, second, pairs):
+    """Insert a stream of paired documents into two collections in fixed size batches"""
+    firsts, seconds = [], []
+    for a, b in pairs:
+        firsts.append(a)
+        seconds.append(b)
+        if len(firsts) >= INSERT_BATCH_SIZE:
+            await first.insert_many(firsts, ordered=False)
+            await second.insert_many(seconds, ordered=False)
+            firsts, seconds = [], []
+    if firsts:
+        await first.insert_many(firsts, ordered=False)
+        await second.insert_many(seconds, ordered=False)
+
+
+async def generate_catalog(server, users: int, jobs: int, seed: int) -> dict:
+    """Populate the scratch database with a deterministic synthetic catalog"""
+    db = server.db
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).isoformat()
+    startups = max(1, jobs // 10)
+
+    startup_users = [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "email": f"bench-startup-{i}@example.com",
+            "full_name": f"Bench Startup {i}",
+            "role": "startup",
+            "created_at": now,
+            "updated_at": now
+        }
+        for i in range(startups)
+    ]
+    await db.users.insert_many(startup_users)
+
+    seeker_ids = []
+    job_ids = []
+    job_owners = {}
+
+    def seekers():
+        for _ in range(users):
+            user, preferences = make_seeker(rng, now)
+            seeker_ids.append(user['id'])
+            yield user, preferences
+
+    def postings():
+        for _ in range(jobs):
+            owner = rng.choice(startup_users)['id']
+            job, job_prefs = make_job(rng, owner, now)
+            job['features'] = server.extract_job_features(job)
+            job_ids.append(job['id'])
+            job_owners[job['id']] = owner
+            yield job, job_prefs
+
+    await insert_pairs(db.users, db.job_seeker_preferences, seekers())
+    await insert_pairs(db.jobs, db.startup_job_preferences, postings())
+    await server.rebuild_skill_index()
+
+    return {"seeker_ids": seeker_ids, "job_ids": job_ids, "job_owners": job_owners}
+
+
+def summarize(durations: list, elapsed: float) -> dict:
+    """Latency percentiles in milliseconds and throughput in operations per second"""
+    samples = np.array(durations) * 1000
+    return {
+        "samples": len(durations),
+        "throughput_ops": round(len(durations) / elapsed, 2) if elapsed else None,
+        "p50_ms": round(float(np.percentile(samples, 50)), 3),
+        "p95_ms": round(float(np.percentile(samples, 95)), 3),
+        "p99_ms": round(float(np.percentile(samples, 99)), 3),
+        "max_ms": round(float(samples.max()), 3)
+    }
+
+
+async def timed(calls) -> dict:
+    """Run awaitable factories sequentially, timing each one"""
+    durations = []
+    started = time.perf_counter()
+    for call in calls:
+        begin = time.perf_counter()
+        await call()
+        durations.append(time.perf_counter() - begin)
+    return summarize(durations, time.perf_counter() - started)
+
+
+async def bench_scoring(server, catalog: dict, samples: int, rng: random.Random) -> dict:
+    """Time the per-pair scoring functions on random seeker/job pairs"""
+    db = server.db
+    seeker_ids = rng.sample(catalog['seeker_ids'], min(samples, len(catalog['seeker_ids'])))
+    job_ids = rng.sample(catalog['job_ids'], min(samples, len(catalog['job_ids'])))
+    users = {u['id']: u for u in await db.users.find({"id": {"$in": seeker_ids}}, {"_id": 0, "password": 0}).to_list(None)}
+    prefs = {p['user_id']: p for p in await db.job_seeker_preferences.find({"user_id": {"$in": seeker_ids}}, {"_id": 0}).to_list(None)}
+    jobs = {j['id']: j for j in await db.jobs.find({"id": {"$in": job_ids}}, {"_id": 0}).to_list(None)}
+    job_prefs = {p['job_id']: p for p in await db.startup_job_preferences.find({"job_id": {"$in": job_ids}}, {"_id": 0}).to_list(None)}
+    pairs = [(rng.choice(seeker_ids), rng.choice(job_ids)) for _ in range(samples)]
+    idf = await server.term_idf(await server.job_catalog_version())
+
+    def job_call(user_id, job_id):
+        async def call():
+            server.calculate_job_match_score(jobs[job_id], prefs[user_id], users[user_id], idf)
+        return call
+
+    def candidate_call(user_id, job_id):
+        async def call():
+            server.calculate_candidate_match_score(users[user_id], jobs[job_id], job_prefs[job_id], prefs[user_id])
+        return call
+
+    return {
+        "calculate_job_match_score": await timed([job_call(u, j) for u, j in pairs]),
+        "calculate_candidate_match_score": await timed([candidate_call(u, j) for u, j in pairs])
+    }
+
+
+async def bench_endpoints(server, catalog: dict, samples: int, rng: random.Random) -> dict:
+    """Time the matching endpoints end to end through the ASGI app"""
+    import httpx
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    for handler in server.app.router.on_startup:
+        await handler()
+
+    seeker_ids = rng.sample(catalog['seeker_ids'], min(samples, len(catalog['seeker_ids'])))
+    job_ids = rng.sample(catalog['job_ids'], min(samples, len(catalog['job_ids'])))
+    transport = httpx.ASGITransport(app=server.app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench/api", timeout=None) as http:
+        def get(path, token):
+            async def call():
+                response = await http.get(path, headers={"Authorization": f"Bearer {token}"})
+                response.raise_for_status()
+            return call
+
+        seeker_calls = [
+            get("/ai/job-matches", server.create_token(user_id, f"bench-{user_id}@example.com", "job_seeker"))
+            for user_id in seeker_ids
+        ]
+        candidate_calls = [
+            get(f"/ai/candidate-matches/{job_id}", server.create_token(catalog['job_owners'][job_id], "bench@example.com", "startup"))
+            for job_id in job_ids
+        ]
+
+        # The first request per seeker or job materializes its match rows;
+        # repeating it measures the precomputed read path
+        return {
+            "GET /ai/job-matches (cold)": await timed(seeker_calls),
+            "GET /ai/job-matches (warm)": await timed(seeker_calls),
+            "GET /ai/candidate-matches (cold)": await timed(candidate_calls),
+            "GET /ai/candidate-matches (warm)": await timed(candidate_calls)
+        }
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_baselines(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_results(results: dict, baseline: dict, tolerance: float) -> list:
+    """Benchmarks whose p95 latency regressed beyond the tolerance"""
+    regressions = []
+    for name, stats in results.items():
+        previous = baseline['results'].get(name)
+        if not previous:
+            continue
+        limit = previous['p95_ms'] * (1 + tolerance)
+        status = "REGRESSED" if stats['p95_ms'] > limit else "ok"
+        print(f"  {name:<40} p95 {previous['p95_ms']:>10.3f} -> {stats['p95_ms']:>10.3f} ms  {status}")
+        if status == "REGRESSED":
+            regressions.append(name)
+    return regressions
+
+
+def print_results(results: dict):
+    print(f"  {'benchmark':<40} {'ops/s':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}")
+    for name, stats in results.items():
+        print(f"  {name:<40} {stats['throughput_ops']:>10} {stats['p50_ms']:>10} {stats['p95_ms']:>10} {stats['p99_ms']:>10}")
+
+
+async def run_benchmarks(args) -> int:
+    # Point the app at the scratch database before it is imported
+    real_db_name = os.environ.get('DB_NAME')
+    bench_db_name = args.db_name or f"{real_db_name or 'bharatvapari'}_bench"
+    if bench_db_name == real_db_name:
+        print("❌ Benchmark database must differ from DB_NAME")
+        return 1
+    os.environ['DB_NAME'] = bench_db_name
+    os.environ.setdefault('LLM_PROVIDER', 'stub')
+    os.environ.setdefault('ANN_INDEX_DIR', tempfile.mkdtemp(prefix='bench_ann_'))
+
+    import server
+
+    print("=" * 60)
+    print("BHARATVAPARI MATCHING BENCHMARK")
+    print("=" * 60)
+    print(f"Database: {bench_db_name}  users: {args.users}  jobs: {args.jobs}  seed: {args.seed}")
+
+    await server.client.drop_database(bench_db_name)
+    started = time.perf_counter()
+    catalog = await generate_catalog(server, args.users, args.jobs, args.seed)
+    print(f"Generated catalog in {time.perf_counter() - started:.1f}s")
+    print()
+
+    rng = random.Random(args.seed + 1)
+    results = await bench_scoring(server, catalog, args.samples, rng)
+    if not args.skip_endpoints:
+        results.update(await bench_endpoints(server, catalog, args.endpoint_samples, rng))
+
+    print_results(results)
+    print()
+
+    if not args.keep_data:
+        await server.client.drop_database(bench_db_name)
+
+    baselines = load_baselines(args.baseline_file)
+    exit_code = 0
+
+    if args.compare:
+        baseline = baselines.get(args.compare)
+        if not baseline:
+            print(f"❌ No baseline named {args.compare} in {args.baseline_file}")
+            return 1
+        if baseline['scale'] != {"users": args.users, "jobs": args.jobs}:
+            print(f"⚠️  Baseline {args.compare} was recorded at scale {baseline['scale']}")
+        print(f"Comparing against baseline {args.compare} ({baseline['commit']}):")
+        regressions = compare_results(results, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}")
+            exit_code = 1
+        else:
+            print("✅ No regressions")
+        print()
+
+    if args.save_baseline:
+        baselines[args.save_baseline] = {
+            "commit": current_commit(),
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "scale": {"users": args.users, "jobs": args.jobs},
+            "seed": args.seed,
+            "results": results
+        }
+        with open(args.baseline_file, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"✅ Saved baseline {args.save_baseline} to {args.baseline_file}")
+
+    server.client.close()
+    return exit_code
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the matching engine on a synthetic catalog")
+    parser.add_argument("--users", type=int, default=10000, help="synthetic job seekers (1k to 1M)")
+    parser.add_argument("--jobs", type=int, default=2000, help="synthetic active jobs")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--samples", type=int, default=2000, help="pairs timed per scoring function")
+    parser.add_argument("--endpoint-samples", type=int, default=50, help="seekers and jobs timed per endpoint")
+    parser.add_argument("--skip-endpoints", action="store_true", help="only time the scoring functions")
+    parser.add_argument("--db-name", help="scratch database (default: <DB_NAME>_bench)")
+    parser.add_argument("--keep-data", action="store_true", help="keep the scratch database afterwards")
+    parser.add_argument("--baseline-file", type=Path, default=DEFAULT_BASELINE_FILE)
+    parser.add_argument("--save-baseline", metavar="NAME", help="store these results as a named baseline")
+    parser.add_argument("--compare", metavar="NAME", help="fail if p95 regresses against a named baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 regression (default 20%%)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run_benchmarks(parse_args())))
@@ -60,7 +60,7 @@ async def create_admin():
         return
     
     # Create admin
-    hashed = bcrypt.hashpw(password.encode(), bcrypt.gensalt())
+    hashed = bcrypt.hashpw(password.encode(), bcrypt.gensalt(int(os.environ.get('BCRYPT_ROUNDS', '12'))))
     admin_doc = {
         "id": str(uuid.uuid4()),
         "email": email,
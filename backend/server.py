@@ -1,9 +1,24 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, File, UploadFile, Header, Response, Request
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, File, UploadFile, Header, Response, Request, WebSocket, WebSocketDisconnect
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne, ReplaceOne
+from pymongo.errors import DuplicateKeyError, PyMongoError
 import os
+import asyncio
+import base64
+import heapq
+import json
+import hashlib
+import time
+import tempfile
+import zlib
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import Counter, OrderedDict, deque
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict, EmailStr, validator
@@ -13,9 +28,10 @@ import uuid
 from datetime import datetime, timezone, timedelta
 import jwt
 import bcrypt
+import numpy as np
 from emergentintegrations.llm.chat import LlmChat, UserMessage
 import razorpay
-import requests
+import httpx
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -269,6 +285,7 @@ class SessionBookingCreate(BaseModel):
 class Message(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    conversation_id: Optional[str] = None
     sender_id: str
     receiver_id: str
     content: str
@@ -366,6 +383,10 @@ class StartupJobPreferencesCreate(BaseModel):
     immediate_joiner: bool = False
     flexibility_days: Optional[int] = None
 
+class CandidateMatrixRequest(BaseModel):
+    job_ids: Optional[List[str]] = None  # defaults to all of the startup's active jobs
+    top_n: int = 10
+
 class JobMatch(BaseModel):
     job_id: str
     job_title: str
@@ -377,6 +398,7 @@ class JobMatch(BaseModel):
     salary_match: int
     location_match: int
     experience_match: int
+    semantic_match: int = 0
 
 class CandidateMatch(BaseModel):
     user_id: str
@@ -390,6 +412,116 @@ class CandidateMatch(BaseModel):
     suggested_questions: List[str]
 
 # Helper Functions
+_background_tasks = set()
+
+def run_in_background(coro) -> asyncio.Task:
+    """Schedule a coroutine on the event loop, keeping a reference until it finishes"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+class TTLCache:
+    """Bounded in-process cache with per-entry expiry and LRU eviction"""
+
+    _MISSING = object()
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key, self._MISSING)
+        if entry is self._MISSING or entry[1] < time.monotonic():
+            if entry is not self._MISSING:
+                del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key):
+        self._entries.pop(key, None)
+
+    def discard_where(self, predicate) -> int:
+        """Drop every entry whose value matches the predicate"""
+        keys = [key for key, (value, _) in self._entries.items() if predicate(value)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions
+        }
+
+class UserLoader:
+    """Per-request batch loader for user documents
+
+    load() calls made in the same event loop pass are coalesced into one $in
+    query, and each id is fetched at most once for the loader's lifetime.
+    Handlers get a fresh loader per request through Depends(user_loader).
+    """
+
+    def __init__(self, projection: Optional[dict] = None):
+        self.projection = projection or {"_id": 0, "password": 0}
+        self._results = {}
+        self._pending = []
+
+    async def load(self, user_id: str) -> Optional[dict]:
+        future = self._results.get(user_id)
+        if future is None:
+            future = self._results[user_id] = asyncio.get_running_loop().create_future()
+            self._pending.append(user_id)
+            if len(self._pending) == 1:
+                # Runs after the other loads already scheduled in this pass
+                run_in_background(self._dispatch())
+        return await future
+
+    async def load_many(self, user_ids) -> List[Optional[dict]]:
+        return list(await asyncio.gather(*(self.load(user_id) for user_id in user_ids)))
+
+    async def _dispatch(self):
+        user_ids, self._pending = self._pending, []
+        try:
+            users = {
+                user['id']: user
+                async for user in db.users.find({"id": {"$in": user_ids}}, self.projection)
+            }
+        except Exception as e:
+            for user_id in user_ids:
+                self._results.pop(user_id).set_exception(e)
+            return
+        for user_id in user_ids:
+            self._results[user_id].set_result(users.get(user_id))
+
+def user_loader() -> UserLoader:
+    return UserLoader()
+
 def get_session_token(request: Request, authorization: str = Header(None)) -> Optional[str]:
     """Get session token from cookie or Authorization header"""
     # Try cookie first (httpOnly)
@@ -403,6 +535,77 @@ def get_session_token(request: Request, authorization: str = Header(None)) -> Op
     
     return None
 
+# Resolved tokens are cached per process so authenticated requests skip the
+# session and user lookups. Writes that change a user or their sessions drop the
+# local entries; other workers see the change once SESSION_CACHE_TTL passes.
+SESSION_CACHE_TTL = float(os.environ.get('SESSION_CACHE_TTL', '60'))
+session_cache = TTLCache(
+    maxsize=int(os.environ.get('SESSION_CACHE_SIZE', '10000')),
+    ttl=SESSION_CACHE_TTL
+)
+
+def cache_session(session_token: str, user: dict, expires_at: datetime):
+    """Cache a resolved token, never past the session's own expiry"""
+    remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+    if remaining > 0:
+        session_cache.set(session_token, user, ttl=min(SESSION_CACHE_TTL, remaining))
+
+def invalidate_session(session_token: str):
+    session_cache.pop(session_token)
+
+def invalidate_user_sessions(user_id: str) -> int:
+    """Drop every cached token that resolves to this user"""
+    return session_cache.discard_where(lambda user: user.get('id') == user_id)
+
+# Expiring Records
+# Sessions and password reset codes store expires_at as a native datetime so
+# Mongo TTL indexes remove them. The sweeper converts rows still carrying ISO
+# strings (written before the migration, or by older workers mid-deploy) and
+# deletes anything expired that the TTL monitor has not reached yet.
+EXPIRING_COLLECTIONS = ['user_sessions', 'password_resets']
+EXPIRY_SWEEP_INTERVAL = int(os.environ.get('EXPIRY_SWEEP_INTERVAL', '600'))
+
+def as_utc_datetime(value) -> datetime:
+    """Datetime from a stored timestamp, which may be an ISO string or naive UTC"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+async def migrate_expiry_timestamps() -> int:
+    """Convert ISO string expires_at values to native datetimes"""
+    converted = 0
+    for name in EXPIRING_COLLECTIONS:
+        batch = []
+        async for doc in db[name].find({"expires_at": {"$type": "string"}}, {"_id": 1, "expires_at": 1}):
+            batch.append(UpdateOne({"_id": doc['_id']}, {"$set": {"expires_at": as_utc_datetime(doc['expires_at'])}}))
+            if len(batch) >= 500:
+                converted += (await db[name].bulk_write(batch, ordered=False)).modified_count
+                batch = []
+        if batch:
+            converted += (await db[name].bulk_write(batch, ordered=False)).modified_count
+    return converted
+
+async def sweep_expired_records() -> dict:
+    await migrate_expiry_timestamps()
+    now = datetime.now(timezone.utc)
+    return {
+        name: (await db[name].delete_many({"expires_at": {"$lt": now}})).deleted_count
+        for name in EXPIRING_COLLECTIONS
+    }
+
+async def expiry_sweeper():
+    """Sweep expired sessions and reset codes, for the life of the process"""
+    while True:
+        try:
+            removed = await sweep_expired_records()
+            if any(removed.values()):
+                logging.info(f"Swept expired records: {removed}")
+        except Exception as e:
+            logging.error(f"Expiry sweep failed: {str(e)}")
+        await asyncio.sleep(EXPIRY_SWEEP_INTERVAL)
+
 async def verify_session_token(request: Request, authorization: str = Header(None)):
     """Verify session token and return user"""
     session_token = get_session_token(request, authorization)
@@ -410,6 +613,10 @@ async def verify_session_token(request: Request, authorization: str = Header(Non
     if not session_token:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
+    cached = session_cache.get(session_token)
+    if cached is not None:
+        return dict(cached)
+    
     # Try session-based auth first (cookie)
     session_doc = await db.user_sessions.find_one(
         {"session_token": session_token},
@@ -418,12 +625,7 @@ async def verify_session_token(request: Request, authorization: str = Header(Non
     
     if session_doc:
         # Session found - check expiration
-        expires_at = session_doc["expires_at"]
-        if isinstance(expires_at, str):
-            expires_at = datetime.fromisoformat(expires_at)
-        if expires_at.tzinfo is None:
-            expires_at = expires_at.replace(tzinfo=timezone.utc)
-        
+        expires_at = as_utc_datetime(session_doc["expires_at"])
         if expires_at < datetime.now(timezone.utc):
             await db.user_sessions.delete_one({"session_token": session_token})
             raise HTTPException(status_code=401, detail="Session expired")
@@ -433,6 +635,7 @@ async def verify_session_token(request: Request, authorization: str = Header(Non
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
+        cache_session(session_token, dict(user), expires_at)
         return user
     
     # Fallback to JWT token auth
@@ -441,6 +644,8 @@ async def verify_session_token(request: Request, authorization: str = Header(Non
         user = await db.users.find_one({"id": payload['user_id']}, {"_id": 0, "password": 0})
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
+        if 'exp' in payload:
+            cache_session(session_token, dict(user), datetime.fromtimestamp(payload['exp'], timezone.utc))
         return user
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
@@ -474,6 +679,97 @@ def validate_password_strength(password: str) -> tuple[bool, str]:
         return False, "Password must contain at least one special character (!@#$%^&*(),.?\":{}|<>)"
     return True, ""
 
+# Password Hashing
+# bcrypt is deliberately slow, so hashing and verification run on a bounded
+# thread pool (bcrypt releases the GIL) instead of blocking the event loop.
+# Once PASSWORD_HASH_QUEUE_SIZE calls are waiting or running, further calls are
+# shed with a 503 rather than queueing behind a login burst.
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '12'))
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get('PASSWORD_HASH_QUEUE_SIZE', '32'))
+_password_pool = None
+password_hash_pending = 0
+password_hash_counters = {"hashes": 0, "verifies": 0, "rehashes": 0, "rejected": 0}
+password_hash_timings = {"hash_ms": deque(maxlen=1024), "queue_wait_ms": deque(maxlen=1024)}
+
+def get_password_pool() -> ThreadPoolExecutor:
+    global _password_pool
+    if _password_pool is None:
+        _password_pool = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+    return _password_pool
+
+def _timed_password_call(submitted: float, func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, started - submitted, time.perf_counter() - started
+
+async def run_password_task(func, *args):
+    """Run a bcrypt call on the hashing pool, shedding load when it is saturated"""
+    global password_hash_pending
+    if password_hash_pending >= PASSWORD_HASH_QUEUE_SIZE:
+        password_hash_counters["rejected"] += 1
+        raise HTTPException(
+            status_code=503,
+            detail="Too many sign-in requests right now. Please retry shortly",
+            headers={"Retry-After": "5"}
+        )
+    
+    password_hash_pending += 1
+    try:
+        result, waited, took = await asyncio.get_running_loop().run_in_executor(
+            get_password_pool(), _timed_password_call, time.perf_counter(), func, *args
+        )
+    finally:
+        password_hash_pending -= 1
+    password_hash_timings["queue_wait_ms"].append(waited * 1000)
+    password_hash_timings["hash_ms"].append(took * 1000)
+    return result
+
+async def hash_password(password: str) -> str:
+    hashed = await run_password_task(bcrypt.hashpw, password.encode(), bcrypt.gensalt(BCRYPT_ROUNDS))
+    password_hash_counters["hashes"] += 1
+    return hashed.decode()
+
+async def verify_password(password: str, hashed: Optional[str]) -> bool:
+    """Check a password against a stored hash; accounts without one never match"""
+    if not hashed:
+        return False
+    matched = await run_password_task(bcrypt.checkpw, password.encode(), hashed.encode())
+    password_hash_counters["verifies"] += 1
+    return matched
+
+def password_needs_rehash(hashed: str) -> bool:
+    """Whether a stored bcrypt hash ($2b$<cost>$...) uses a different cost factor"""
+    try:
+        return int(hashed.split('$')[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+async def rehash_password(user_id: str, password: str, old_hash: str):
+    """Re-hash a verified password at the current cost, unless it changed meanwhile"""
+    try:
+        hashed = await hash_password(password)
+    except HTTPException:
+        return  # pool saturated; the next login retries
+    result = await db.users.update_one({"id": user_id, "password": old_hash}, {"$set": {"password": hashed}})
+    password_hash_counters["rehashes"] += result.modified_count
+
+def password_hash_stats() -> dict:
+    def percentiles(samples):
+        if not samples:
+            return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+        p50, p95 = np.percentile(samples, [50, 95])
+        return {"p50": round(float(p50), 2), "p95": round(float(p95), 2), "max": round(max(samples), 2)}
+    
+    return {
+        "rounds": BCRYPT_ROUNDS,
+        "workers": PASSWORD_HASH_WORKERS,
+        "pending": password_hash_pending,
+        "queue_size": PASSWORD_HASH_QUEUE_SIZE,
+        **password_hash_counters,
+        **{name: percentiles(samples) for name, samples in password_hash_timings.items()}
+    }
+
 def create_token(user_id: str, email: str, role: str) -> str:
     payload = {
         "user_id": user_id,
@@ -492,154 +788,717 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+# LLM Client
+class StubLlmChat:
+    """Offline stand-in for LlmChat, selected with LLM_PROVIDER=stub
+
+    Answers every prompt with a fixed insight after LLM_STUB_DELAY seconds, so
+    the insight flow can be exercised without network access or an API key.
+    """
+
+    class Response:
+        def __init__(self, content: str):
+            self.content = content
+
+    def __init__(self, *args, **kwargs):
+        self.delay = float(os.environ.get('LLM_STUB_DELAY', '0'))
+        self.prompts = []
+
+    def with_model(self, *args, **kwargs):
+        return self
+
+    async def aask(self, messages):
+        self.prompts.extend(messages)
+        await asyncio.sleep(self.delay)
+        return self.Response("Insight: Your profile lines up well with your top matches.\nTip: Keep your skills list up to date.")
+
+    async def send_message(self, message):
+        self.prompts.append(message)
+        await asyncio.sleep(self.delay)
+        return "Stub recommendation"
+
+def make_llm_chat(**kwargs):
+    """Create the chat client for LLM calls, honouring LLM_PROVIDER"""
+    if os.environ.get('LLM_PROVIDER') == 'stub':
+        return StubLlmChat(**kwargs)
+    return LlmChat(**kwargs)
+
+def llm_configured() -> bool:
+    return bool(os.environ.get('EMERGENT_LLM_KEY')) or os.environ.get('LLM_PROVIDER') == 'stub'
+
 # AI Matching Engine Functions
-async def calculate_job_match_score(job: dict, preferences: dict, user: dict) -> JobMatch:
-    """Calculate match score between a job and job seeker preferences"""
-    
-    total_score = 0
-    max_score = 100
-    reasons = []
-    
-    # Skill matching (30 points)
-    skill_match = 0
-    user_skills = set([s.lower() for s in (preferences.get('hard_skills', []) + user.get('skills', []))])
-    job_requirements = set([r.lower() for r in job.get('requirements', [])])
-    
-    if job_requirements and user_skills:
-        matched_skills = user_skills.intersection(job_requirements)
-        skill_match = int((len(matched_skills) / len(job_requirements)) * 100)
-        skill_score = int((skill_match / 100) * 30)
-        total_score += skill_score
-        
-        if skill_match >= 80:
-            reasons.append(f"✅ Excellent skill match ({skill_match}%)")
-        elif skill_match >= 50:
-            reasons.append(f"✅ Good skill match ({skill_match}%)")
+def calculate_job_match_score(job: dict, preferences: dict, user: dict, idf: Optional[np.ndarray] = None) -> JobMatch:
+    """Calculate match score between a job and job seeker preferences
+
+    idf is the catalog's term weighting from term_idf; callers scoring many
+    pairs load it once and pass it in.
+    """
+    matrix = JobFeatureMatrix([job])
+    return matrix.build_match(matrix.score(preferences, user, idf), 0)
+
+# Job Feature Extraction
+# Scoring inputs are extracted once, when a job is written, and stored under
+# job['features']: canonical skill IDs, monthly salary bounds, an experience
+# band and work modes. Bump JOB_FEATURES_VERSION when extraction changes so the
+# admin backfill recomputes stored features.
+JOB_FEATURES_VERSION = 4
+
+EXPERIENCE_BAND_FRESHER = "fresher"  # description mentions fresher / intern
+EXPERIENCE_BAND_EARLY = "1-3yrs"     # description mentions 1-3 years
+EXPERIENCE_BAND_OPEN = "any"         # no experience hint
+
+WORK_MODE_REMOTE = "remote"
+WORK_MODE_HYBRID = "hybrid"
+WORK_MODE_ONSITE = "onsite"
+
+SALARY_AMOUNT = re.compile(r'(₹|\brs\.?|\binr)?\s*(\d+(?:\.\d+)?)\s*(k|lpa|lakhs?|lacs?|l|crores?|cr)?\b')
+SALARY_RANGE_JOINERS = {'-', '–', '—', 'to'}
+# A currency or pay period right after a bare number marks it as an amount
+SALARY_AMOUNT_SUFFIX = re.compile(r'\s*(?:inr|rs\b|rupees|/\s*(?:month|mo|yr|year|annum)|per (?:month|annum|year)|p\.?a\b|p\.?m\b|stipend|salary|ctc)')
+# A leading label such as 'Stipend:' or 'CTC -' marks the number after it as an amount
+SALARY_LABEL = re.compile(r'\s*(?:stipend|salary|ctc)\b\s*[:\-–—]?\s*')
+DURATION_UNIT = re.compile(r'\s*(?:months?|mos?|weeks?|wks?|days?|years?|yrs?|hours?|hrs?)\b')
+SALARY_UNITS = {
+    'k': 1_000,
+    'l': 100_000, 'lpa': 100_000, 'lakh': 100_000, 'lakhs': 100_000, 'lac': 100_000, 'lacs': 100_000,
+    'cr': 10_000_000, 'crore': 10_000_000, 'crores': 10_000_000
+}
+ANNUAL_SALARY_MARKERS = ['lpa', 'per annum', 'p.a', '/yr', '/year', 'per year', 'annual', 'ctc']
+# Amounts above this with no unit or period are taken to be annual CTC
+ANNUAL_SALARY_THRESHOLD = 200_000
+
+def normalize_skill(skill: str) -> str:
+    return ' '.join(skill.lower().split())
+
+def salary_amount_groups(text: str) -> List[List[re.Match]]:
+    """Numbers in a salary string, with ranges like '5-8' or '50k to 80k' grouped together"""
+    groups = []
+    for match in SALARY_AMOUNT.finditer(text):
+        if groups and len(groups[-1]) == 1 and text[groups[-1][0].end():match.start()].strip() in SALARY_RANGE_JOINERS:
+            groups[-1].append(match)
         else:
-            reasons.append(f"⚠️ Partial skill match ({skill_match}%)")
-    
-    # Job type matching (15 points)
-    if job.get('job_type', '').lower() in [jt.lower() for jt in preferences.get('job_types', [])]:
-        total_score += 15
-        reasons.append(f"✅ Job type matches ({job.get('job_type')})")
-    
-    # Work type matching (15 points)  
-    job_location = job.get('location', '').lower()
-    work_types = [wt.lower() for wt in preferences.get('work_type', [])]
-    
-    location_match = 0
-    if 'remote' in job_location and 'remote' in work_types:
-        total_score += 15
-        location_match = 100
-        reasons.append("✅ Remote work preference matched")
-    elif 'hybrid' in job_location and 'hybrid' in work_types:
-        total_score += 12
-        location_match = 80
-        reasons.append("✅ Hybrid work preference matched")
-    elif any(loc.lower() in job_location for loc in preferences.get('preferred_locations', [])):
-        total_score += 10
-        location_match = 70
-        reasons.append("✅ Location preference matched")
-    
-    # Salary matching (20 points)
-    salary_match = 0
-    job_salary = job.get('salary_range', '')
-    if preferences.get('salary_min') and job_salary:
-        # Simple salary parsing
-        try:
-            salary_numbers = [int(''.join(filter(str.isdigit, s))) for s in job_salary.split('-') if any(c.isdigit() for c in s)]
-            if salary_numbers:
-                job_salary_avg = sum(salary_numbers) // len(salary_numbers)
-                user_salary_min = preferences.get('salary_min', 0)
-                user_salary_max = preferences.get('salary_max', 999999999)
-                
-                if user_salary_min <= job_salary_avg <= user_salary_max:
-                    total_score += 20
-                    salary_match = 100
-                    reasons.append("✅ Salary expectations aligned")
-                elif job_salary_avg >= user_salary_min * 0.8:
-                    total_score += 15
-                    salary_match = 75
-                    reasons.append("✅ Salary close to expectations")
-                else:
-                    salary_match = 50
-                    reasons.append("⚠️ Salary below expectations")
-        except:
-            pass
-    
-    # Experience matching (20 points)
-    experience_match = 0
-    user_exp = preferences.get('experience_level', 'fresher')
-    
-    experience_levels = {
-        'student': 0,
-        'fresher': 1,
-        '1-3yrs': 2,
-        '3-5yrs': 3,
-        '5+yrs': 4
-    }
-    
+            groups.append([match])
+    return groups
+
+def parse_salary_range(salary_range: Optional[str]) -> tuple[Optional[int], Optional[int]]:
+    """Monthly INR (min, max) from strings like '50k-80k', '5-8 LPA' or '₹30,000 per month'
+
+    A number counts as an amount only next to a currency, a k/LPA unit or a
+    pay period, as one end of a range, as the first number after a leading
+    'Stipend:'/'Salary:'/'CTC' label, or when it is the whole string;
+    durations such as '6 months' are ignored.
+    """
+    if not salary_range:
+        return None, None
+    text = salary_range.lower().replace(',', '')
+    label = SALARY_LABEL.match(text)
+    body = text[label.end():] if label else text
+    
+    amounts = []
+    for group in salary_amount_groups(body):
+        if DURATION_UNIT.match(body, group[-1].end()):
+            continue
+        if (
+            len(group) == 2
+            or any(m.group(1) or m.group(3) or SALARY_AMOUNT_SUFFIX.match(body, m.end()) for m in group)
+            or group[0].group(0).strip() == body.strip()
+            or (label and not amounts)
+        ):
+            amounts.extend(group)
+    amounts = [(m.group(2), m.group(3)) for m in amounts[:2]]
+    if not amounts:
+        return None, None
+    
+    # A trailing unit applies to the whole range, as in '5-8 LPA'
+    range_unit = amounts[-1][1]
+    values = [float(value) * SALARY_UNITS.get(unit or range_unit, 1) for value, unit in amounts]
+    
+    annual = any(marker in text for marker in ANNUAL_SALARY_MARKERS) or range_unit in ['l', 'lpa', 'lakh', 'lakhs', 'lac', 'lacs', 'cr', 'crore', 'crores']
+    per_month = 'month' in text or '/mo' in text
+    if annual or (not per_month and max(values) > ANNUAL_SALARY_THRESHOLD):
+        values = [v / 12 for v in values]
+    
+    return int(min(values)), int(max(values))
+
+def job_experience_band(job: dict) -> str:
+    """Experience band hinted at by the job description and requirements"""
     job_desc = job.get('description', '').lower() + ' ' + ' '.join(job.get('requirements', [])).lower()
-    
     if 'fresher' in job_desc or 'intern' in job_desc:
-        if user_exp in ['student', 'fresher']:
-            total_score += 20
-            experience_match = 100
-            reasons.append("✅ Experience level perfect match")
-    elif '1-3' in job_desc or '1 to 3' in job_desc:
-        if user_exp in ['fresher', '1-3yrs']:
-            total_score += 20
-            experience_match = 100
-            reasons.append("✅ Experience level perfect match")
-    else:
-        total_score += 10
-        experience_match = 50
+        return EXPERIENCE_BAND_FRESHER
+    if '1-3' in job_desc or '1 to 3' in job_desc:
+        return EXPERIENCE_BAND_EARLY
+    return EXPERIENCE_BAND_OPEN
+
+def extract_job_features(job: dict) -> dict:
+    """Normalized scoring features for a job document"""
+    location = job.get('location', '').lower()
+    work_modes = [mode for mode in [WORK_MODE_REMOTE, WORK_MODE_HYBRID] if mode in location] or [WORK_MODE_ONSITE]
+    salary_min, salary_max = parse_salary_range(job.get('salary_range'))
     
-    # Determine match category
+    return {
+        "version": JOB_FEATURES_VERSION,
+        "skill_ids": sorted({normalize_skill(r) for r in job.get('requirements', [])} - {''}),
+        "salary_min": salary_min,
+        "salary_max": salary_max,
+        "experience_band": job_experience_band(job),
+        "work_modes": work_modes,
+        "job_type": job.get('job_type', '').lower(),
+        "location": location,
+        "text": job_text_vector(job)
+    }
+
+# Text Similarity
+# Job descriptions and seeker resumes are tokenized offline into hashed
+# term-frequency vectors, stored with the job's features and the seeker's
+# preferences. Document frequencies over the job catalog are kept in
+# term_stats, so TF-IDF weights are applied at scoring time and cosine
+# similarity against a whole batch of jobs is one sparse product.
+TEXT_HASH_BITS = 18
+TEXT_DIMENSIONS = 1 << TEXT_HASH_BITS
+TEXT_TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'for', 'from', 'has', 'have',
+    'i', 'in', 'into', 'is', 'it', 'its', 'me', 'my', 'of', 'on', 'or', 'our', 'so', 'that',
+    'the', 'their', 'this', 'to', 'us', 'was', 'we', 'were', 'will', 'with', 'you', 'your'
+}
+SEMANTIC_MATCH_WEIGHT = int(os.environ.get('SEMANTIC_MATCH_WEIGHT', '10'))
+
+def text_vector(*texts: Optional[str]) -> dict:
+    """Sparse hashed term-frequency vector, with sublinear (1 + log tf) weights"""
+    counts = Counter(
+        zlib.crc32(token.encode()) & (TEXT_DIMENSIONS - 1)
+        for text in texts if text
+        for token in TEXT_TOKEN.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS
+    )
+    terms = sorted(counts)
+    return {"terms": terms, "weights": [round(1 + np.log(counts[t]), 4) for t in terms]}
+
+def job_text_vector(job: dict) -> dict:
+    return text_vector(job.get('title'), job.get('description'))
+
+def seeker_text_vector(preferences: dict) -> dict:
+    """Stored text vector for a seeker's preferences, computing it if missing"""
+    return preferences.get('text_vector') or text_vector(preferences.get('resume_text'), preferences.get('bio'))
+
+async def index_job_terms(jobs: List[dict], delta: int):
+    """Add (delta=1) or remove (delta=-1) jobs' terms from the document frequencies"""
+    df = Counter(term for job in jobs for term in job_features(job)['text']['terms'])
+    if df:
+        await db.term_stats.bulk_write([
+            UpdateOne({"term": term}, {"$inc": {"df": count * delta}}, upsert=True)
+            for term, count in df.items()
+        ], ordered=False)
+    if jobs:
+        await db.match_state.update_one({"key": "text_corpus"}, {"$inc": {"documents": len(jobs) * delta}}, upsert=True)
+
+async def rebuild_term_stats():
+    """Recount document frequencies over the whole job catalog"""
+    df = Counter()
+    documents = 0
+    async for job in db.jobs.find({}, {"_id": 0}):
+        df.update(job_features(job)['text']['terms'])
+        documents += 1
+    await db.term_stats.delete_many({})
+    terms = list(df.items())
+    for i in range(0, len(terms), 5000):
+        await db.term_stats.insert_many([{"term": term, "df": count} for term, count in terms[i:i + 5000]])
+    await db.match_state.update_one({"key": "text_corpus"}, {"$set": {"documents": documents}}, upsert=True)
+
+_term_idf = {"version": None, "idf": None}
+
+async def term_idf(catalog_version: int) -> np.ndarray:
+    """Dense smoothed IDF weights, reloaded whenever the job catalog version changes"""
+    if _term_idf["version"] != catalog_version:
+        corpus = await db.match_state.find_one({"key": "text_corpus"}, {"_id": 0})
+        documents = max(corpus['documents'], 0) if corpus else 0
+        df = np.zeros(TEXT_DIMENSIONS, dtype=np.float64)
+        async for stat in db.term_stats.find({"df": {"$gt": 0}}, {"_id": 0}):
+            df[stat['term']] = stat['df']
+        _term_idf["idf"] = np.log((documents + 1) / (df + 1)) + 1
+        _term_idf["version"] = catalog_version
+    return _term_idf["idf"]
+
+def job_features(job: dict) -> dict:
+    """Stored features for a job, extracting them if missing or outdated"""
+    features = job.get('features')
+    if features and features.get('version') == JOB_FEATURES_VERSION:
+        return features
+    return extract_job_features(job)
+
+# Batch Job Scoring Engine
+# Scores one job seeker against a whole batch of jobs in a single NumPy pass
+# over the jobs' stored features.
+LOCATION_NONE, LOCATION_REMOTE, LOCATION_HYBRID, LOCATION_PREFERRED = 0, 1, 2, 3
+SALARY_NONE, SALARY_ALIGNED, SALARY_CLOSE, SALARY_BELOW = 0, 1, 2, 3
+EXPERIENCE_BAND_CODES = {EXPERIENCE_BAND_FRESHER: 0, EXPERIENCE_BAND_EARLY: 1, EXPERIENCE_BAND_OPEN: 2}
+
+def match_category_for(total_score: int) -> str:
     if total_score >= 75:
-        match_category = "best"
+        return "best"
     elif total_score >= 50:
-        match_category = "good"
-    else:
-        match_category = "stretch"
-    
-    return JobMatch(
+        return "good"
+    return "stretch"
+
+class _TextRows:
+    """Text vectors of a matrix's rows in CSR layout, for TF-IDF cosine similarity
+
+    Row i's terms are text_terms[text_rows == i], with their term frequencies
+    in text_tf.
+    """
+
+    def set_text_rows(self, vectors: List[dict]):
+        lengths = [len(v['terms']) for v in vectors]
+        self.text_rows = np.repeat(np.arange(len(vectors)), lengths)
+        self.text_terms = np.array([t for v in vectors for t in v['terms']], dtype=np.int64)
+        self.text_tf = np.array([w for v in vectors for w in v['weights']], dtype=np.float64)
+
+    def text_similarity(self, vector: dict, idf: np.ndarray) -> np.ndarray:
+        """TF-IDF cosine similarity of every row's text against one text vector"""
+        n = len(self)
+        if not vector['terms'] or not len(self.text_terms):
+            return np.zeros(n)
+        # Both sides are sorted by term, so shared terms are found with one search
+        query_terms = np.array(vector['terms'], dtype=np.int64)
+        query = np.array(vector['weights']) * idf[query_terms]
+        positions = np.minimum(np.searchsorted(query_terms, self.text_terms), len(query_terms) - 1)
+        shared = query_terms[positions] == self.text_terms
+        weights = self.text_tf * idf[self.text_terms]
+        norms = np.sqrt(np.bincount(self.text_rows, weights * weights, minlength=n)) * np.linalg.norm(query)
+        dots = np.bincount(self.text_rows, np.where(shared, weights * query[positions], 0), minlength=n)
+        return np.divide(dots, norms, out=np.zeros(n), where=norms > 0)
+
+class JobFeatureMatrix(_TextRows):
+    """Array-backed features for a batch of jobs
+
+    Each job's requirements become a row in a packed skill bitset, and salary,
+    experience band, job type and work mode become parallel arrays, so that
+    scoring a seeker against every job is a handful of vectorized operations.
+    """
+
+    def __init__(self, jobs: List[dict]):
+        self.jobs = jobs
+        self.skill_ids = {}
+        self.job_type_ids = {}
+        features = [job_features(job) for job in jobs]
+
+        skill_rows = [[self.skill_ids.setdefault(skill, len(self.skill_ids)) for skill in f['skill_ids']] for f in features]
+        skills = np.zeros((len(jobs), max(len(self.skill_ids), 1)), dtype=bool)
+        for row, ids in enumerate(skill_rows):
+            skills[row, ids] = True
+        self.skill_bits = np.packbits(skills, axis=1)
+        self.requirement_counts = skills.sum(axis=1)
+
+        self.job_type_codes = np.array(
+            [self.job_type_ids.setdefault(f['job_type'], len(self.job_type_ids)) for f in features],
+            dtype=np.int32
+        )
+
+        self.locations = np.array([f['location'] for f in features], dtype=str)
+        self.remote = np.array([WORK_MODE_REMOTE in f['work_modes'] for f in features], dtype=bool)
+        self.hybrid = np.array([WORK_MODE_HYBRID in f['work_modes'] for f in features], dtype=bool)
+
+        self.salary_min = np.array([f['salary_min'] if f['salary_min'] is not None else np.nan for f in features], dtype=np.float64)
+        self.salary_max = np.array([f['salary_max'] if f['salary_max'] is not None else np.nan for f in features], dtype=np.float64)
+        self.has_salary = ~np.isnan(self.salary_min)
+        self.salary_avg = (self.salary_min + self.salary_max) / 2
+
+        self.experience_band = np.array([EXPERIENCE_BAND_CODES[f['experience_band']] for f in features], dtype=np.int8)
+
+        self.set_text_rows([f['text'] for f in features])
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def skill_vector(self, skills: set) -> np.ndarray:
+        """Pack a seeker's skills into the same bit layout as the job rows"""
+        vector = np.zeros(self.skill_bits.shape[1] * 8, dtype=bool)
+        ids = [self.skill_ids[s] for s in skills if s in self.skill_ids]
+        vector[ids] = True
+        return np.packbits(vector)
+
+    def score(self, preferences: dict, user: dict, idf: Optional[np.ndarray] = None) -> dict:
+        """Score every job against one seeker, returning arrays of sub-scores
+
+        With the catalog's idf weights, resume and job description similarity
+        adds up to SEMANTIC_MATCH_WEIGHT points.
+        """
+        n = len(self.jobs)
+        total = np.zeros(n, dtype=np.int64)
+
+        # Skill matching (30 points)
+        user_skills = {normalize_skill(s) for s in (preferences.get('hard_skills', []) + user.get('skills', []))}
+        matched = np.bitwise_count(self.skill_bits & self.skill_vector(user_skills)).sum(axis=1)
+        has_skills = (self.requirement_counts > 0) & bool(user_skills)
+        skill_match = np.where(
+            has_skills,
+            (matched / np.maximum(self.requirement_counts, 1)) * 100,
+            0
+        ).astype(np.int64)
+        total += np.where(has_skills, ((skill_match / 100) * 30).astype(np.int64), 0)
+
+        # Job type matching (15 points)
+        wanted_types = [self.job_type_ids[jt.lower()] for jt in preferences.get('job_types', []) if jt.lower() in self.job_type_ids]
+        job_type_matched = np.isin(self.job_type_codes, wanted_types)
+        total += np.where(job_type_matched, 15, 0)
+
+        # Work type matching (15 points)
+        work_types = [wt.lower() for wt in preferences.get('work_type', [])]
+        location_kind = np.full(n, LOCATION_NONE, dtype=np.int8)
+        preferred = np.zeros(n, dtype=bool)
+        for loc in preferences.get('preferred_locations', []):
+            preferred |= np.char.find(self.locations, loc.lower()) >= 0
+        location_kind[preferred] = LOCATION_PREFERRED
+        if 'hybrid' in work_types:
+            location_kind[self.hybrid] = LOCATION_HYBRID
+        if 'remote' in work_types:
+            location_kind[self.remote] = LOCATION_REMOTE
+        total += np.select(
+            [location_kind == LOCATION_REMOTE, location_kind == LOCATION_HYBRID, location_kind == LOCATION_PREFERRED],
+            [15, 12, 10], 0
+        )
+        location_match = np.select(
+            [location_kind == LOCATION_REMOTE, location_kind == LOCATION_HYBRID, location_kind == LOCATION_PREFERRED],
+            [100, 80, 70], 0
+        )
+
+        # Salary matching (20 points), against the midpoint of the job's monthly range
+        salary_kind = np.full(n, SALARY_NONE, dtype=np.int8)
+        salary_min = preferences.get('salary_min')
+        if salary_min:
+            salary_max = preferences.get('salary_max') or np.inf
+            with np.errstate(invalid='ignore'):
+                aligned = self.has_salary & (self.salary_avg >= salary_min) & (self.salary_avg <= salary_max)
+                close = self.has_salary & ~aligned & (self.salary_avg >= salary_min * 0.8)
+            salary_kind[self.has_salary] = SALARY_BELOW
+            salary_kind[close] = SALARY_CLOSE
+            salary_kind[aligned] = SALARY_ALIGNED
+        total += np.select([salary_kind == SALARY_ALIGNED, salary_kind == SALARY_CLOSE], [20, 15], 0)
+        salary_match = np.select(
+            [salary_kind == SALARY_ALIGNED, salary_kind == SALARY_CLOSE, salary_kind == SALARY_BELOW],
+            [100, 75, 50], 0
+        )
+
+        # Experience matching (20 points)
+        user_exp = preferences.get('experience_level', 'fresher')
+        experience_perfect = (
+            ((self.experience_band == EXPERIENCE_BAND_CODES[EXPERIENCE_BAND_FRESHER]) & (user_exp in ['student', 'fresher'])) |
+            ((self.experience_band == EXPERIENCE_BAND_CODES[EXPERIENCE_BAND_EARLY]) & (user_exp in ['fresher', '1-3yrs']))
+        )
+        experience_open = self.experience_band == EXPERIENCE_BAND_CODES[EXPERIENCE_BAND_OPEN]
+        total += np.select([experience_perfect, experience_open], [20, 10], 0)
+        experience_match = np.select([experience_perfect, experience_open], [100, 50], 0)
+
+        # Resume and description similarity (bonus points)
+        similarity = np.zeros(n)
+        if idf is not None and SEMANTIC_MATCH_WEIGHT > 0:
+            similarity = self.text_similarity(seeker_text_vector(preferences), idf)
+        total += (similarity * SEMANTIC_MATCH_WEIGHT).astype(np.int64)
+        semantic_match = (similarity * 100).astype(np.int64)
+
+        return {
+            "total": total,
+            "has_skills": has_skills,
+            "skill_match": skill_match,
+            "job_type_matched": job_type_matched,
+            "location_kind": location_kind,
+            "location_match": location_match,
+            "salary_kind": salary_kind,
+            "salary_match": salary_match,
+            "experience_perfect": experience_perfect,
+            "experience_match": experience_match,
+            "semantic_match": semantic_match,
+        }
+
+    def job_score(self, scores: dict, row: int) -> "JobScore":
+        """Extract the compact sub-scores of one scored row"""
+        return scored_job(self.jobs[row], scores, row)
+
+    def build_match(self, scores: dict, row: int) -> JobMatch:
+        """Build the JobMatch, with its reasons, for one scored row"""
+        return explain_job_score(self.job_score(scores, row))
+
+def scored_job(job: dict, scores: dict, row: int) -> "JobScore":
+    """Compact sub-scores of a job from one row of a feature matrix's score arrays"""
+    return JobScore(
         job_id=job['id'],
         job_title=job['title'],
         company=job['company'],
-        match_score=min(total_score, 100),
-        match_category=match_category,
+        job_type=job.get('job_type'),
+        total=int(scores["total"][row]),
+        has_skills=bool(scores["has_skills"][row]),
+        skill_match=int(scores["skill_match"][row]),
+        job_type_matched=bool(scores["job_type_matched"][row]),
+        location_kind=int(scores["location_kind"][row]),
+        location_match=int(scores["location_match"][row]),
+        salary_kind=int(scores["salary_kind"][row]),
+        salary_match=int(scores["salary_match"][row]),
+        experience_perfect=bool(scores["experience_perfect"][row]),
+        experience_match=int(scores["experience_match"][row]),
+        semantic_match=int(scores["semantic_match"][row])
+    )
+
+class SeekerFeatureMatrix(_TextRows):
+    """Array-backed features for a chunk of job seekers
+
+    The transpose of JobFeatureMatrix: one job is scored against every seeker
+    in the chunk in a single pass, as fan-out does for a newly posted job.
+    Sub-scores agree with JobFeatureMatrix.score row for row.
+    """
+
+    def __init__(self, seekers: List[tuple[dict, dict]]):
+        self.seekers = seekers
+        self.skills = [
+            {normalize_skill(s) for s in (prefs.get('hard_skills', []) + user.get('skills', []))}
+            for user, prefs in seekers
+        ]
+        self.has_skills = np.array([bool(skills) for skills in self.skills], dtype=bool)
+        self.job_types = [{jt.lower() for jt in prefs.get('job_types', [])} for _, prefs in seekers]
+        self.locations = [[loc.lower() for loc in prefs.get('preferred_locations', [])] for _, prefs in seekers]
+
+        work_types = [[wt.lower() for wt in prefs.get('work_type', [])] for _, prefs in seekers]
+        self.wants_remote = np.array(['remote' in w for w in work_types], dtype=bool)
+        self.wants_hybrid = np.array(['hybrid' in w for w in work_types], dtype=bool)
+
+        self.salary_min = np.array([prefs.get('salary_min') or np.nan for _, prefs in seekers], dtype=np.float64)
+        self.salary_max = np.array([prefs.get('salary_max') or np.inf for _, prefs in seekers], dtype=np.float64)
+
+        experience = [prefs.get('experience_level', 'fresher') for _, prefs in seekers]
+        self.fresher_fit = np.array([e in ['student', 'fresher'] for e in experience], dtype=bool)
+        self.early_fit = np.array([e in ['fresher', '1-3yrs'] for e in experience], dtype=bool)
+
+        self.set_text_rows([seeker_text_vector(prefs) for _, prefs in seekers])
+
+    def __len__(self):
+        return len(self.seekers)
+
+    def score(self, job: dict, idf: Optional[np.ndarray] = None) -> dict:
+        """Score one job against every seeker, returning arrays of sub-scores"""
+        n = len(self.seekers)
+        features = job_features(job)
+        total = np.zeros(n, dtype=np.int64)
+
+        # Skill matching (30 points)
+        requirements = set(features['skill_ids'])
+        matched = np.array([len(skills & requirements) for skills in self.skills], dtype=np.int64)
+        has_skills = self.has_skills & (len(requirements) > 0)
+        skill_match = np.where(has_skills, (matched / max(len(requirements), 1)) * 100, 0).astype(np.int64)
+        total += np.where(has_skills, ((skill_match / 100) * 30).astype(np.int64), 0)
+
+        # Job type matching (15 points)
+        job_type_matched = np.array([features['job_type'] in types for types in self.job_types], dtype=bool)
+        total += np.where(job_type_matched, 15, 0)
+
+        # Work type matching (15 points)
+        location_kind = np.full(n, LOCATION_NONE, dtype=np.int8)
+        preferred = np.array([any(loc in features['location'] for loc in locs) for locs in self.locations], dtype=bool)
+        location_kind[preferred] = LOCATION_PREFERRED
+        if WORK_MODE_HYBRID in features['work_modes']:
+            location_kind[self.wants_hybrid] = LOCATION_HYBRID
+        if WORK_MODE_REMOTE in features['work_modes']:
+            location_kind[self.wants_remote] = LOCATION_REMOTE
+        total += np.select(
+            [location_kind == LOCATION_REMOTE, location_kind == LOCATION_HYBRID, location_kind == LOCATION_PREFERRED],
+            [15, 12, 10], 0
+        )
+        location_match = np.select(
+            [location_kind == LOCATION_REMOTE, location_kind == LOCATION_HYBRID, location_kind == LOCATION_PREFERRED],
+            [100, 80, 70], 0
+        )
+
+        # Salary matching (20 points), against the midpoint of the job's monthly range
+        salary_kind = np.full(n, SALARY_NONE, dtype=np.int8)
+        if features['salary_min'] is not None:
+            salary_avg = (features['salary_min'] + features['salary_max']) / 2
+            wants_salary = ~np.isnan(self.salary_min)
+            with np.errstate(invalid='ignore'):
+                aligned = wants_salary & (salary_avg >= self.salary_min) & (salary_avg <= self.salary_max)
+                close = wants_salary & ~aligned & (salary_avg >= self.salary_min * 0.8)
+            salary_kind[wants_salary] = SALARY_BELOW
+            salary_kind[close] = SALARY_CLOSE
+            salary_kind[aligned] = SALARY_ALIGNED
+        total += np.select([salary_kind == SALARY_ALIGNED, salary_kind == SALARY_CLOSE], [20, 15], 0)
+        salary_match = np.select(
+            [salary_kind == SALARY_ALIGNED, salary_kind == SALARY_CLOSE, salary_kind == SALARY_BELOW],
+            [100, 75, 50], 0
+        )
+
+        # Experience matching (20 points)
+        band = features['experience_band']
+        experience_perfect = (
+            (self.fresher_fit & (band == EXPERIENCE_BAND_FRESHER)) |
+            (self.early_fit & (band == EXPERIENCE_BAND_EARLY))
+        )
+        experience_open = np.full(n, band == EXPERIENCE_BAND_OPEN)
+        total += np.select([experience_perfect, experience_open], [20, 10], 0)
+        experience_match = np.select([experience_perfect, experience_open], [100, 50], 0)
+
+        # Resume and description similarity (bonus points)
+        similarity = np.zeros(n)
+        if idf is not None and SEMANTIC_MATCH_WEIGHT > 0:
+            similarity = self.text_similarity(features['text'], idf)
+        total += (similarity * SEMANTIC_MATCH_WEIGHT).astype(np.int64)
+        semantic_match = (similarity * 100).astype(np.int64)
+
+        return {
+            "total": total,
+            "has_skills": has_skills,
+            "skill_match": skill_match,
+            "job_type_matched": job_type_matched,
+            "location_kind": location_kind,
+            "location_match": location_match,
+            "salary_kind": salary_kind,
+            "salary_match": salary_match,
+            "experience_perfect": experience_perfect,
+            "experience_match": experience_match,
+            "semantic_match": semantic_match,
+        }
+
+    def build_match(self, job: dict, scores: dict, row: int) -> JobMatch:
+        """Build the job's JobMatch, with its reasons, for one seeker row"""
+        return explain_job_score(scored_job(job, scores, row))
+
+class _ScoreRecord:
+    """Compact numeric result of the ranking phase
+
+    Records are what match rows store; the explanation phase turns the few
+    rows that make it into a response back into full Pydantic models.
+    """
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields[name])
+
+    def to_doc(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_doc(cls, doc: dict):
+        return cls(**{name: doc[name] for name in cls.__slots__})
+
+class JobScore(_ScoreRecord):
+    __slots__ = (
+        "job_id", "job_title", "company", "job_type", "total",
+        "has_skills", "skill_match", "job_type_matched",
+        "location_kind", "location_match", "salary_kind", "salary_match",
+        "experience_perfect", "experience_match", "semantic_match"
+    )
+
+def explain_job_score(score: JobScore) -> JobMatch:
+    """Build the JobMatch, with its reasons, from a job's sub-scores"""
+    reasons = []
+
+    if score.has_skills:
+        if score.skill_match >= 80:
+            reasons.append(f"✅ Excellent skill match ({score.skill_match}%)")
+        elif score.skill_match >= 50:
+            reasons.append(f"✅ Good skill match ({score.skill_match}%)")
+        else:
+            reasons.append(f"⚠️ Partial skill match ({score.skill_match}%)")
+
+    if score.job_type_matched:
+        reasons.append(f"✅ Job type matches ({score.job_type})")
+
+    if score.location_kind == LOCATION_REMOTE:
+        reasons.append("✅ Remote work preference matched")
+    elif score.location_kind == LOCATION_HYBRID:
+        reasons.append("✅ Hybrid work preference matched")
+    elif score.location_kind == LOCATION_PREFERRED:
+        reasons.append("✅ Location preference matched")
+
+    if score.salary_kind == SALARY_ALIGNED:
+        reasons.append("✅ Salary expectations aligned")
+    elif score.salary_kind == SALARY_CLOSE:
+        reasons.append("✅ Salary close to expectations")
+    elif score.salary_kind == SALARY_BELOW:
+        reasons.append("⚠️ Salary below expectations")
+
+    if score.experience_perfect:
+        reasons.append("✅ Experience level perfect match")
+
+    if score.semantic_match >= 30:
+        reasons.append(f"✅ Your profile matches the job description ({score.semantic_match}%)")
+
+    return JobMatch(
+        job_id=score.job_id,
+        job_title=score.job_title,
+        company=score.company,
+        match_score=min(score.total, 100),
+        match_category=match_category_for(score.total),
         reasons=reasons,
-        skill_match=skill_match,
-        salary_match=salary_match,
-        location_match=location_match,
-        experience_match=experience_match
+        skill_match=score.skill_match,
+        salary_match=score.salary_match,
+        location_match=score.location_match,
+        experience_match=score.experience_match,
+        semantic_match=score.semantic_match
     )
 
-async def get_ai_job_recommendations(user_id: str, preferences: dict, jobs: List[dict]) -> dict:
-    """Get AI-powered job recommendations with explanations"""
-    
-    user = await db.users.find_one({"id": user_id}, {"_id": 0})
-    if not user:
-        return {"matches": [], "ai_insights": ""}
-    
-    # Calculate matches for all jobs
-    matches = []
-    for job in jobs:
-        match = await calculate_job_match_score(job, preferences, user)
-        matches.append(match)
-    
-    # Sort by score
-    matches.sort(key=lambda x: x.match_score, reverse=True)
-    
-    # Use AI to generate personalized insights
+def score_jobs_for_seeker(jobs: List[dict], preferences: dict, user: dict, idf: Optional[np.ndarray] = None) -> List[JobMatch]:
+    """Score a seeker against a batch of jobs, best matches first"""
+    if not jobs:
+        return []
+    matrix = JobFeatureMatrix(jobs)
+    scores = matrix.score(preferences, user, idf)
+    order = np.argsort(-np.minimum(scores["total"], 100), kind="stable")
+    return [matrix.build_match(scores, int(row)) for row in order]
+
+# AI insights are cached by a fingerprint of the prompt inputs, in process and
+# optionally in Mongo so that all workers share generated insights
+INSIGHT_CACHE_TTL = int(os.environ.get('INSIGHT_CACHE_TTL', '3600'))
+INSIGHT_CACHE_MONGO = os.environ.get('INSIGHT_CACHE_MONGO', 'false').lower() == 'true'
+insight_cache = TTLCache(
+    maxsize=int(os.environ.get('INSIGHT_CACHE_SIZE', '1024')),
+    ttl=INSIGHT_CACHE_TTL
+)
+insight_cache_counters = {"mongo_hits": 0, "llm_calls": 0}
+
+def insight_fingerprint(user: dict, preferences: dict, top_matches: List[dict]) -> str:
+    """Hash of everything that goes into the job match insight prompt"""
+    inputs = {
+        "name": user.get('full_name'),
+        "experience": preferences.get('experience_level'),
+        "skills": preferences.get('hard_skills', [])[:10],
+        "goals": preferences.get('career_goals', []),
+        "work_type": preferences.get('work_type', []),
+        "top_matches": [[m['job_id'], m['match_score']] for m in top_matches[:3]]
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+async def get_cached_insight(fingerprint: str) -> Optional[str]:
+    insight = insight_cache.get(fingerprint)
+    if insight is not None or not INSIGHT_CACHE_MONGO:
+        return insight
+    
+    cached = await db.ai_insight_cache.find_one(
+        {"key": fingerprint, "expires_at": {"$gt": datetime.now(timezone.utc)}},
+        {"_id": 0, "insight": 1}
+    )
+    if not cached:
+        return None
+    insight_cache_counters["mongo_hits"] += 1
+    insight_cache.set(fingerprint, cached['insight'])
+    return cached['insight']
+
+async def store_cached_insight(fingerprint: str, insight: str):
+    insight_cache.set(fingerprint, insight)
+    if INSIGHT_CACHE_MONGO:
+        await db.ai_insight_cache.update_one(
+            {"key": fingerprint},
+            {"$set": {
+                "insight": insight,
+                "expires_at": datetime.now(timezone.utc) + timedelta(seconds=INSIGHT_CACHE_TTL)
+            }},
+            upsert=True
+        )
+
+async def generate_job_match_insights(user: dict, preferences: dict, top_matches: List[dict], fingerprint: str) -> str:
+    """Ask the LLM for a personalized insight on a seeker's top job matches"""
     try:
-        llm_key = os.environ.get('EMERGENT_LLM_KEY')
-        if llm_key:
-            chat = LlmChat(api_key=llm_key, model="gpt-4")
-            
-            # Prepare context
-            user_context = f"""
+        chat = make_llm_chat(api_key=os.environ.get('EMERGENT_LLM_KEY'), model="gpt-4")
+        
+        # Prepare context
+        user_context = f"""
 Job Seeker Profile:
 - Name: {user.get('full_name')}
 - Experience: {preferences.get('experience_level')}
@@ -648,10 +1507,10 @@ Job Seeker Profile:
 - Preferred Work: {', '.join(preferences.get('work_type', []))}
 
 Top 3 Matched Jobs:
-{chr(10).join([f"{i+1}. {m.job_title} at {m.company} ({m.match_score}% match)" for i, m in enumerate(matches[:3])])}
+{chr(10).join([f"{i+1}. {m['job_title']} at {m['company']} ({m['match_score']}% match)" for i, m in enumerate(top_matches[:3])])}
 """
-            
-            prompt = f"""Based on this job seeker's profile and their top matches, provide:
+        
+        prompt = f"""Based on this job seeker's profile and their top matches, provide:
 1. A brief personalized insight (2-3 sentences)
 2. One actionable career tip
 
@@ -661,110 +1520,206 @@ Context:
 Format:
 Insight: [your insight]
 Tip: [your tip]"""
-            
-            response = await chat.aask([UserMessage(content=prompt)])
-            ai_insights = response.content if response else ""
-        else:
-            ai_insights = "Complete your profile to get personalized AI insights!"
+        
+        insight_cache_counters["llm_calls"] += 1
+        response = await chat.aask([UserMessage(content=prompt)])
+        ai_insights = response.content if response else ""
+        if ai_insights:
+            await store_cached_insight(fingerprint, ai_insights)
     except Exception as e:
-        ai_insights = f"AI insights temporarily unavailable"
         logging.error(f"AI insights error: {e}")
+        ai_insights = "AI insights temporarily unavailable"
+    
+    insight_results.set(fingerprint, ai_insights)
+    return ai_insights
+
+# Insights are generated in the background so match scores return without
+# waiting on the LLM. The insights_id handed to the client is the owner's user
+# id plus the prompt fingerprint, which any worker can resolve via the cache.
+INSIGHT_WAIT_TIMEOUT = 60
+INSIGHT_HEARTBEAT_SECONDS = 15
+insight_tasks = {}
+insight_results = TTLCache(maxsize=1024, ttl=300)
+
+async def start_job_match_insights(user: dict, preferences: dict, top_matches: List[dict]) -> dict:
+    """Return a cached insight, or start generating one in the background"""
+    if not llm_configured():
+        return {"insights_id": None, "status": "ready", "insight": "Complete your profile to get personalized AI insights!"}
+    
+    fingerprint = insight_fingerprint(user, preferences, top_matches)
+    insights_id = f"{user['id']}.{fingerprint}"
+    
+    cached = await get_cached_insight(fingerprint)
+    if cached is not None:
+        return {"insights_id": insights_id, "status": "ready", "insight": cached}
+    
+    if fingerprint not in insight_tasks:
+        task = run_in_background(generate_job_match_insights(user, preferences, top_matches, fingerprint))
+        insight_tasks[fingerprint] = task
+        task.add_done_callback(lambda _: insight_tasks.pop(fingerprint, None))
+    
+    return {"insights_id": insights_id, "status": "pending", "insight": ""}
+
+async def wait_for_insight(fingerprint: str, timeout: float) -> Optional[str]:
+    """Wait up to timeout seconds for an insight; None if it is still pending"""
+    task = insight_tasks.get(fingerprint)
+    if task:
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            return None
+    
+    insight = insight_results.get(fingerprint)
+    if insight is None:
+        insight = await get_cached_insight(fingerprint)
+    if insight is not None or not INSIGHT_CACHE_MONGO:
+        return insight
+    
+    # Generated on another worker: poll the shared Mongo tier
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        await asyncio.sleep(min(1.0, max(deadline - time.monotonic(), 0)))
+        insight = await get_cached_insight(fingerprint)
+        if insight is not None:
+            return insight
+    return None
+
+def insight_fingerprint_for(insights_id: str, user: dict) -> str:
+    owner, _, fingerprint = insights_id.partition('.')
+    if owner != user['id'] or not fingerprint:
+        raise HTTPException(status_code=404, detail="Insights not found")
+    return fingerprint
+
+async def get_ai_job_recommendations(user_id: str, preferences: dict) -> dict:
+    """Get AI-powered job recommendations with explanations"""
+    
+    user = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0})
+    if not user:
+        return {"matches": [], "ai_insights": ""}
+    
+    # Read precomputed scores, recomputing them first if any input changed
+    if await seeker_matches_stale(user, preferences):
+        await recompute_seeker_matches(user_id)
+    
+    summary = await db.match_state.find_one({"key": f"seeker:{user_id}"}, {"_id": 0})
+    total_matches = summary['total'] if summary else 0
+    if not total_matches:
+        return {
+            "total_matches": 0,
+            "best_matches": [],
+            "good_matches": [],
+            "stretch_matches": [],
+            "ai_insights": "No active jobs available right now. Check back soon!"
+        }
     
     # Categorize matches
-    best_matches = [m for m in matches if m.match_category == "best"]
-    good_matches = [m for m in matches if m.match_category == "good"]
-    stretch_matches = [m for m in matches if m.match_category == "stretch"]
+    best_matches, best_cursor = await read_seeker_matches(user_id, "best", 10)
+    good_matches, good_cursor = await read_seeker_matches(user_id, "good", 10)
+    stretch_matches, stretch_cursor = await read_seeker_matches(user_id, "stretch", 5)
+    
+    # Personalized AI insights are delivered separately once generated
+    insights = await start_job_match_insights(user, preferences, (best_matches + good_matches + stretch_matches)[:3])
     
     return {
-        "total_matches": len(matches),
-        "best_matches": best_matches[:10],
-        "good_matches": good_matches[:10],
-        "stretch_matches": stretch_matches[:5],
-        "ai_insights": ai_insights
+        "total_matches": total_matches,
+        "best_matches": best_matches,
+        "good_matches": good_matches,
+        "stretch_matches": stretch_matches,
+        "next_cursors": {
+            "best": best_cursor,
+            "good": good_cursor,
+            "stretch": stretch_cursor
+        },
+        "ai_insights": insights["insight"],
+        "insights_id": insights["insights_id"],
+        "insights_status": insights["status"]
     }
 
-async def calculate_candidate_match_score(candidate: dict, job: dict, job_prefs: dict) -> CandidateMatch:
-    """Calculate match score between a candidate and job requirements"""
-    
+EXPERIENCE_LEVELS = {'student': 0, 'fresher': 1, '1-3yrs': 2, '3-5yrs': 3, '5+yrs': 4}
+
+# How a candidate's availability compares to the job's joining needs
+AVAILABILITY_UNKNOWN = 0
+AVAILABILITY_IMMEDIATE = 1
+AVAILABILITY_FLEXIBLE = 2
+AVAILABILITY_LATE = 3
+AVAILABILITY_MATCH = {AVAILABILITY_UNKNOWN: 0, AVAILABILITY_IMMEDIATE: 100, AVAILABILITY_FLEXIBLE: 70, AVAILABILITY_LATE: 30}
+
+class CandidateScore(_ScoreRecord):
+    __slots__ = (
+        "user_id", "user_name", "total",
+        "skill_match", "must_matched", "must_total", "bonus_skills",
+        "candidate_exp", "experience_gap", "availability_kind",
+        "work_aligned", "goals_aligned"
+    )
+
+    @property
+    def experience_match(self) -> int:
+        if self.experience_gap == 0:
+            return 100
+        return 70 if abs(self.experience_gap) == 1 else 40
+
+def score_candidate(candidate: dict, job: dict, job_prefs: dict, candidate_prefs: Optional[dict]) -> CandidateScore:
+    """Compute a candidate's numeric sub-scores against a job's requirements
+
+    candidate_prefs is the candidate's preloaded job_seeker_preferences document.
+    """
     total_score = 0
-    strengths = []
-    gaps = []
-    
-    # Get candidate data
-    candidate_prefs = await db.job_seeker_preferences.find_one({"user_id": candidate['id']}, {"_id": 0})
     
     # Skill matching (40 points)
     skill_match = 0
-    candidate_skills = set([s.lower() for s in (candidate.get('skills', []) + 
+    must_matched = 0
+    candidate_skills = set([normalize_skill(s) for s in (candidate.get('skills', []) + 
                                                   (candidate_prefs.get('hard_skills', []) if candidate_prefs else []))])
-    must_have = set([s.lower() for s in job_prefs.get('must_have_skills', [])])
-    good_to_have = set([s.lower() for s in job_prefs.get('good_to_have_skills', [])])
+    must_have = set([normalize_skill(s) for s in job_prefs.get('must_have_skills', [])])
+    good_to_have = set([normalize_skill(s) for s in job_prefs.get('good_to_have_skills', [])])
     
     if must_have:
-        matched_must = candidate_skills.intersection(must_have)
-        must_match_pct = (len(matched_must) / len(must_have)) * 100 if must_have else 100
+        must_matched = len(candidate_skills.intersection(must_have))
+        must_match_pct = (must_matched / len(must_have)) * 100
         skill_match = int(must_match_pct)
         
         if must_match_pct >= 80:
             total_score += 40
-            strengths.append(f"Has {len(matched_must)}/{len(must_have)} required skills")
         elif must_match_pct >= 50:
             total_score += 25
-            strengths.append(f"Has most required skills ({int(must_match_pct)}%)")
-            gaps.append(f"Missing some required skills")
         else:
             total_score += 10
-            gaps.append(f"Lacks several required skills")
     
     # Good-to-have skills bonus
+    bonus_skills = []
     if good_to_have:
         matched_good = candidate_skills.intersection(good_to_have)
         if len(matched_good) > 0:
             total_score += min(10, len(matched_good) * 2)
-            strengths.append(f"Has bonus skills: {', '.join(list(matched_good)[:3])}")
+            bonus_skills = list(matched_good)[:3]
     
     # Experience matching (30 points)
-    experience_match = 0
     candidate_exp = candidate_prefs.get('experience_level', 'fresher') if candidate_prefs else 'fresher'
     ideal_exp = job_prefs.get('ideal_experience', 'fresher')
+    experience_gap = EXPERIENCE_LEVELS.get(candidate_exp, 1) - EXPERIENCE_LEVELS.get(ideal_exp, 1)
     
-    exp_levels = {'student': 0, 'fresher': 1, '1-3yrs': 2, '3-5yrs': 3, '5+yrs': 4}
-    candidate_level = exp_levels.get(candidate_exp, 1)
-    ideal_level = exp_levels.get(ideal_exp, 1)
-    
-    if candidate_level == ideal_level:
+    if experience_gap == 0:
         total_score += 30
-        experience_match = 100
-        strengths.append(f"Perfect experience match ({candidate_exp})")
-    elif abs(candidate_level - ideal_level) == 1:
+    elif abs(experience_gap) == 1:
         total_score += 20
-        experience_match = 70
-        strengths.append(f"Close experience match")
-    else:
-        experience_match = 40
-        if candidate_level < ideal_level:
-            gaps.append("Less experience than ideal")
-        else:
-            gaps.append("More experience than typical for role")
     
     # Availability matching (15 points)
-    availability_match = 0
+    availability_kind = AVAILABILITY_UNKNOWN
     if candidate_prefs:
         immediate_needed = job_prefs.get('immediate_joiner', False)
         candidate_availability = candidate_prefs.get('availability', 'immediate')
         
         if immediate_needed and candidate_availability == 'immediate':
             total_score += 15
-            availability_match = 100
-            strengths.append("Available immediately")
+            availability_kind = AVAILABILITY_IMMEDIATE
         elif not immediate_needed:
             total_score += 10
-            availability_match = 70
+            availability_kind = AVAILABILITY_FLEXIBLE
         else:
-            availability_match = 30
-            gaps.append("Not immediately available")
+            availability_kind = AVAILABILITY_LATE
     
     # Work type preference (10 points)
+    work_aligned = False
     if candidate_prefs:
         job_work_type = job.get('location', '').lower()
         candidate_work_prefs = [w.lower() for w in candidate_prefs.get('work_type', [])]
@@ -772,9 +1727,10 @@ async def calculate_candidate_match_score(candidate: dict, job: dict, job_prefs:
         if ('remote' in job_work_type and 'remote' in candidate_work_prefs) or \
            ('hybrid' in job_work_type and 'hybrid' in candidate_work_prefs):
             total_score += 10
-            strengths.append("Work preference aligned")
+            work_aligned = True
     
     # Career goals alignment (5 points)
+    goals_aligned = False
     if candidate_prefs and job_prefs.get('startup_stage'):
         career_goals = candidate_prefs.get('career_goals', [])
         stage = job_prefs.get('startup_stage', '')
@@ -782,23 +1738,1177 @@ async def calculate_candidate_match_score(candidate: dict, job: dict, job_prefs:
         if ('learning' in career_goals and stage in ['idea', 'mvp', 'early']) or \
            ('growth' in career_goals and stage in ['growth', 'scale']):
             total_score += 5
-            strengths.append("Career goals match startup stage")
+            goals_aligned = True
+    
+    return CandidateScore(
+        user_id=candidate['id'],
+        user_name=candidate.get('full_name', 'Unknown'),
+        total=total_score,
+        skill_match=skill_match,
+        must_matched=must_matched,
+        must_total=len(must_have),
+        bonus_skills=bonus_skills,
+        candidate_exp=candidate_exp,
+        experience_gap=experience_gap,
+        availability_kind=availability_kind,
+        work_aligned=work_aligned,
+        goals_aligned=goals_aligned
+    )
+
+def explain_candidate_score(score: CandidateScore, job: dict) -> CandidateMatch:
+    """Build the CandidateMatch, with strengths, gaps and interview questions"""
+    strengths = []
+    gaps = []
+    
+    if score.must_total:
+        if score.skill_match >= 80:
+            strengths.append(f"Has {score.must_matched}/{score.must_total} required skills")
+        elif score.skill_match >= 50:
+            strengths.append(f"Has most required skills ({score.skill_match}%)")
+            gaps.append(f"Missing some required skills")
+        else:
+            gaps.append(f"Lacks several required skills")
+    
+    if score.bonus_skills:
+        strengths.append(f"Has bonus skills: {', '.join(score.bonus_skills)}")
+    
+    if score.experience_gap == 0:
+        strengths.append(f"Perfect experience match ({score.candidate_exp})")
+    elif abs(score.experience_gap) == 1:
+        strengths.append(f"Close experience match")
+    elif score.experience_gap < 0:
+        gaps.append("Less experience than ideal")
+    else:
+        gaps.append("More experience than typical for role")
+    
+    if score.availability_kind == AVAILABILITY_IMMEDIATE:
+        strengths.append("Available immediately")
+    elif score.availability_kind == AVAILABILITY_LATE:
+        gaps.append("Not immediately available")
+    
+    if score.work_aligned:
+        strengths.append("Work preference aligned")
+    
+    if score.goals_aligned:
+        strengths.append("Career goals match startup stage")
     
     # Generate AI-powered interview questions
+    candidate = {"id": score.user_id, "full_name": score.user_name}
     suggested_questions = generate_interview_questions(candidate, job, strengths, gaps)
     
     return CandidateMatch(
-        user_id=candidate['id'],
-        user_name=candidate.get('full_name', 'Unknown'),
-        match_score=min(total_score, 100),
+        user_id=score.user_id,
+        user_name=score.user_name,
+        match_score=min(score.total, 100),
         strengths=strengths,
         gaps=gaps,
-        skill_match=skill_match,
-        experience_match=experience_match,
-        availability_match=availability_match,
+        skill_match=score.skill_match,
+        experience_match=score.experience_match,
+        availability_match=AVAILABILITY_MATCH[score.availability_kind],
         suggested_questions=suggested_questions
     )
 
+def calculate_candidate_match_score(candidate: dict, job: dict, job_prefs: dict, candidate_prefs: Optional[dict]) -> CandidateMatch:
+    """Calculate match score between a candidate and job requirements"""
+    return explain_candidate_score(score_candidate(candidate, job, job_prefs, candidate_prefs), job)
+
+class CandidateFeatureMatrix:
+    """Array-backed features for a pool of compact candidate records
+
+    Mirrors score_candidate so that several jobs can be scored against the
+    same pool, one vectorized pass per job; explanations are then built with
+    score_candidate for the few candidates a response returns.
+    """
+
+    def __init__(self, records: List[tuple[dict, dict]], skills: set):
+        self.records = records
+        self.user_ids = np.array([candidate['id'] for candidate, _ in records], dtype=str)
+        self.skill_ids = {skill: i for i, skill in enumerate(sorted(skills))}
+        
+        has_skill = np.zeros((len(records), max(len(self.skill_ids), 1)), dtype=bool)
+        for row, (candidate, prefs) in enumerate(records):
+            for skill in candidate.get('skills', []) + prefs.get('hard_skills', []):
+                i = self.skill_ids.get(normalize_skill(skill))
+                if i is not None:
+                    has_skill[row, i] = True
+        self.skill_bits = np.packbits(has_skill, axis=1)
+        
+        self.experience = np.array([EXPERIENCE_LEVELS.get(prefs.get('experience_level', 'fresher'), 1) for _, prefs in records], dtype=np.int8)
+        self.immediate = np.array([prefs.get('availability', 'immediate') == 'immediate' for _, prefs in records], dtype=bool)
+        work_types = [[w.lower() for w in prefs.get('work_type', [])] for _, prefs in records]
+        self.remote = np.array(['remote' in w for w in work_types], dtype=bool)
+        self.hybrid = np.array(['hybrid' in w for w in work_types], dtype=bool)
+        self.learning = np.array(['learning' in prefs.get('career_goals', []) for _, prefs in records], dtype=bool)
+        self.growth = np.array(['growth' in prefs.get('career_goals', []) for _, prefs in records], dtype=bool)
+
+    def __len__(self):
+        return len(self.records)
+
+    def matched(self, skills: set) -> np.ndarray:
+        """How many of the given skills each candidate has"""
+        vector = np.zeros(self.skill_bits.shape[1] * 8, dtype=bool)
+        vector[[self.skill_ids[s] for s in skills]] = True
+        return np.bitwise_count(self.skill_bits & np.packbits(vector)).sum(axis=1, dtype=np.int64)
+
+    def score(self, job: dict, job_prefs: dict) -> np.ndarray:
+        """Total score of every candidate in the pool for one job"""
+        total = np.zeros(len(self.records), dtype=np.int64)
+        
+        must_have = set([normalize_skill(s) for s in job_prefs.get('must_have_skills', [])])
+        if must_have:
+            must_match_pct = self.matched(must_have) / len(must_have) * 100
+            total += np.select([must_match_pct >= 80, must_match_pct >= 50], [40, 25], 10)
+        
+        good_to_have = set([normalize_skill(s) for s in job_prefs.get('good_to_have_skills', [])])
+        if good_to_have:
+            total += np.minimum(10, self.matched(good_to_have) * 2)
+        
+        gap = np.abs(self.experience - EXPERIENCE_LEVELS.get(job_prefs.get('ideal_experience', 'fresher'), 1))
+        total += np.select([gap == 0, gap == 1], [30, 20], 0)
+        
+        if job_prefs.get('immediate_joiner', False):
+            total += np.where(self.immediate, 15, 0)
+        else:
+            total += 10
+        
+        job_work_type = job.get('location', '').lower()
+        aligned = np.zeros(len(self.records), dtype=bool)
+        if 'remote' in job_work_type:
+            aligned |= self.remote
+        if 'hybrid' in job_work_type:
+            aligned |= self.hybrid
+        total += np.where(aligned, 10, 0)
+        
+        stage = job_prefs.get('startup_stage')
+        if stage in ['idea', 'mvp', 'early']:
+            total += np.where(self.learning, 5, 0)
+        elif stage in ['growth', 'scale']:
+            total += np.where(self.growth, 5, 0)
+        
+        return np.minimum(total, 100)
+
+CANDIDATE_POOL_LIMIT = int(os.environ.get('CANDIDATE_POOL_LIMIT', '1000'))
+
+def candidate_pool_pipeline(limit: Optional[int] = CANDIDATE_POOL_LIMIT, match: Optional[dict] = None, include_text: bool = False) -> List[dict]:
+    """Aggregation joining completed job seeker preferences with their users
+
+    Each result is a preferences document with the seeker's user document
+    embedded under 'user', so candidates arrive with their preferences in a
+    single round trip. match narrows the preferences documents considered;
+    a limit of None streams every seeker.
+    """
+    projection = {"_id": 0, "user._id": 0, "user.password": 0}
+    if not include_text:
+        projection["text_vector"] = 0
+    return [
+        {"$match": {"completed": True, **(match or {})}},
+        {"$lookup": {
+            "from": "users",
+            "localField": "user_id",
+            "foreignField": "id",
+            "as": "user"
+        }},
+        {"$unwind": "$user"},
+        {"$match": {"user.role": "job_seeker"}},
+        *([{"$limit": limit}] if limit is not None else []),
+        {"$project": projection}
+    ]
+
+# Scoring Executor
+# Large candidate pools are scored in batches on a process pool so CPU-bound
+# scoring does not block the event loop; smaller pools are scored inline to
+# avoid the IPC overhead.
+MATCH_POOL_WORKERS = int(os.environ.get('MATCH_POOL_WORKERS', str(min(4, os.cpu_count() or 1))))
+MATCH_POOL_BATCH_SIZE = int(os.environ.get('MATCH_POOL_BATCH_SIZE', '1000'))
+MATCH_POOL_MIN_CANDIDATES = int(os.environ.get('MATCH_POOL_MIN_CANDIDATES', '2000'))
+CANDIDATE_PREF_FIELDS = ['user_id', 'hard_skills', 'experience_level', 'availability', 'work_type', 'career_goals']
+_scoring_pool = None
+
+def get_scoring_pool() -> ProcessPoolExecutor:
+    global _scoring_pool
+    if _scoring_pool is None:
+        _scoring_pool = ProcessPoolExecutor(
+            max_workers=MATCH_POOL_WORKERS,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    return _scoring_pool
+
+def compact_candidate(candidate: dict, candidate_prefs: dict) -> tuple[dict, dict]:
+    """Only the candidate fields score_candidate reads"""
+    return (
+        {"id": candidate['id'], "full_name": candidate.get('full_name', 'Unknown'), "skills": candidate.get('skills', [])},
+        {field: candidate_prefs[field] for field in CANDIDATE_PREF_FIELDS if field in candidate_prefs}
+    )
+
+def score_candidate_batch(job: dict, job_prefs: dict, records: List[tuple[dict, dict]]) -> List[dict]:
+    """Score compact candidate records against one job; runs inline or in a pool worker"""
+    return [score_candidate(candidate, job, job_prefs, prefs).to_doc() for candidate, prefs in records]
+
+async def score_candidates(job: dict, job_prefs: dict, records: List[tuple[dict, dict]]) -> List[dict]:
+    """Score candidate records against a job, offloading large pools to worker processes"""
+    if MATCH_POOL_WORKERS <= 0 or len(records) < MATCH_POOL_MIN_CANDIDATES:
+        return score_candidate_batch(job, job_prefs, records)
+    
+    compact_job = {"id": job['id'], "location": job.get('location', '')}
+    loop = asyncio.get_running_loop()
+    pool = get_scoring_pool()
+    results = await asyncio.gather(*[
+        loop.run_in_executor(pool, score_candidate_batch, compact_job, job_prefs, records[i:i + MATCH_POOL_BATCH_SIZE])
+        for i in range(0, len(records), MATCH_POOL_BATCH_SIZE)
+    ])
+    return [match for batch in results for match in batch]
+
+# Inverted Skill Index
+# skill_index holds one {skill, user_id, active, updated_at} document per
+# normalized skill of each job seeker, so candidates for a job can be generated
+# from posting lists instead of scanning every seeker. Only active postings
+# (seekers with completed preferences) are read, newest first, and each list
+# is capped so a popular skill never loads in full. Startup job preferences
+# carry the same normalized skills as skill_keys, so a seeker's change can
+# find the jobs whose pools it may enter.
+CANDIDATE_FALLBACK_POOL = int(os.environ.get('CANDIDATE_FALLBACK_POOL', '50'))
+SKILL_POSTING_LIMIT = int(os.environ.get('SKILL_POSTING_LIMIT', str(CANDIDATE_POOL_LIMIT)))
+SKILL_INDEX_FORMAT = 3
+
+def job_skill_keys(job_prefs: dict) -> List[str]:
+    """Normalized skills a job's candidate pool is generated from"""
+    return sorted({normalize_skill(s) for s in job_prefs.get('must_have_skills', []) + job_prefs.get('good_to_have_skills', [])} - {''})
+
+async def reindex_seeker_skills(user_id: str):
+    """Sync a job seeker's skill_index postings with their profile and preferences"""
+    user = await db.users.find_one({"id": user_id}, {"_id": 0, "role": 1, "skills": 1})
+    prefs = await db.job_seeker_preferences.find_one({"user_id": user_id}, {"_id": 0, "hard_skills": 1, "completed": 1})
+    
+    skills = set()
+    if user and user.get('role') == 'job_seeker':
+        skills = {normalize_skill(s) for s in (user.get('skills') or []) + ((prefs or {}).get('hard_skills') or [])}
+        skills.discard('')
+    
+    await db.skill_index.delete_many({"user_id": user_id, "skill": {"$nin": list(skills)}})
+    if skills:
+        posting = {
+            "user_id": user_id,
+            "active": bool((prefs or {}).get('completed')),
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }
+        await db.skill_index.bulk_write([
+            UpdateOne({"skill": skill, "user_id": user_id}, {"$set": {"skill": skill, **posting}}, upsert=True)
+            for skill in skills
+        ], ordered=False)
+
+async def rebuild_skill_index():
+    """Build skill_index, and the jobs' skill_keys, when empty or written in an older format"""
+    state = await db.match_state.find_one({"key": "skill_index"}, {"_id": 0})
+    if (state or {}).get('format') == SKILL_INDEX_FORMAT and await db.skill_index.estimated_document_count() > 0:
+        return
+    async for prefs in db.job_seeker_preferences.find({}, {"_id": 0, "user_id": 1}):
+        await reindex_seeker_skills(prefs['user_id'])
+    async for job_prefs in db.startup_job_preferences.find({}, {"_id": 0, "job_id": 1, "must_have_skills": 1, "good_to_have_skills": 1}):
+        await db.startup_job_preferences.update_one({"job_id": job_prefs['job_id']}, {"$set": {"skill_keys": job_skill_keys(job_prefs)}})
+    await db.match_state.update_one({"key": "skill_index"}, {"$set": {"format": SKILL_INDEX_FORMAT}}, upsert=True)
+    logging.info("Skill index rebuilt")
+
+async def read_skill_postings(skill: str, limit: int) -> set:
+    cursor = db.skill_index.find({"skill": skill, "active": True}, {"_id": 0, "user_id": 1})
+    return {posting['user_id'] async for posting in cursor.sort("updated_at", -1).limit(limit)}
+
+async def candidate_ids_for_skills(skills: set, limit: int = CANDIDATE_POOL_LIMIT) -> List[str]:
+    """Active seekers sharing at least one of the given skills, strongest overlap first
+
+    Seekers holding every skill (the intersection of the posting lists) come
+    first, followed by the rest of the union ranked by how many skills they share.
+    Each posting list is read at most SKILL_POSTING_LIMIT entries deep.
+    """
+    skills = sorted({normalize_skill(s) for s in skills} - {''})
+    lists = await asyncio.gather(*[read_skill_postings(skill, SKILL_POSTING_LIMIT) for skill in skills])
+    postings = [user_ids for user_ids in lists if user_ids]
+    
+    if not postings:
+        return []
+    
+    overlap = {}
+    for user_ids in postings:
+        for user_id in user_ids:
+            overlap[user_id] = overlap.get(user_id, 0) + 1
+    
+    full_match = set.intersection(*postings) if len(postings) == len(skills) else set()
+    ranked = sorted(overlap, key=lambda uid: (uid not in full_match, -overlap[uid]))
+    return ranked[:limit]
+
+MATCH_BATCH_SIZE = int(os.environ.get('MATCH_BATCH_SIZE', '500'))
+MATCH_TOP_K = int(os.environ.get('MATCH_TOP_K', '200'))
+
+# Approximate Nearest Neighbour Index
+# Jobs and job seekers are embedded as dense vectors (hashed skills plus
+# experience, work mode and salary dimensions) and kept in random-projection
+# LSH indexes, so a large catalog or seeker pool can be narrowed to the most
+# similar items before exact scoring. Each process keeps its own in-memory
+# indexes, updated on its own writes, synced every ANN_SYNC_INTERVAL seconds
+# with writes made by other workers, and persisted to ANN_INDEX_DIR (by
+# default under the user's state directory, outside the source tree) so
+# restarts only replay what changed since the last save. Below ANN_MIN_ITEMS
+# the engines keep scoring exhaustively.
+ANN_TABLES = int(os.environ.get('ANN_TABLES', '16'))
+ANN_BITS = int(os.environ.get('ANN_BITS', '10'))
+# Recall versus latency: more probes and candidates find more true neighbours
+# at the cost of scoring more items
+ANN_PROBES = int(os.environ.get('ANN_PROBES', '1'))
+ANN_CANDIDATES = int(os.environ.get('ANN_CANDIDATES', '2000'))
+ANN_MIN_ITEMS = int(os.environ.get('ANN_MIN_ITEMS', '5000'))
+ANN_INDEX_DIR = Path(os.environ.get('ANN_INDEX_DIR') or (
+    Path(os.environ.get('XDG_STATE_HOME') or Path.home() / '.local' / 'state') / 'bharatvapari' / 'ann_index' / os.environ['DB_NAME']
+))
+ANN_SAVE_DELAY = int(os.environ.get('ANN_SAVE_DELAY', '30'))
+ANN_SYNC_INTERVAL = int(os.environ.get('ANN_SYNC_INTERVAL', '5'))
+ANN_VECTOR_FORMAT = 1
+
+ANN_SKILL_DIMENSIONS = 256
+ANN_EXPERIENCE_LEVELS = ['student', 'fresher', '1-3yrs', '3-5yrs', '5+yrs']
+ANN_WORK_MODES = [WORK_MODE_REMOTE, WORK_MODE_HYBRID, WORK_MODE_ONSITE]
+ANN_DIMENSIONS = ANN_SKILL_DIMENSIONS + len(ANN_EXPERIENCE_LEVELS) + len(ANN_WORK_MODES) + 1
+ANN_SALARY_SCALE = np.log1p(1_000_000)
+JOB_BAND_LEVELS = {
+    EXPERIENCE_BAND_FRESHER: ['student', 'fresher'],
+    EXPERIENCE_BAND_EARLY: ['fresher', '1-3yrs'],
+    EXPERIENCE_BAND_OPEN: []
+}
+
+def ann_vector(skills, levels: dict, work_modes, salary: Optional[float]) -> np.ndarray:
+    """Unit vector from skills, weighted experience levels, work modes and a monthly salary"""
+    vector = np.zeros(ANN_DIMENSIONS, dtype=np.float32)
+    skill_ids = [zlib.crc32(skill.encode()) % ANN_SKILL_DIMENSIONS for skill in skills]
+    if skill_ids:
+        vector[skill_ids] = 1 / np.sqrt(len(skill_ids))
+    offset = ANN_SKILL_DIMENSIONS
+    for level, weight in levels.items():
+        vector[offset + ANN_EXPERIENCE_LEVELS.index(level)] = 0.5 * weight
+    offset += len(ANN_EXPERIENCE_LEVELS)
+    for mode in work_modes:
+        vector[offset + ANN_WORK_MODES.index(mode)] = 0.5
+    offset += len(ANN_WORK_MODES)
+    if salary:
+        vector[offset] = 0.5 * np.log1p(salary) / ANN_SALARY_SCALE
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+def job_ann_vector(job: dict) -> np.ndarray:
+    features = job_features(job)
+    salaries = [v for v in [features['salary_min'], features['salary_max']] if v is not None]
+    return ann_vector(
+        features['skill_ids'],
+        {level: 1.0 for level in JOB_BAND_LEVELS[features['experience_band']]},
+        features['work_modes'],
+        sum(salaries) / len(salaries) if salaries else None
+    )
+
+def seeker_ann_vector(user: dict, preferences: dict) -> np.ndarray:
+    skills = {normalize_skill(s) for s in (user.get('skills') or []) + (preferences.get('hard_skills') or [])} - {''}
+    level = preferences.get('experience_level', 'fresher')
+    levels = {}
+    if level in ANN_EXPERIENCE_LEVELS:
+        i = ANN_EXPERIENCE_LEVELS.index(level)
+        levels = {ANN_EXPERIENCE_LEVELS[j]: 1.0 if j == i else 0.5 for j in range(max(i - 1, 0), min(i + 2, len(ANN_EXPERIENCE_LEVELS)))}
+    work_modes = {
+        WORK_MODE_ONSITE if w.lower() in ['on-site', 'onsite'] else w.lower()
+        for w in preferences.get('work_type', [])
+    } & set(ANN_WORK_MODES)
+    return ann_vector(sorted(skills), levels, sorted(work_modes), preferences.get('salary_min'))
+
+def hiring_ann_vector(job: dict, job_prefs: dict) -> np.ndarray:
+    """Vector of the candidate a startup is looking for, in seeker space"""
+    ideal = job_prefs.get('ideal_experience', 'fresher')
+    levels = {ideal: 1.0} if ideal in ANN_EXPERIENCE_LEVELS else {}
+    return ann_vector(job_skill_keys(job_prefs), levels, job_features(job)['work_modes'], None)
+
+class LSHIndex:
+    """Random-projection LSH over unit vectors, with multi-probe queries
+
+    Each of the index's tables hashes a vector to the sign pattern of its
+    projections onto random hyperplanes; a query collects the items sharing a
+    bucket, or one within ANN_PROBES bit flips, in any table and ranks them
+    by cosine similarity.
+    """
+
+    def __init__(self, name: str, dimensions: int = ANN_DIMENSIONS, tables: int = ANN_TABLES, bits: int = ANN_BITS, seed: int = 0):
+        self.name = name
+        self.config = np.array([ANN_VECTOR_FORMAT, dimensions, tables, bits, seed])
+        self.planes = np.random.default_rng(seed).standard_normal((tables, bits, dimensions)).astype(np.float32)
+        self.bit_values = 1 << np.arange(bits, dtype=np.int64)
+        self.buckets = [{} for _ in range(tables)]
+        self.matrix = np.zeros((1024, dimensions), dtype=np.float32)
+        self.signatures = np.zeros((1024, tables), dtype=np.int64)
+        self.keys = []
+        self.slots = {}
+        self.free = []
+        self.ready = False
+        self.synced_at = ""
+
+    def __len__(self):
+        return len(self.slots)
+
+    def hash(self, vectors: np.ndarray) -> np.ndarray:
+        """Bucket signature of each vector in each table, shape (n, tables)"""
+        return (np.einsum('tbd,nd->ntb', self.planes, vectors) > 0).astype(np.int64) @ self.bit_values
+
+    def add_many(self, keys: List[str], vectors: np.ndarray):
+        for start in range(0, len(keys), 10000):
+            chunk = vectors[start:start + 10000]
+            for key, vector, signature in zip(keys[start:start + 10000], chunk, self.hash(chunk)):
+                self.remove(key)
+                slot = self.free.pop() if self.free else len(self.keys)
+                if slot == len(self.keys):
+                    self.keys.append(key)
+                    if slot >= len(self.matrix):
+                        self.matrix = np.concatenate([self.matrix, np.zeros_like(self.matrix)])
+                        self.signatures = np.concatenate([self.signatures, np.zeros_like(self.signatures)])
+                else:
+                    self.keys[slot] = key
+                self.slots[key] = slot
+                self.matrix[slot] = vector
+                self.signatures[slot] = signature
+                for table, bucket in enumerate(signature):
+                    self.buckets[table].setdefault(int(bucket), set()).add(key)
+
+    def add(self, key: str, vector: np.ndarray):
+        self.add_many([key], vector[np.newaxis])
+
+    def remove(self, key: str):
+        slot = self.slots.pop(key, None)
+        if slot is None:
+            return
+        for table, bucket in enumerate(self.signatures[slot]):
+            members = self.buckets[table].get(int(bucket))
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self.buckets[table][int(bucket)]
+        self.keys[slot] = None
+        self.free.append(slot)
+
+    def probes(self, signature: int, probes: int):
+        bits = len(self.bit_values)
+        for flips in range(probes + 1):
+            for combination in itertools.combinations(range(bits), flips):
+                yield signature ^ sum(1 << bit for bit in combination)
+
+    def query(self, vector: np.ndarray, limit: int, probes: int = ANN_PROBES) -> List[str]:
+        """Keys of up to limit approximate nearest neighbours, most similar first"""
+        found = set()
+        for table, signature in enumerate(self.hash(vector[np.newaxis])[0]):
+            for probe in self.probes(int(signature), probes):
+                found.update(self.buckets[table].get(probe, ()))
+        if not found:
+            return []
+        keys = list(found)
+        similarity = self.matrix[[self.slots[key] for key in keys]] @ vector
+        top = np.argsort(-similarity, kind="stable")[:limit]
+        return [keys[i] for i in top]
+
+    def usable(self) -> bool:
+        return self.ready and len(self) >= ANN_MIN_ITEMS
+
+    def save(self, directory: Path):
+        """Write the live vectors atomically; buckets are rebuilt on load
+
+        Each save writes its own temporary file, so workers saving at the
+        same time never interleave, and the last rename wins.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        slots = list(self.slots.values())
+        path = directory / f"{self.name}.npz"
+        tmp = tempfile.NamedTemporaryFile(dir=directory, prefix=f"{self.name}.", suffix=".tmp.npz", delete=False)
+        try:
+            with tmp:
+                np.savez(
+                    tmp,
+                    config=self.config,
+                    synced_at=np.array(self.synced_at),
+                    keys=np.array([self.keys[slot] for slot in slots], dtype=str),
+                    vectors=self.matrix[slots]
+                )
+            os.replace(tmp.name, path)
+        except BaseException:
+            Path(tmp.name).unlink(missing_ok=True)
+            raise
+
+    def load(self, directory: Path) -> bool:
+        """Load persisted vectors; False if missing or built with another configuration"""
+        path = directory / f"{self.name}.npz"
+        if not path.exists():
+            return False
+        try:
+            with np.load(path) as data:
+                if not np.array_equal(data['config'], self.config):
+                    return False
+                self.add_many(data['keys'].tolist(), data['vectors'])
+                self.synced_at = str(data['synced_at'])
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning(f"Could not load {path}: {e}")
+            return False
+        return True
+
+job_ann_index = LSHIndex("jobs")
+seeker_ann_index = LSHIndex("seekers")
+_ann_save_task = None
+
+def schedule_ann_save():
+    """Persist the indexes a short while after the latest change"""
+    global _ann_save_task
+    if _ann_save_task is None or _ann_save_task.done():
+        _ann_save_task = run_in_background(save_ann_indexes(ANN_SAVE_DELAY))
+
+async def save_ann_indexes(delay: float = 0):
+    await asyncio.sleep(delay)
+    for index in [job_ann_index, seeker_ann_index]:
+        if index.ready:
+            await asyncio.to_thread(index.save, ANN_INDEX_DIR)
+
+async def reindex_seeker_vector(user_id: str):
+    """Sync a job seeker's vector in the seeker index with their profile and preferences"""
+    if not seeker_ann_index.ready:
+        return
+    user = await db.users.find_one({"id": user_id}, {"_id": 0, "role": 1, "skills": 1})
+    prefs = await db.job_seeker_preferences.find_one({"user_id": user_id}, {"_id": 0, "text_vector": 0})
+    if user and user.get('role') == 'job_seeker' and prefs and prefs.get('completed'):
+        seeker_ann_index.add(user_id, seeker_ann_vector(user, prefs))
+    else:
+        seeker_ann_index.remove(user_id)
+    schedule_ann_save()
+
+def index_jobs(jobs: List[dict]):
+    if job_ann_index.ready and jobs:
+        job_ann_index.add_many([job['id'] for job in jobs], np.stack([job_ann_vector(job) for job in jobs]))
+        schedule_ann_save()
+
+def unindex_jobs(job_ids: List[str]):
+    if job_ann_index.ready:
+        for job_id in job_ids:
+            job_ann_index.remove(job_id)
+        schedule_ann_save()
+
+_ann_last_sync = {"at": 0.0}
+
+async def sync_ann_indexes(force: bool = False):
+    """Pick up jobs and job seekers written since the indexes were last synced
+
+    Jobs deleted elsewhere may linger as candidates; exact scoring only ever
+    reads jobs and seekers that still exist, so they simply drop out.
+    """
+    if not job_ann_index.ready or (not force and time.monotonic() - _ann_last_sync["at"] < ANN_SYNC_INTERVAL):
+        return
+    _ann_last_sync["at"] = time.monotonic()
+    now = datetime.now(timezone.utc).isoformat()
+    
+    since, job_ann_index.synced_at = job_ann_index.synced_at, now
+    jobs = await db.jobs.find({"status": "active", "created_at": {"$gt": since}}, {"_id": 0}).to_list(None)
+    index_jobs([job for job in jobs if job['id'] not in job_ann_index.slots])
+    
+    since, seeker_ann_index.synced_at = seeker_ann_index.synced_at, now
+    changed = set(await db.job_seeker_preferences.distinct("user_id", {"updated_at": {"$gt": since}}))
+    changed.update(await db.users.distinct("id", {"role": "job_seeker", "updated_at": {"$gt": since}}))
+    for user_id in changed:
+        await reindex_seeker_vector(user_id)
+
+async def build_ann_indexes():
+    """Load the persisted indexes, or rebuild them from the database, then catch up"""
+    started_at = datetime.now(timezone.utc).isoformat()
+    if not await asyncio.to_thread(job_ann_index.load, ANN_INDEX_DIR):
+        job_ann_index.synced_at = started_at
+        batch = []
+        async for job in db.jobs.find({"status": "active"}, {"_id": 0}).batch_size(MATCH_BATCH_SIZE):
+            batch.append(job)
+            if len(batch) >= MATCH_BATCH_SIZE:
+                job_ann_index.add_many([j['id'] for j in batch], np.stack([job_ann_vector(j) for j in batch]))
+                batch = []
+        if batch:
+            job_ann_index.add_many([j['id'] for j in batch], np.stack([job_ann_vector(j) for j in batch]))
+    
+    if not await asyncio.to_thread(seeker_ann_index.load, ANN_INDEX_DIR):
+        seeker_ann_index.synced_at = started_at
+        keys, vectors = [], []
+        async for prefs in db.job_seeker_preferences.aggregate(candidate_pool_pipeline(limit=None)):
+            keys.append(prefs['user_id'])
+            vectors.append(seeker_ann_vector(prefs.pop('user'), prefs))
+        if keys:
+            seeker_ann_index.add_many(keys, np.stack(vectors))
+    
+    job_ann_index.ready = seeker_ann_index.ready = True
+    await sync_ann_indexes(force=True)
+    await save_ann_indexes()
+    logging.info(f"ANN indexes ready ({len(job_ann_index)} jobs, {len(seeker_ann_index)} seekers)")
+
+# Materialized Match Scores
+# match_scores holds one row per (job_id, user_id, side): "seeker" rows rank jobs
+# for a job seeker, "startup" rows rank candidates for a job. Each row carries a
+# version stamp built from its inputs' updated_at; rows are marked dirty when an
+# input changes and recomputed in the background, or on the next read.
+async def job_catalog_version() -> int:
+    state = await db.match_state.find_one({"key": "job_catalog"}, {"_id": 0})
+    return state['version'] if state else 0
+
+async def bump_job_catalog_version():
+    """Advance the catalog version after a job is created or deleted"""
+    await db.match_state.update_one({"key": "job_catalog"}, {"$inc": {"version": 1}}, upsert=True)
+
+# Bumped whenever the layout or scoring of stored score records changes
+MATCH_ROW_FORMAT = 4
+
+# The catalog version is kept beside the stamp rather than in it: a job post
+# or deletion does not make every seeker stale, the catalog refresh below
+# brings their rows up to date instead.
+def seeker_match_version(user: dict, preferences: dict) -> dict:
+    return {
+        "format": MATCH_ROW_FORMAT,
+        "user": user.get('updated_at'),
+        "prefs": preferences.get('updated_at')
+    }
+
+def candidate_match_version(job_prefs: dict, candidate: dict, candidate_prefs: dict) -> dict:
+    return {
+        "format": MATCH_ROW_FORMAT,
+        "job_prefs": job_prefs.get('updated_at'),
+        "user": candidate.get('updated_at'),
+        "prefs": candidate_prefs.get('updated_at')
+    }
+
+async def seeker_matches_stale(user: dict, preferences: dict) -> bool:
+    summary = await db.match_state.find_one({"key": f"seeker:{user['id']}"}, {"_id": 0})
+    if not summary:
+        return True
+    current = seeker_match_version(user, preferences)
+    return summary.get('dirty', False) or summary.get('version') != current
+
+class _RankedJob:
+    """Heap entry ordering jobs by score, with the lower job_id winning ties"""
+    __slots__ = ("score", "job_id", "record")
+
+    def __init__(self, score: int, job_id: str, record: Optional[JobScore]):
+        self.score = score
+        self.job_id = job_id
+        self.record = record
+
+    def __lt__(self, other):
+        if self.score != other.score:
+            return self.score < other.score
+        return self.job_id > other.job_id
+
+def _push_top_k(heap: list, entry: _RankedJob, k: int):
+    if len(heap) < k:
+        heapq.heappush(heap, entry)
+    elif heap[0] < entry:
+        heapq.heapreplace(heap, entry)
+
+def score_job_batch(jobs: List[dict], preferences: dict, user: dict, idf: Optional[np.ndarray], k: int) -> List[dict]:
+    """Score a batch of jobs for one seeker; runs inline or in a pool worker
+
+    Returns the sub-scores of the batch's best k jobs in each category.
+    """
+    matrix = JobFeatureMatrix(jobs)
+    scores = matrix.score(preferences, user, idf)
+    match_scores = np.minimum(scores["total"], 100)
+    heaps = {"best": [], "good": [], "stretch": []}
+    for row in range(len(jobs)):
+        heap = heaps[match_category_for(int(scores["total"][row]))]
+        entry = _RankedJob(int(match_scores[row]), jobs[row]['id'], None)
+        if len(heap) < k or heap[0] < entry:
+            entry.record = row
+            _push_top_k(heap, entry, k)
+    return [matrix.job_score(scores, entry.record).to_doc() for heap in heaps.values() for entry in heap]
+
+async def recompute_seeker_matches(user_id: str):
+    """Rescore a job seeker against the whole active catalog and replace their seeker rows
+
+    Jobs are streamed through a batched cursor and scored a batch at a time,
+    on the scoring pool once the seeker's catalog reaches
+    MATCH_POOL_MIN_CANDIDATES jobs; only the best MATCH_TOP_K jobs per category
+    are kept, in bounded heaps, so memory stays constant however large the
+    catalog grows.
+    """
+    catalog_version = await job_catalog_version()
+    user = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0})
+    preferences = await db.job_seeker_preferences.find_one({"user_id": user_id}, {"_id": 0})
+    
+    if not user or not preferences or not preferences.get('completed'):
+        await db.match_scores.delete_many({"user_id": user_id, "side": "seeker"})
+        await db.match_state.delete_one({"key": f"seeker:{user_id}"})
+        return
+    
+    heaps = {"best": [], "good": [], "stretch": []}
+    idf = await term_idf(catalog_version)
+    
+    # total counts the whole active catalog, even when only the seeker's
+    # nearest jobs are exactly scored below
+    query = {"status": "active"}
+    total = considered = await db.jobs.count_documents(query)
+    await sync_ann_indexes()
+    if job_ann_index.usable():
+        nearest = job_ann_index.query(seeker_ann_vector(user, preferences), ANN_CANDIDATES)
+        query["id"] = {"$in": nearest}
+        considered = len(nearest)
+    
+    offload = MATCH_POOL_WORKERS > 0 and considered >= MATCH_POOL_MIN_CANDIDATES
+    loop = asyncio.get_running_loop()
+    
+    async def score_batch(jobs):
+        if offload:
+            docs = await loop.run_in_executor(get_scoring_pool(), score_job_batch, jobs, preferences, user, idf, MATCH_TOP_K)
+        else:
+            docs = score_job_batch(jobs, preferences, user, idf, MATCH_TOP_K)
+        for doc in docs:
+            record = JobScore.from_doc(doc)
+            _push_top_k(heaps[match_category_for(record.total)], _RankedJob(min(record.total, 100), record.job_id, record), MATCH_TOP_K)
+    
+    batch = []
+    async for job in db.jobs.find(query, {"_id": 0}).batch_size(MATCH_BATCH_SIZE):
+        batch.append(job)
+        if len(batch) >= MATCH_BATCH_SIZE:
+            await score_batch(batch)
+            batch = []
+    if batch:
+        await score_batch(batch)
+    
+    version = seeker_match_version(user, preferences)
+    now = datetime.now(timezone.utc).isoformat()
+    records = [entry.record for heap in heaps.values() for entry in heap]
+    
+    await db.match_scores.delete_many({
+        "user_id": user_id,
+        "side": "seeker",
+        "job_id": {"$nin": [r.job_id for r in records]}
+    })
+    if records:
+        await db.match_scores.bulk_write([
+            ReplaceOne(
+                {"job_id": r.job_id, "user_id": user_id, "side": "seeker"},
+                {
+                    "job_id": r.job_id,
+                    "user_id": user_id,
+                    "side": "seeker",
+                    "score": min(r.total, 100),
+                    "category": match_category_for(r.total),
+                    "sub": r.to_doc(),
+                    "dirty": False,
+                    "updated_at": now
+                },
+                upsert=True
+            )
+            for r in records
+        ], ordered=False)
+    await db.match_state.update_one(
+        {"key": f"seeker:{user_id}"},
+        {"$set": {"version": version, "catalog": catalog_version, "total": total, "dirty": False, "updated_at": now}},
+        upsert=True
+    )
+
+def encode_cursor(values: list) -> str:
+    """Opaque pagination token for a keyset position"""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+# Listings page newest first on (created_at, id) so that a cursor resumes with
+# an indexed range query instead of skipping over earlier pages
+MAX_PAGE_SIZE = 100
+
+async def read_page(
+    collection,
+    query: dict,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    id_field: str = "id",
+    projection: Optional[dict] = None
+) -> tuple[List[dict], Optional[str]]:
+    """Read one page of a listing and the cursor for the next, or None on the last page
+
+    Without a cursor, skip is still honoured for older clients.
+    """
+    limit = min(max(limit, 1), MAX_PAGE_SIZE)
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != 2:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        created_at, last_id = values
+        after = [{"created_at": created_at, id_field: {"$lt": last_id}}]
+        if created_at is not None:
+            # Rows without created_at sort after every timestamp
+            after += [{"created_at": {"$lt": created_at}}, {"created_at": None}]
+        query = {"$and": [query, {"$or": after}]} if query else {"$or": after}
+    
+    find = collection.find(query, projection or {"_id": 0}).sort([("created_at", -1), (id_field, -1)])
+    if skip and not cursor:
+        find = find.skip(skip)
+    docs = await find.limit(limit + 1).to_list(limit + 1)
+    
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor([docs[-1].get('created_at'), docs[-1][id_field]])
+    return docs, next_cursor
+
+def decode_match_cursor(cursor: str) -> tuple:
+    values = decode_cursor(cursor)
+    if (
+        len(values) != 2
+        or not isinstance(values[0], (int, float)) or isinstance(values[0], bool)
+        or not isinstance(values[1], str)
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return tuple(values)
+
+async def read_seeker_matches(user_id: str, category: str, limit: int, cursor: Optional[str] = None) -> tuple[List[dict], Optional[str]]:
+    """Page through a seeker's ranked rows in one category
+
+    Returns the matches and a cursor for the next page, or None on the last page.
+    Explanations are built here, for the returned page only.
+    """
+    query = {"user_id": user_id, "side": "seeker", "category": category}
+    if cursor:
+        score, job_id = decode_match_cursor(cursor)
+        query["$or"] = [{"score": {"$lt": score}}, {"score": score, "job_id": {"$gt": job_id}}]
+    
+    rows = await db.match_scores.find(
+        query,
+        {"_id": 0, "sub": 1, "score": 1, "job_id": 1}
+    ).sort([("score", -1), ("job_id", 1)]).limit(limit + 1).to_list(limit + 1)
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1]['score'], rows[-1]['job_id']])
+    return [explain_job_score(JobScore.from_doc(row['sub'])).model_dump() for row in rows], next_cursor
+
+async def retrieve_candidate_ids(job: dict, job_prefs: dict) -> tuple[Optional[List[str]], bool]:
+    """Generate the candidate pool for a job before exact scoring
+
+    Returns the candidate ids, or None to consider the general pool, and
+    whether a fallback pool of seekers sharing none of the job's skills
+    should be added.
+    """
+    await sync_ann_indexes()
+    if seeker_ann_index.usable():
+        # On a large seeker pool, retrieve the nearest seekers
+        return seeker_ann_index.query(hiring_ann_vector(job, job_prefs), CANDIDATE_POOL_LIMIT), False
+    
+    # Otherwise generate candidates from the skill index; without skills, consider everyone
+    job_skills = job_skill_keys(job_prefs)
+    if job_skills:
+        return await candidate_ids_for_skills(set(job_skills)), True
+    return None, False
+
+def candidate_match_row(job_id: str, score: dict, version: dict, now: str) -> dict:
+    return {
+        "job_id": job_id,
+        "user_id": score['user_id'],
+        "side": "startup",
+        "score": min(score['total'], 100),
+        "sub": score,
+        "version": version,
+        "dirty": False,
+        "updated_at": now
+    }
+
+async def recompute_candidate_matches(job: dict, job_prefs: dict, user_ids: Optional[List[str]] = None):
+    """Rescore candidates for a job and store their startup rows
+
+    With user_ids, only those candidates are rescored; otherwise the whole
+    candidate pool is regenerated and rows outside it are dropped, settling
+    any seeker changes flagged on the job's pool_dirty up to now.
+    """
+    started_at = datetime.now(timezone.utc).isoformat()
+    if user_ids is not None:
+        pipelines = [candidate_pool_pipeline(match={"user_id": {"$in": user_ids}})]
+    else:
+        candidate_ids, fallback = await retrieve_candidate_ids(job, job_prefs)
+        if candidate_ids is None:
+            pipelines = [candidate_pool_pipeline()]
+        else:
+            pipelines = [candidate_pool_pipeline(match={"user_id": {"$in": candidate_ids}})]
+            if fallback and CANDIDATE_FALLBACK_POOL > 0:
+                pipelines.append(candidate_pool_pipeline(
+                    limit=CANDIDATE_FALLBACK_POOL,
+                    match={"user_id": {"$nin": candidate_ids}}
+                ))
+    
+    # Load job seekers joined with their completed preferences as compact records
+    records = []
+    versions = []
+    for pipeline in pipelines:
+        async for candidate_prefs in db.job_seeker_preferences.aggregate(pipeline):
+            candidate = candidate_prefs.pop('user')
+            records.append(compact_candidate(candidate, candidate_prefs))
+            versions.append(candidate_match_version(job_prefs, candidate, candidate_prefs))
+    
+    scores = await score_candidates(job, job_prefs, records)
+    now = datetime.now(timezone.utc).isoformat()
+    rows = [candidate_match_row(job['id'], score, version, now) for score, version in zip(scores, versions)]
+    
+    # Drop rows for candidates who are no longer in the pool
+    scored_ids = [row['user_id'] for row in rows]
+    if user_ids is None:
+        dropped = {"$nin": scored_ids}
+    else:
+        dropped = {"$in": list(set(user_ids) - set(scored_ids))}
+    await db.match_scores.delete_many({"job_id": job['id'], "side": "startup", "user_id": dropped})
+    if rows:
+        await db.match_scores.bulk_write([
+            ReplaceOne({"job_id": row['job_id'], "user_id": row['user_id'], "side": "startup"}, row, upsert=True)
+            for row in rows
+        ], ordered=False)
+    if user_ids is None:
+        await db.startup_job_preferences.update_one(
+            {"job_id": job['id'], "pool_dirty": {"$lte": started_at}},
+            {"$unset": {"pool_dirty": ""}}
+        )
+
+async def candidate_matches_stale(job_id: str, job_prefs: dict) -> bool:
+    row = await db.match_scores.find_one({"job_id": job_id, "side": "startup"}, {"_id": 0, "version": 1})
+    return (
+        not row
+        or bool(job_prefs.get('pool_dirty'))
+        or row['version'].get('format') != MATCH_ROW_FORMAT
+        or row['version'].get('job_prefs') != job_prefs.get('updated_at')
+    )
+
+async def refresh_seeker_match_scores(user_id: str):
+    """Recompute both sides of a job seeker's rows after their inputs changed
+
+    Startup rows the seeker already has are rescored in place, a batch of jobs
+    at a time. Jobs sharing a skill with the seeker, whose generated pools the
+    change may have let them into, are flagged pool_dirty instead, so the next
+    read regenerates those pools through retrieval rather than adding rows
+    for candidates outside them.
+    """
+    await recompute_seeker_matches(user_id)
+    
+    seekers = await db.job_seeker_preferences.aggregate(
+        candidate_pool_pipeline(limit=1, match={"user_id": user_id})
+    ).to_list(1)
+    if not seekers:
+        await db.match_scores.delete_many({"user_id": user_id, "side": "startup"})
+        return
+    candidate = seekers[0].pop('user')
+    record = compact_candidate(candidate, seekers[0])
+    
+    job_ids = await db.match_scores.distinct("job_id", {"user_id": user_id, "side": "startup"})
+    for i in range(0, len(job_ids), MATCH_BATCH_SIZE):
+        batch = job_ids[i:i + MATCH_BATCH_SIZE]
+        jobs = {
+            job['id']: job
+            async for job in db.jobs.find({"id": {"$in": batch}, "status": "active"}, {"_id": 0})
+        }
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [
+            candidate_match_row(
+                job_prefs['job_id'],
+                score_candidate_batch(jobs[job_prefs['job_id']], job_prefs, [record])[0],
+                candidate_match_version(job_prefs, candidate, seekers[0]),
+                now
+            )
+            async for job_prefs in db.startup_job_preferences.find({"job_id": {"$in": list(jobs)}}, {"_id": 0})
+        ]
+        if rows:
+            await db.match_scores.bulk_write([
+                ReplaceOne({"job_id": row['job_id'], "user_id": user_id, "side": "startup"}, row, upsert=True)
+                for row in rows
+            ], ordered=False)
+    
+    skills = {normalize_skill(s) for s in (candidate.get('skills') or []) + (seekers[0].get('hard_skills') or [])} - {''}
+    if skills:
+        await db.startup_job_preferences.update_many(
+            {"skill_keys": {"$in": sorted(skills)}, "job_id": {"$nin": job_ids}},
+            {"$set": {"pool_dirty": datetime.now(timezone.utc).isoformat()}}
+        )
+
+async def mark_seeker_matches_dirty(user_id: str):
+    """Flag a job seeker's rows for recomputation and refresh them in the background"""
+    await db.match_scores.update_many({"user_id": user_id}, {"$set": {"dirty": True}})
+    await db.match_state.update_one({"key": f"seeker:{user_id}"}, {"$set": {"dirty": True}})
+    run_in_background(refresh_seeker_match_scores(user_id))
+
+# Catalog Refresh
+# Job posts and deletions are folded into a single background refresh per
+# process: the first change arms it, it starts CATALOG_REFRESH_DELAY seconds
+# later, and changes arriving meanwhile or during the refresh schedule at most
+# one more pass. Seekers already refreshed at the current catalog version,
+# e.g. by another worker, are skipped, and the refresh pauses between seekers
+# so it never holds the event loop.
+CATALOG_REFRESH_DELAY = float(os.environ.get('CATALOG_REFRESH_DELAY', '30'))
+CATALOG_REFRESH_PAUSE = float(os.environ.get('CATALOG_REFRESH_PAUSE', '0.01'))
+_catalog_refresh = {"task": None, "pending": False}
+
+async def refresh_all_seeker_matches():
+    """Recompute the rows of every seeker not yet refreshed at the current catalog version"""
+    catalog_version = await job_catalog_version()
+    current = set(await db.match_state.distinct(
+        "key",
+        {"key": {"$regex": "^seeker:"}, "catalog": {"$gte": catalog_version}, "dirty": False}
+    ))
+    refreshed = 0
+    async for preferences in db.job_seeker_preferences.find({"completed": True}, {"_id": 0, "user_id": 1}):
+        if f"seeker:{preferences['user_id']}" in current:
+            continue
+        await recompute_seeker_matches(preferences['user_id'])
+        refreshed += 1
+        await asyncio.sleep(CATALOG_REFRESH_PAUSE)
+    return refreshed
+
+async def catalog_refresher():
+    """Run catalog refreshes until no change is pending"""
+    try:
+        while _catalog_refresh["pending"]:
+            await asyncio.sleep(CATALOG_REFRESH_DELAY)
+            _catalog_refresh["pending"] = False
+            refreshed = await refresh_all_seeker_matches()
+            logging.info(f"Catalog refresh recomputed {refreshed} seekers")
+    except Exception as e:
+        logging.error(f"Catalog refresh failed: {str(e)}")
+    finally:
+        _catalog_refresh["task"] = None
+
+def schedule_catalog_refresh():
+    _catalog_refresh["pending"] = True
+    if _catalog_refresh["task"] is None:
+        _catalog_refresh["task"] = run_in_background(catalog_refresher())
+
+async def job_catalog_changed(deleted_job_ids: Optional[List[str]] = None):
+    """Drop rows for deleted jobs and schedule the coalesced seeker refresh"""
+    if deleted_job_ids:
+        await db.match_scores.delete_many({"job_id": {"$in": deleted_job_ids}})
+        await db.match_feed.delete_many({"job_id": {"$in": deleted_job_ids}})
+    await bump_job_catalog_version()
+    schedule_catalog_refresh()
+
+# Job Fan-out
+# A newly posted job is scored against job seekers in the background and its
+# strongest matches are written to each seeker's match_feed, which dashboards
+# read instead of scoring. Jobs wait in an in-process queue and are fanned
+# out one at a time, in batches with a pause between them. Once
+# FANOUT_QUEUE_SIZE jobs are waiting, posting another waits up to
+# FANOUT_ENQUEUE_TIMEOUT seconds for room and then fails with 503, so a bulk
+# import slows itself down instead of starving the API. A queued job is
+# claimed by the worker process holding it (fanout "running" with
+# fanout_claimed_at); on startup each worker claims, one at a time and through
+# the same bounded slots, jobs left "pending" by older code or claimed more
+# than FANOUT_CLAIM_TIMEOUT seconds ago by a worker that stopped, so every job
+# is fanned out by one worker. Feed writes are idempotent, so a job reclaimed
+# while its first worker was still busy only repeats work.
+FANOUT_QUEUE_SIZE = int(os.environ.get('FANOUT_QUEUE_SIZE', '100'))
+FANOUT_ENQUEUE_TIMEOUT = float(os.environ.get('FANOUT_ENQUEUE_TIMEOUT', '10'))
+FANOUT_BATCH_SIZE = int(os.environ.get('FANOUT_BATCH_SIZE', '500'))
+FANOUT_BATCH_PAUSE = float(os.environ.get('FANOUT_BATCH_PAUSE', '0.05'))
+FANOUT_MIN_SCORE = int(os.environ.get('FANOUT_MIN_SCORE', '50'))
+FANOUT_MAX_SEEKERS = int(os.environ.get('FANOUT_MAX_SEEKERS', '20000'))
+FANOUT_CLAIM_TIMEOUT = int(os.environ.get('FANOUT_CLAIM_TIMEOUT', '3600'))
+MATCH_FEED_TTL_DAYS = int(os.environ.get('MATCH_FEED_TTL_DAYS', '14'))
+fanout_queue = asyncio.Queue()
+fanout_capacity = asyncio.Semaphore(FANOUT_QUEUE_SIZE)
+
+async def reserve_fanout_slot():
+    """Wait for room in the fan-out queue, applying backpressure to job posting"""
+    try:
+        await asyncio.wait_for(fanout_capacity.acquire(), FANOUT_ENQUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many jobs are being matched right now. Please retry shortly",
+            headers={"Retry-After": "30"}
+        )
+
+async def fanout_job(job: dict) -> int:
+    """Score a job against job seekers and add strong matches to their feeds
+
+    On a large seeker pool only the FANOUT_MAX_SEEKERS nearest seekers are
+    scored. Returns the number of feed entries written.
+    """
+    idf = await term_idf(await job_catalog_version())
+    match = None
+    await sync_ann_indexes()
+    if seeker_ann_index.usable():
+        match = {"user_id": {"$in": seeker_ann_index.query(job_ann_vector(job), FANOUT_MAX_SEEKERS)}}
+    
+    now = datetime.now(timezone.utc)
+    
+    async def deliver(seekers: List[tuple[dict, dict]]) -> int:
+        # One vectorized pass scores the job against the whole chunk
+        matrix = SeekerFeatureMatrix(seekers)
+        scores = matrix.score(job, idf)
+        entries = [
+            UpdateOne(
+                {"user_id": seekers[row][0]['id'], "job_id": job['id']},
+                {"$setOnInsert": {
+                    "user_id": seekers[row][0]['id'],
+                    "job_id": job['id'],
+                    "score": min(int(scores["total"][row]), 100),
+                    "match": matrix.build_match(job, scores, row).model_dump(),
+                    "seen": False,
+                    "created_at": now
+                }},
+                upsert=True
+            )
+            for row in np.flatnonzero(scores["total"] >= FANOUT_MIN_SCORE)
+        ]
+        if entries:
+            await db.match_feed.bulk_write(entries, ordered=False)
+        return len(entries)
+    
+    delivered = 0
+    seekers = []
+    async for preferences in db.job_seeker_preferences.aggregate(candidate_pool_pipeline(limit=None, match=match, include_text=True)):
+        seekers.append((preferences.pop('user'), preferences))
+        if len(seekers) >= FANOUT_BATCH_SIZE:
+            delivered += await deliver(seekers)
+            seekers = []
+            await asyncio.sleep(FANOUT_BATCH_PAUSE)
+    if seekers:
+        delivered += await deliver(seekers)
+    return delivered
+
+async def requeue_fanouts() -> int:
+    """Claim and queue jobs whose fan-out no running worker holds
+
+    Returns the number of jobs queued.
+    """
+    queued = 0
+    while True:
+        await fanout_capacity.acquire()
+        now = datetime.now(timezone.utc)
+        job = await db.jobs.find_one_and_update(
+            {"$or": [
+                {"fanout": "pending"},
+                {"fanout": "running", "fanout_claimed_at": {"$lt": now - timedelta(seconds=FANOUT_CLAIM_TIMEOUT)}}
+            ]},
+            {"$set": {"fanout": "running", "fanout_claimed_at": now}},
+            projection={"_id": 0, "id": 1}
+        )
+        if not job:
+            fanout_capacity.release()
+            return queued
+        fanout_queue.put_nowait(job['id'])
+        queued += 1
+
+async def fanout_worker():
+    """Fan out queued jobs one at a time, for the life of the process"""
+    while True:
+        job_id = await fanout_queue.get()
+        try:
+            job = await db.jobs.find_one({"id": job_id, "status": "active"}, {"_id": 0})
+            if job:
+                delivered = await fanout_job(job)
+                logging.info(f"Fanned out job {job_id} to {delivered} seekers")
+            await db.jobs.update_one({"id": job_id}, {"$set": {"fanout": "done"}})
+        except Exception as e:
+            logging.error(f"Fan-out failed for job {job_id}: {str(e)}")
+        finally:
+            fanout_capacity.release()
+
 def generate_interview_questions(candidate: dict, job: dict, strengths: List[str], gaps: List[str]) -> List[str]:
     """Generate relevant interview questions based on candidate profile"""
     questions = []
@@ -838,7 +2948,7 @@ async def register(user: UserRegister):
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed = bcrypt.hashpw(user.password.encode(), bcrypt.gensalt())
+    hashed = await hash_password(user.password)
     user_obj = User(
         email=user.email,
         full_name=user.full_name,
@@ -846,8 +2956,12 @@ async def register(user: UserRegister):
     )
     
     doc = user_obj.model_dump()
-    doc['password'] = hashed.decode()
-    await db.users.insert_one(doc)
+    doc['password'] = hashed
+    try:
+        await db.users.insert_one(doc)
+    except DuplicateKeyError:
+        # A concurrent registration took the email after the check above
+        raise HTTPException(status_code=400, detail="Email already registered")
     
     token = create_token(user_obj.id, user_obj.email, user_obj.role)
     return {"token": token, "user": user_obj}
@@ -862,8 +2976,10 @@ async def login(credentials: UserLogin):
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
-    if not bcrypt.checkpw(credentials.password.encode(), user['password'].encode()):
+    if not await verify_password(credentials.password, user.get('password')):
         raise HTTPException(status_code=401, detail="Invalid email or password")
+    if password_needs_rehash(user['password']):
+        run_in_background(rehash_password(user['id'], credentials.password, user['password']))
     
     token = create_token(user['id'], user['email'], user['role'])
     user.pop('password')
@@ -876,6 +2992,44 @@ async def get_current_user(request: Request, authorization: str = Header(None)):
     return user
 
 # Google OAuth Routes
+# Session data is fetched over a shared keep-alive client. OAUTH_BASE_URL can
+# point at a local stub provider for tests and load runs. Retries happen only
+# in fetch_oauth_session, so a request is attempted at most OAUTH_RETRIES + 1
+# times whatever fails.
+OAUTH_BASE_URL = os.environ.get('OAUTH_BASE_URL', 'https://demobackend.emergentagent.com').rstrip('/')
+OAUTH_TIMEOUT = float(os.environ.get('OAUTH_TIMEOUT', '10'))
+OAUTH_RETRIES = int(os.environ.get('OAUTH_RETRIES', '2'))
+OAUTH_MAX_CONNECTIONS = int(os.environ.get('OAUTH_MAX_CONNECTIONS', '20'))
+_oauth_client: Optional[httpx.AsyncClient] = None
+
+def get_oauth_client() -> httpx.AsyncClient:
+    global _oauth_client
+    if _oauth_client is None or _oauth_client.is_closed:
+        _oauth_client = httpx.AsyncClient(
+            base_url=OAUTH_BASE_URL,
+            timeout=httpx.Timeout(OAUTH_TIMEOUT, connect=min(OAUTH_TIMEOUT, 5.0)),
+            limits=httpx.Limits(
+                max_connections=OAUTH_MAX_CONNECTIONS,
+                max_keepalive_connections=OAUTH_MAX_CONNECTIONS
+            )
+        )
+    return _oauth_client
+
+async def fetch_oauth_session(session_id: str) -> httpx.Response:
+    """GET the OAuth session data, retrying transport errors and 5xx responses with backoff"""
+    for attempt in range(OAUTH_RETRIES + 1):
+        try:
+            response = await get_oauth_client().get(
+                "/auth/v1/env/oauth/session-data",
+                headers={"X-Session-ID": session_id}
+            )
+            if response.status_code < 500 or attempt == OAUTH_RETRIES:
+                return response
+        except httpx.TransportError:
+            if attempt == OAUTH_RETRIES:
+                raise
+        await asyncio.sleep(0.2 * 2 ** attempt)
+
 @api_router.post("/auth/google/session")
 async def google_session(request: Request, response: Response, x_session_id: str = Header(None, alias="X-Session-ID")):
     """Exchange session_id from Google OAuth for user data and session_token"""
@@ -889,11 +3043,7 @@ async def google_session(request: Request, response: Response, x_session_id: str
         selected_role = body.get('role')
         
         # Call Emergent's OAuth API to get user data
-        emergent_response = requests.get(
-            "https://demobackend.emergentagent.com/auth/v1/env/oauth/session-data",
-            headers={"X-Session-ID": x_session_id},
-            timeout=10
-        )
+        emergent_response = await fetch_oauth_session(x_session_id)
         
         if emergent_response.status_code != 200:
             raise HTTPException(status_code=400, detail="Invalid session ID")
@@ -948,7 +3098,13 @@ async def google_session(request: Request, response: Response, x_session_id: str
                 "profile_complete": False,
                 "oauth_provider": "google"
             }
-            await db.users.insert_one(user_doc)
+            try:
+                await db.users.insert_one(user_doc)
+            except DuplicateKeyError:
+                # A concurrent sign-in created the user first; continue as that user
+                existing_user = await db.users.find_one({"email": email}, {"_id": 0})
+                user_id = existing_user["id"]
+                is_new_user = False
         
         # Store session in database
         session_doc = {
@@ -961,6 +3117,7 @@ async def google_session(request: Request, response: Response, x_session_id: str
         # Delete old sessions for this user
         await db.user_sessions.delete_many({"user_id": user_id})
         await db.user_sessions.insert_one(session_doc)
+        invalidate_user_sessions(user_id)
         
         # Set httpOnly cookie
         response.set_cookie(
@@ -983,7 +3140,9 @@ async def google_session(request: Request, response: Response, x_session_id: str
             "message": "Authentication successful"
         }
         
-    except requests.RequestException as e:
+    except HTTPException:
+        raise
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=500, detail=f"OAuth service error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Authentication error: {str(e)}")
@@ -996,6 +3155,7 @@ async def logout(request: Request, response: Response, authorization: str = Head
     if session_token:
         # Delete session from database
         await db.user_sessions.delete_one({"session_token": session_token})
+        invalidate_session(session_token)
     
     # Clear cookie
     response.delete_cookie(key="session_token", path="/")
@@ -1018,6 +3178,7 @@ async def save_job_seeker_preferences(
     
     pref_data = preferences.model_dump()
     pref_data['user_id'] = user_id
+    pref_data['text_vector'] = text_vector(pref_data.get('resume_text'), pref_data.get('bio'))
     pref_data['updated_at'] = datetime.now(timezone.utc).isoformat()
     
     if existing:
@@ -1028,6 +3189,10 @@ async def save_job_seeker_preferences(
     else:
         await db.job_seeker_preferences.insert_one(pref_data)
     
+    await reindex_seeker_skills(user_id)
+    await reindex_seeker_vector(user_id)
+    await mark_seeker_matches_dirty(user_id)
+    
     return {"message": "Preferences saved successfully", "completed": pref_data.get('completed', False)}
 
 @api_router.get("/ai/job-seeker-preferences")
@@ -1036,7 +3201,7 @@ async def get_job_seeker_preferences(request: Request, authorization: str = Head
     user = await verify_session_token(request, authorization)
     user_id = user['id']
     
-    preferences = await db.job_seeker_preferences.find_one({"user_id": user_id}, {"_id": 0})
+    preferences = await db.job_seeker_preferences.find_one({"user_id": user_id}, {"_id": 0, "text_vector": 0})
     
     if not preferences:
         return {
@@ -1052,8 +3217,7 @@ async def get_job_seeker_preferences(request: Request, authorization: str = Head
 @api_router.get("/ai/job-matches")
 async def get_job_matches(
     request: Request,
-    authorization: str = Header(None),
-    limit: int = 50
+    authorization: str = Header(None)
 ):
     """Get AI-powered job recommendations for job seeker"""
     user = await verify_session_token(request, authorization)
@@ -1068,22 +3232,96 @@ async def get_job_matches(
             detail="Please complete your preferences first"
         )
     
-    # Get all active jobs
-    jobs = await db.jobs.find({"status": "active"}, {"_id": 0}).limit(limit).to_list(limit)
+    # Get AI recommendations over the whole active catalog
+    recommendations = await get_ai_job_recommendations(user_id, preferences)
     
-    if not jobs:
-        return {
-            "total_matches": 0,
-            "best_matches": [],
-            "good_matches": [],
-            "stretch_matches": [],
-            "ai_insights": "No active jobs available right now. Check back soon!"
-        }
+    return recommendations
+
+@api_router.get("/ai/job-matches/more")
+async def get_more_job_matches(
+    category: str,
+    request: Request,
+    authorization: str = Header(None),
+    cursor: Optional[str] = None,
+    limit: int = 10
+):
+    """Get the next page of ranked job matches in one category"""
+    user = await verify_session_token(request, authorization)
     
-    # Get AI recommendations
-    recommendations = await get_ai_job_recommendations(user_id, preferences, jobs)
+    if category not in ["best", "good", "stretch"]:
+        raise HTTPException(status_code=400, detail="Invalid match category")
     
-    return recommendations
+    matches, next_cursor = await read_seeker_matches(user['id'], category, min(max(limit, 1), 50), cursor)
+    
+    return {"matches": matches, "next_cursor": next_cursor}
+
+@api_router.get("/ai/new-matches")
+async def get_new_matches(request: Request, authorization: str = Header(None), limit: int = 10):
+    """Get the job seeker's feed of strong matches among newly posted jobs"""
+    user = await verify_session_token(request, authorization)
+    limit = min(max(limit, 1), 50)
+    
+    entries = await db.match_feed.find(
+        {"user_id": user['id']},
+        {"_id": 0, "match": 1, "seen": 1, "created_at": 1}
+    ).sort([("created_at", -1), ("score", -1)]).limit(limit).to_list(limit)
+    unseen = await db.match_feed.count_documents({"user_id": user['id'], "seen": False})
+    
+    return {
+        "matches": [
+            {**entry['match'], "seen": entry['seen'], "matched_at": entry['created_at'].isoformat()}
+            for entry in entries
+        ],
+        "unseen": unseen
+    }
+
+@api_router.post("/ai/new-matches/seen")
+async def mark_new_matches_seen(request: Request, authorization: str = Header(None)):
+    """Mark the job seeker's new matches feed as seen"""
+    user = await verify_session_token(request, authorization)
+    await db.match_feed.update_many({"user_id": user['id'], "seen": False}, {"$set": {"seen": True}})
+    return {"message": "New matches marked as seen"}
+
+@api_router.get("/ai/insights/{insights_id}")
+async def get_job_match_insights(
+    insights_id: str,
+    request: Request,
+    authorization: str = Header(None),
+    wait: int = 0
+):
+    """Get generated job match insights, long-polling up to `wait` seconds"""
+    user = await verify_session_token(request, authorization)
+    fingerprint = insight_fingerprint_for(insights_id, user)
+    
+    insight = await wait_for_insight(fingerprint, min(max(wait, 0), INSIGHT_WAIT_TIMEOUT))
+    if insight is None:
+        return {"insights_id": insights_id, "status": "pending", "insight": ""}
+    return {"insights_id": insights_id, "status": "ready", "insight": insight}
+
+@api_router.get("/ai/insights/{insights_id}/stream")
+async def stream_job_match_insights(insights_id: str, request: Request, authorization: str = Header(None)):
+    """Server-Sent Events stream delivering job match insights when ready"""
+    user = await verify_session_token(request, authorization)
+    fingerprint = insight_fingerprint_for(insights_id, user)
+    
+    async def events():
+        deadline = time.monotonic() + INSIGHT_WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            insight = await wait_for_insight(fingerprint, min(INSIGHT_HEARTBEAT_SECONDS, deadline - time.monotonic()))
+            if insight is not None:
+                payload = {"insights_id": insights_id, "status": "ready", "insight": insight}
+                yield f"event: insight\ndata: {json.dumps(payload)}\n\n"
+                return
+            if await request.is_disconnected():
+                return
+            yield ": keep-alive\n\n"
+        yield f"event: timeout\ndata: {json.dumps({'insights_id': insights_id, 'status': 'pending'})}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @api_router.post("/ai/startup-job-preferences/{job_id}")
 async def save_startup_job_preferences(
@@ -1103,6 +3341,7 @@ async def save_startup_job_preferences(
     # Save preferences
     pref_data = preferences.model_dump()
     pref_data['job_id'] = job_id
+    pref_data['skill_keys'] = job_skill_keys(pref_data)
     pref_data['updated_at'] = datetime.now(timezone.utc).isoformat()
     
     existing = await db.startup_job_preferences.find_one({"job_id": job_id})
@@ -1115,6 +3354,9 @@ async def save_startup_job_preferences(
     else:
         await db.startup_job_preferences.insert_one(pref_data)
     
+    await db.match_scores.update_many({"job_id": job_id, "side": "startup"}, {"$set": {"dirty": True}})
+    run_in_background(recompute_candidate_matches(job, pref_data))
+    
     return {"message": "Job preferences saved successfully"}
 
 @api_router.get("/ai/startup-job-preferences/{job_id}")
@@ -1150,44 +3392,126 @@ async def get_candidate_matches(job_id: str, payload: dict = Depends(verify_toke
             detail="Please set candidate preferences for this job first"
         )
     
-    # Get all job seekers with completed preferences
-    job_seekers = await db.users.find(
-        {"role": "job_seeker"},
-        {"_id": 0}
-    ).to_list(1000)
-    
-    # Filter those with completed preferences
-    candidates_with_prefs = []
-    for seeker in job_seekers:
-        prefs = await db.job_seeker_preferences.find_one(
-            {"user_id": seeker['id'], "completed": True},
-            {"_id": 0}
-        )
-        if prefs:
-            candidates_with_prefs.append(seeker)
+    # Read precomputed candidate rows, rescoring the pool if the job's
+    # preferences changed and any candidates whose own inputs changed
+    if await candidate_matches_stale(job_id, job_prefs):
+        await recompute_candidate_matches(job, job_prefs)
+    else:
+        dirty_ids = await db.match_scores.distinct("user_id", {"job_id": job_id, "side": "startup", "dirty": True})
+        if dirty_ids:
+            await recompute_candidate_matches(job, job_prefs, user_ids=dirty_ids)
     
-    if not candidates_with_prefs:
+    total_candidates = await db.match_scores.count_documents({"job_id": job_id, "side": "startup"})
+    if not total_candidates:
         return {
             "total_candidates": 0,
             "matches": [],
             "message": "No candidates with completed preferences found"
         }
     
-    # Calculate matches
-    matches = []
-    for candidate in candidates_with_prefs:
-        match = await calculate_candidate_match_score(candidate, job, job_prefs)
-        matches.append(match)
-    
-    # Sort by score
-    matches.sort(key=lambda x: x.match_score, reverse=True)
+    rows = await db.match_scores.find(
+        {"job_id": job_id, "side": "startup"},
+        {"_id": 0, "sub": 1}
+    ).sort([("score", -1), ("user_id", 1)]).limit(50).to_list(50)
     
+    # Explanations and interview questions are built for the returned rows only
     return {
-        "total_candidates": len(matches),
-        "matches": matches[:50],  # Top 50 candidates
+        "total_candidates": total_candidates,
+        "matches": [explain_candidate_score(CandidateScore.from_doc(row['sub']), job).model_dump() for row in rows],  # Top 50 candidates
         "job_title": job['title']
     }
 
+# A candidate fits a role in the matrix's cross-job view at or above this score
+MATRIX_FIT_SCORE = int(os.environ.get('MATRIX_FIT_SCORE', '60'))
+MATRIX_MAX_JOBS = int(os.environ.get('MATRIX_MAX_JOBS', '50'))
+
+@api_router.post("/ai/candidate-matrix")
+async def get_candidate_matrix(request_data: CandidateMatrixRequest, payload: dict = Depends(verify_token)):
+    """Score a startup's jobs against one shared candidate pool
+
+    Returns each job's top candidates plus the candidates who fit several roles.
+    """
+    if payload['role'] != 'startup':
+        raise HTTPException(status_code=403, detail="Only startups can view candidate matches")
+    
+    query = {"posted_by": payload['user_id'], "status": "active"}
+    if request_data.job_ids is not None:
+        query["id"] = {"$in": request_data.job_ids}
+    jobs = await db.jobs.find(query, {"_id": 0}).sort("created_at", -1).limit(MATRIX_MAX_JOBS).to_list(MATRIX_MAX_JOBS)
+    if not jobs:
+        raise HTTPException(status_code=404, detail="No jobs found")
+    
+    prefs_by_job = {
+        prefs['job_id']: prefs
+        async for prefs in db.startup_job_preferences.find({"job_id": {"$in": [job['id'] for job in jobs]}}, {"_id": 0})
+    }
+    missing_preferences = [job['id'] for job in jobs if job['id'] not in prefs_by_job]
+    jobs = [job for job in jobs if job['id'] in prefs_by_job]
+    if not jobs:
+        raise HTTPException(status_code=400, detail="Please set candidate preferences for your jobs first")
+    
+    # Load the union of the jobs' candidate pools once
+    pooled_ids = set()
+    general_pool = False
+    for job in jobs:
+        candidate_ids, fallback = await retrieve_candidate_ids(job, prefs_by_job[job['id']])
+        if candidate_ids is None or fallback:
+            general_pool = True
+        pooled_ids.update(candidate_ids or [])
+    pipelines = [candidate_pool_pipeline(limit=None, match={"user_id": {"$in": list(pooled_ids)}})]
+    if general_pool:
+        pipelines.append(candidate_pool_pipeline(match={"user_id": {"$nin": list(pooled_ids)}}))
+    
+    records = []
+    for pipeline in pipelines:
+        async for candidate_prefs in db.job_seeker_preferences.aggregate(pipeline):
+            records.append(compact_candidate(candidate_prefs.pop('user'), candidate_prefs))
+    
+    skills = {skill for prefs in prefs_by_job.values() for skill in job_skill_keys(prefs)}
+    matrix = CandidateFeatureMatrix(records, skills)
+    top_n = min(max(request_data.top_n, 1), 50)
+    
+    # Score every job against the pool: a (jobs x candidates) matrix
+    scores = np.stack([matrix.score(job, prefs_by_job[job['id']]) for job in jobs]) if records else np.zeros((len(jobs), 0), dtype=np.int64)
+    
+    job_results = []
+    for i, job in enumerate(jobs):
+        order = np.lexsort((matrix.user_ids, -scores[i]))[:top_n]
+        job_results.append({
+            "job_id": job['id'],
+            "job_title": job['title'],
+            "matches": [
+                explain_candidate_score(score_candidate(records[row][0], job, prefs_by_job[job['id']], records[row][1]), job).model_dump()
+                for row in order
+            ]
+        })
+    
+    # Candidates clearing the fit score for more than one job
+    fits = scores >= MATRIX_FIT_SCORE
+    multi_role = np.flatnonzero(fits.sum(axis=0) >= 2)
+    multi_role = sorted(multi_role, key=lambda col: (-int(fits[:, col].sum()), -int(scores[:, col].max()), matrix.user_ids[col]))
+    multi_role_candidates = [
+        {
+            "user_id": records[col][0]['id'],
+            "user_name": records[col][0]['full_name'],
+            "roles": sorted(
+                [
+                    {"job_id": job['id'], "job_title": job['title'], "match_score": int(scores[i, col])}
+                    for i, job in enumerate(jobs) if fits[i, col]
+                ],
+                key=lambda role: -role['match_score']
+            )
+        }
+        for col in multi_role[:50]
+    ]
+    
+    return {
+        "total_candidates": len(records),
+        "jobs": job_results,
+        "multi_role_candidates": multi_role_candidates,
+        "missing_preferences": missing_preferences
+    }
+
 @api_router.post("/ai/generate-insights")
 async def generate_ai_insights(
     request: Request,
@@ -1198,11 +3522,10 @@ async def generate_ai_insights(
     user_id = user['id']
     
     try:
-        llm_key = os.environ.get('EMERGENT_LLM_KEY')
-        if not llm_key:
+        if not llm_configured():
             raise HTTPException(status_code=500, detail="AI service not configured")
         
-        chat = LlmChat(api_key=llm_key, model="gpt-4")
+        chat = make_llm_chat(api_key=os.environ.get('EMERGENT_LLM_KEY'), model="gpt-4")
         
         # Get user context
         if user['role'] == 'job_seeker':
@@ -1320,7 +3643,7 @@ async def approve_admin_request(approval: AdminRequestApproval, request: Request
             raise HTTPException(status_code=400, detail=error_msg)
         
         # Create admin account
-        hashed = bcrypt.hashpw(approval.password.encode(), bcrypt.gensalt())
+        hashed = await hash_password(approval.password)
         admin_obj = {
             "id": str(uuid.uuid4()),
             "email": admin_request["email"],
@@ -1328,10 +3651,13 @@ async def approve_admin_request(approval: AdminRequestApproval, request: Request
             "role": "admin",
             "created_at": datetime.now(timezone.utc).isoformat(),
             "approved_by": current_admin['id'],
-            "password": hashed.decode()
+            "password": hashed
         }
         
-        await db.users.insert_one(admin_obj)
+        try:
+            await db.users.insert_one(admin_obj)
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail="Email already registered")
         
         # Update request status
         await db.admin_requests.update_one(
@@ -1387,8 +3713,10 @@ async def admin_login(credentials: AdminLogin):
         raise HTTPException(status_code=401, detail="Invalid admin credentials")
     
     # Verify password
-    if not bcrypt.checkpw(credentials.password.encode(), admin['password'].encode()):
+    if not await verify_password(credentials.password, admin.get('password')):
         raise HTTPException(status_code=401, detail="Invalid admin credentials")
+    if password_needs_rehash(admin['password']):
+        run_in_background(rehash_password(admin['id'], credentials.password, admin['password']))
     
     # Create token
     token = create_token(admin['id'], admin['email'], admin['role'])
@@ -1412,7 +3740,7 @@ async def create_admin(admin_data: AdminCreate, request: Request, authorization:
         raise HTTPException(status_code=400, detail=error_msg)
     
     # Create admin account
-    hashed = bcrypt.hashpw(admin_data.password.encode(), bcrypt.gensalt())
+    hashed = await hash_password(admin_data.password)
     admin_obj = {
         "id": str(uuid.uuid4()),
         "email": admin_data.email,
@@ -1420,10 +3748,13 @@ async def create_admin(admin_data: AdminCreate, request: Request, authorization:
         "role": "admin",
         "created_at": datetime.now(timezone.utc).isoformat(),
         "created_by": current_admin['id'],
-        "password": hashed.decode()
+        "password": hashed
     }
     
-    await db.users.insert_one(admin_obj)
+    try:
+        await db.users.insert_one(admin_obj)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
     admin_obj.pop('password')
     
     return {"message": "Admin created successfully", "admin": admin_obj}
@@ -1468,8 +3799,163 @@ async def get_admin_stats(request: Request, authorization: str = Header(None)):
         }
     }
 
+# Indexes
+# Every index the queries in this module rely on, as (collection, keys,
+# options). create_index is a no-op for an index that already exists, so the
+# registry is applied on every startup. A failure, for example duplicate data
+# blocking a unique index, is logged and reported rather than aborting startup.
+INDEXES = [
+    ("users", "id", {"unique": True}),
+    ("users", "email", {"unique": True}),
+    ("users", [("role", 1), ("created_at", -1), ("id", -1)], {}),
+    ("users", [("created_at", -1), ("id", -1)], {}),
+    ("users", "updated_at", {}),
+    ("user_sessions", "session_token", {}),
+    ("user_sessions", "user_id", {}),
+    ("user_sessions", "expires_at", {"expireAfterSeconds": 0}),
+    ("password_resets", [("email", 1), ("reset_code", 1)], {}),
+    ("password_resets", "expires_at", {"expireAfterSeconds": 0}),
+    ("admin_requests", "id", {}),
+    ("admin_requests", [("email", 1), ("status", 1)], {}),
+    ("jobs", "id", {"unique": True}),
+    ("jobs", [("status", 1), ("created_at", -1), ("id", -1)], {}),
+    ("jobs", "posted_by", {}),
+    ("jobs", [("created_at", -1), ("id", -1)], {}),
+    ("jobs", "fanout", {}),
+    ("applications", [("job_id", 1), ("applicant_id", 1)], {"unique": True}),
+    ("applications", "applicant_id", {}),
+    ("applications", [("created_at", -1), ("id", -1)], {}),
+    ("job_seeker_preferences", "user_id", {"unique": True}),
+    ("job_seeker_preferences", "updated_at", {}),
+    ("startup_job_preferences", "job_id", {"unique": True}),
+    ("startup_job_preferences", "skill_keys", {}),
+    ("mentor_profiles", "user_id", {"unique": True}),
+    ("mentor_profiles", [("created_at", -1), ("user_id", -1)], {}),
+    ("sessions", "mentor_id", {}),
+    ("sessions", "mentee_id", {}),
+    ("sessions", [("created_at", -1), ("id", -1)], {}),
+    ("messages", [("conversation_id", 1), ("created_at", -1), ("id", -1)], {}),
+    ("messages", [("sender_id", 1), ("receiver_id", 1), ("created_at", -1)], {}),
+    ("messages", [("receiver_id", 1), ("created_at", -1)], {}),
+    ("conversations", "id", {"unique": True}),
+    ("conversations", [("participants", 1), ("last_activity", -1)], {}),
+    ("candidate_decisions", [("startup_id", 1), ("job_id", 1), ("candidate_id", 1)], {}),
+    ("interviews", [("startup_id", 1), ("job_id", 1), ("candidate_id", 1)], {}),
+    ("payments", "user_id", {}),
+    ("skill_index", [("skill", 1), ("user_id", 1)], {"unique": True}),
+    ("skill_index", "user_id", {}),
+    ("skill_index", [("skill", 1), ("active", 1), ("updated_at", -1)], {}),
+    ("match_scores", [("job_id", 1), ("user_id", 1), ("side", 1)], {"unique": True}),
+    ("match_scores", [("user_id", 1), ("side", 1), ("category", 1), ("score", -1), ("job_id", 1)], {}),
+    ("match_scores", [("job_id", 1), ("side", 1), ("score", -1)], {}),
+    ("match_state", "key", {"unique": True}),
+    ("term_stats", "term", {"unique": True}),
+    ("match_feed", [("user_id", 1), ("job_id", 1)], {"unique": True}),
+    ("match_feed", [("user_id", 1), ("created_at", -1)], {}),
+    ("match_feed", "created_at", {"expireAfterSeconds": MATCH_FEED_TTL_DAYS * 86400}),
+    ("ai_insight_cache", "key", {"unique": True}),
+    ("ai_insight_cache", "expires_at", {"expireAfterSeconds": 0}),
+]
+# Only created when the Mongo insight cache tier is enabled
+OPTIONAL_INDEX_COLLECTIONS = {"ai_insight_cache"}
+index_failures = {}
+
+async def ensure_indexes(*collections: str) -> int:
+    """Create the registry's indexes for the given collections, or all of them
+
+    Returns the number of indexes that could not be created.
+    """
+    failed = 0
+    for name, keys, options in INDEXES:
+        if collections and name not in collections:
+            continue
+        if not collections and name in OPTIONAL_INDEX_COLLECTIONS:
+            continue
+        fields = [keys] if isinstance(keys, str) else [field for field, _ in keys]
+        label = f"{name}.{'+'.join(fields)}"
+        try:
+            await db[name].create_index(keys, **options)
+            index_failures.pop(label, None)
+        except PyMongoError as e:
+            index_failures[label] = str(e)
+            logging.error(f"Could not create index {label}: {str(e)}")
+            failed += 1
+    return failed
+
+@api_router.get("/admin/indexes")
+async def get_index_report(request: Request, authorization: str = Header(None)):
+    """Report index usage per collection and the collection scans Mongo has seen"""
+    await verify_admin(request, authorization)
+    
+    collections = {}
+    for name in sorted({name for name, _, _ in INDEXES}):
+        try:
+            stats = await db[name].aggregate([{"$indexStats": {}}]).to_list(None)
+        except PyMongoError as e:
+            collections[name] = {"error": str(e)}
+            continue
+        collections[name] = {
+            "indexes": sorted(
+                (
+                    {
+                        "name": stat['name'],
+                        "key": dict(stat['key']),
+                        "ops": stat['accesses']['ops'],
+                        "since": stat['accesses']['since']
+                    }
+                    for stat in stats
+                ),
+                key=lambda index: index['ops']
+            )
+        }
+    
+    # Server-wide scan counters, plus per-namespace scans when the profiler is on
+    collection_scans = {}
+    try:
+        status = await client.admin.command("serverStatus")
+        collection_scans["server"] = status.get('metrics', {}).get('queryExecutor', {}).get('collectionScans')
+    except PyMongoError as e:
+        collection_scans["server_error"] = str(e)
+    try:
+        collection_scans["profiled"] = await db.system.profile.aggregate([
+            {"$match": {"planSummary": "COLLSCAN"}},
+            {"$group": {"_id": "$ns", "count": {"$sum": 1}, "last_seen": {"$max": "$ts"}}},
+            {"$sort": {"count": -1}},
+            {"$limit": 50},
+            {"$project": {"_id": 0, "namespace": "$_id", "count": 1, "last_seen": 1}}
+        ]).to_list(50)
+    except PyMongoError as e:
+        collection_scans["profiled_error"] = str(e)
+    
+    return {
+        "collections": collections,
+        "failed_indexes": index_failures,
+        "collection_scans": collection_scans
+    }
+
+@api_router.get("/admin/cache-stats")
+async def get_cache_stats(request: Request, authorization: str = Header(None)):
+    """Get hit/miss counters for in-process caches"""
+    await verify_admin(request, authorization)
+    
+    return {
+        "ai_insights": {
+            **insight_cache.stats(),
+            **insight_cache_counters,
+            "mongo_tier": INSIGHT_CACHE_MONGO
+        },
+        "sessions": session_cache.stats(),
+        "chat_sockets": chat_hub.stats(),
+        "password_hashing": password_hash_stats(),
+        "fanout": {"queued": fanout_queue.qsize(), "capacity": FANOUT_QUEUE_SIZE},
+        "ann_indexes": {
+            index.name: {"ready": index.ready, "size": len(index), "synced_at": index.synced_at}
+            for index in [job_ann_index, seeker_ann_index]
+        }
+    }
+
 @api_router.get("/admin/users")
-async def get_all_users(request: Request, authorization: str = Header(None), skip: int = 0, limit: int = 50, role: str = None, search: str = None):
+async def get_all_users(request: Request, authorization: str = Header(None), skip: int = 0, limit: int = 50, role: str = None, search: str = None, cursor: Optional[str] = None):
     """Get all users with filtering"""
     await verify_admin(request, authorization)
     
@@ -1484,10 +3970,10 @@ async def get_all_users(request: Request, authorization: str = Header(None), ski
             {"email": {"$regex": search, "$options": "i"}}
         ]
     
-    users = await db.users.find(query, {"_id": 0, "password": 0}).skip(skip).limit(limit).to_list(limit)
+    users, next_cursor = await read_page(db.users, query, limit, cursor, skip, projection={"_id": 0, "password": 0})
     total = await db.users.count_documents(query)
     
-    return {"users": users, "total": total, "skip": skip, "limit": limit}
+    return {"users": users, "total": total, "skip": skip, "limit": limit, "next_cursor": next_cursor}
 
 @api_router.delete("/admin/users/{user_id}")
 async def delete_user_admin(user_id: str, request: Request, authorization: str = Header(None)):
@@ -1503,15 +3989,28 @@ async def delete_user_admin(user_id: str, request: Request, authorization: str =
         raise HTTPException(status_code=403, detail="Cannot delete admin accounts")
     
     # Delete all user data (same as account deletion)
+    jobs = await db.jobs.find({"posted_by": user_id}, {"_id": 0}).to_list(None)
+    job_ids = [job['id'] for job in jobs]
     await db.user_sessions.delete_many({"user_id": user_id})
+    invalidate_user_sessions(user_id)
     await db.jobs.delete_many({"posted_by": user_id})
+    await index_job_terms(jobs, -1)
     await db.applications.delete_many({"applicant_id": user_id})
     await db.mentor_profiles.delete_many({"user_id": user_id})
     await db.sessions.delete_many({"$or": [{"mentor_id": user_id}, {"mentee_id": user_id}]})
     await db.messages.delete_many({"$or": [{"sender_id": user_id}, {"receiver_id": user_id}]})
+    await db.conversations.delete_many({"participants": user_id})
     await db.payments.delete_many({"user_id": user_id})
     await db.password_resets.delete_many({"email": user['email']})
+    await db.skill_index.delete_many({"user_id": user_id})
+    await db.match_scores.delete_many({"user_id": user_id})
+    await db.match_state.delete_one({"key": f"seeker:{user_id}"})
+    await db.match_feed.delete_many({"user_id": user_id})
     await db.users.delete_one({"id": user_id})
+    await reindex_seeker_vector(user_id)
+    if job_ids:
+        unindex_jobs(job_ids)
+        await job_catalog_changed(job_ids)
     
     return {"message": "User deleted successfully"}
 
@@ -1531,47 +4030,86 @@ async def update_user_role(user_id: str, new_role: str, request: Request, author
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="User not found or is admin")
     
+    invalidate_user_sessions(user_id)
+    await reindex_seeker_skills(user_id)
+    await reindex_seeker_vector(user_id)
+    await mark_seeker_matches_dirty(user_id)
+    
     return {"message": "Role updated successfully"}
 
 @api_router.get("/admin/jobs")
-async def get_all_jobs_admin(request: Request, authorization: str = Header(None), skip: int = 0, limit: int = 50):
+async def get_all_jobs_admin(request: Request, authorization: str = Header(None), skip: int = 0, limit: int = 50, cursor: Optional[str] = None):
     """Get all jobs"""
     await verify_admin(request, authorization)
     
-    jobs = await db.jobs.find({}, {"_id": 0}).skip(skip).limit(limit).to_list(limit)
+    jobs, next_cursor = await read_page(db.jobs, {}, limit, cursor, skip)
     total = await db.jobs.count_documents({})
     
-    return {"jobs": jobs, "total": total}
+    return {"jobs": jobs, "total": total, "next_cursor": next_cursor}
+
+@api_router.post("/admin/jobs/backfill-features")
+async def backfill_job_features(request: Request, authorization: str = Header(None)):
+    """Extract and store scoring features for jobs missing current ones"""
+    await verify_admin(request, authorization)
+    
+    updated = 0
+    batch = []
+    async for job in db.jobs.find({"features.version": {"$ne": JOB_FEATURES_VERSION}}, {"_id": 0}):
+        batch.append(UpdateOne({"id": job['id']}, {"$set": {"features": extract_job_features(job)}}))
+        if len(batch) >= 500:
+            updated += (await db.jobs.bulk_write(batch, ordered=False)).modified_count
+            batch = []
+    if batch:
+        updated += (await db.jobs.bulk_write(batch, ordered=False)).modified_count
+    
+    if updated:
+        await rebuild_term_stats()
+        await job_catalog_changed()
+    
+    return {"message": "Job features backfilled", "updated": updated}
+
+@api_router.post("/admin/messages/backfill-conversations")
+async def backfill_conversation_summaries(request: Request, authorization: str = Header(None)):
+    """Rebuild conversation summaries from existing messages"""
+    await verify_admin(request, authorization)
+    
+    stamped = await stamp_message_conversations()
+    written = await backfill_conversations()
+    return {"message": "Conversations backfilled", "conversations": written, "messages_stamped": stamped}
 
 @api_router.delete("/admin/jobs/{job_id}")
 async def delete_job_admin(job_id: str, request: Request, authorization: str = Header(None)):
     """Delete any job"""
     await verify_admin(request, authorization)
     
-    await db.jobs.delete_one({"id": job_id})
+    job = await db.jobs.find_one_and_delete({"id": job_id}, {"_id": 0})
     await db.applications.delete_many({"job_id": job_id})
+    if job:
+        await index_job_terms([job], -1)
+    unindex_jobs([job_id])
+    await job_catalog_changed([job_id])
     
     return {"message": "Job deleted successfully"}
 
 @api_router.get("/admin/applications")
-async def get_all_applications_admin(request: Request, authorization: str = Header(None), skip: int = 0, limit: int = 50):
+async def get_all_applications_admin(request: Request, authorization: str = Header(None), skip: int = 0, limit: int = 50, cursor: Optional[str] = None):
     """Get all applications"""
     await verify_admin(request, authorization)
     
-    applications = await db.applications.find({}, {"_id": 0}).skip(skip).limit(limit).to_list(limit)
+    applications, next_cursor = await read_page(db.applications, {}, limit, cursor, skip)
     total = await db.applications.count_documents({})
     
-    return {"applications": applications, "total": total}
+    return {"applications": applications, "total": total, "next_cursor": next_cursor}
 
 @api_router.get("/admin/sessions")
-async def get_all_sessions_admin(request: Request, authorization: str = Header(None), skip: int = 0, limit: int = 50):
+async def get_all_sessions_admin(request: Request, authorization: str = Header(None), skip: int = 0, limit: int = 50, cursor: Optional[str] = None):
     """Get all mentorship sessions"""
     await verify_admin(request, authorization)
     
-    sessions = await db.sessions.find({}, {"_id": 0}).skip(skip).limit(limit).to_list(limit)
+    sessions, next_cursor = await read_page(db.sessions, {}, limit, cursor, skip)
     total = await db.sessions.count_documents({})
     
-    return {"sessions": sessions, "total": total}
+    return {"sessions": sessions, "total": total, "next_cursor": next_cursor}
 
 @api_router.delete("/auth/delete-account")
 async def delete_account(request: Request, response: Response, authorization: str = Header(None)):
@@ -1584,9 +4122,13 @@ async def delete_account(request: Request, response: Response, authorization: st
         # Delete all user-related data
         # 1. Delete user's sessions
         await db.user_sessions.delete_many({"user_id": user_id})
+        invalidate_user_sessions(user_id)
         
         # 2. Delete user's jobs (if startup)
+        jobs = await db.jobs.find({"posted_by": user_id}, {"_id": 0}).to_list(None)
+        job_ids = [job['id'] for job in jobs]
         await db.jobs.delete_many({"posted_by": user_id})
+        await index_job_terms(jobs, -1)
         
         # 3. Delete user's applications
         await db.applications.delete_many({"applicant_id": user_id})
@@ -1609,6 +4151,7 @@ async def delete_account(request: Request, response: Response, authorization: st
                 {"receiver_id": user_id}
             ]
         })
+        await db.conversations.delete_many({"participants": user_id})
         
         # 7. Delete user's payments
         await db.payments.delete_many({"user_id": user_id})
@@ -1616,8 +4159,18 @@ async def delete_account(request: Request, response: Response, authorization: st
         # 8. Delete password reset codes
         await db.password_resets.delete_many({"email": user['email']})
         
-        # 9. Finally, delete the user account
+        # 9. Remove the user from the skill index and match scores
+        await db.skill_index.delete_many({"user_id": user_id})
+        await db.match_scores.delete_many({"user_id": user_id})
+        await db.match_state.delete_one({"key": f"seeker:{user_id}"})
+        await db.match_feed.delete_many({"user_id": user_id})
+        if job_ids:
+            unindex_jobs(job_ids)
+            await job_catalog_changed(job_ids)
+        
+        # 10. Finally, delete the user account
         result = await db.users.delete_one({"id": user_id})
+        await reindex_seeker_vector(user_id)
         
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="User not found")
@@ -1653,7 +4206,7 @@ async def forgot_password(request: PasswordResetRequest):
         "email": request.email,
         "reset_code": reset_code,
         "created_at": datetime.now(timezone.utc).isoformat(),
-        "expires_at": (datetime.now(timezone.utc) + timedelta(minutes=10)).isoformat()
+        "expires_at": datetime.now(timezone.utc) + timedelta(minutes=10)
     }
     
     # Delete any existing reset codes for this email
@@ -1689,16 +4242,16 @@ async def reset_password(reset: PasswordReset):
         raise HTTPException(status_code=400, detail="Invalid reset code")
     
     # Check if expired
-    expires_at = datetime.fromisoformat(reset_doc['expires_at'])
+    expires_at = as_utc_datetime(reset_doc['expires_at'])
     if datetime.now(timezone.utc) > expires_at:
         await db.password_resets.delete_one({"email": reset.email})
         raise HTTPException(status_code=400, detail="Reset code has expired. Please request a new one")
     
     # Update password
-    hashed = bcrypt.hashpw(reset.new_password.encode(), bcrypt.gensalt())
+    hashed = await hash_password(reset.new_password)
     await db.users.update_one(
         {"email": reset.email},
-        {"$set": {"password": hashed.decode()}}
+        {"$set": {"password": hashed}}
     )
     
     # Delete used reset code
@@ -1753,11 +4306,19 @@ async def update_profile(profile: UserProfile, request: Request, authorization:
     # Check if profile is complete based on role
     is_complete = validate_profile_completion(user, profile_dict)
     profile_dict['profile_complete'] = is_complete
+    profile_dict['updated_at'] = datetime.now(timezone.utc).isoformat()
     
     await db.users.update_one(
         {"id": user_id},
         {"$set": profile_dict}
     )
+    invalidate_user_sessions(user_id)
+    
+    if user.get('role') == 'job_seeker':
+        if 'skills' in profile_dict:
+            await reindex_seeker_skills(user_id)
+            await reindex_seeker_vector(user_id)
+        await mark_seeker_matches_dirty(user_id)
     
     return {
         "message": "Profile updated successfully",
@@ -1777,13 +4338,29 @@ async def create_job(job: JobCreate, payload: dict = Depends(verify_token)):
     if payload['role'] != 'startup':
         raise HTTPException(status_code=403, detail="Only startups can post jobs")
     
+    await reserve_fanout_slot()
+    
     job_obj = Job(**job.model_dump(), posted_by=payload['user_id'])
-    await db.jobs.insert_one(job_obj.model_dump())
+    job_doc = job_obj.model_dump()
+    job_doc['features'] = extract_job_features(job_doc)
+    job_doc['fanout'] = "running"
+    job_doc['fanout_claimed_at'] = datetime.now(timezone.utc)
+    try:
+        await db.jobs.insert_one(job_doc)
+        await index_job_terms([job_doc], 1)
+        index_jobs([job_doc])
+        await job_catalog_changed()
+        fanout_queue.put_nowait(job_obj.id)
+    except Exception:
+        fanout_capacity.release()
+        raise
     return job_obj
 
 @api_router.get("/jobs", response_model=List[Job])
-async def get_jobs(skip: int = 0, limit: int = 20):
-    jobs = await db.jobs.find({"status": "active"}, {"_id": 0}).skip(skip).limit(limit).to_list(limit)
+async def get_jobs(response: Response, skip: int = 0, limit: int = 20, cursor: Optional[str] = None):
+    jobs, next_cursor = await read_page(db.jobs, {"status": "active"}, limit, cursor, skip)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return jobs
 
 @api_router.get("/jobs/{job_id}", response_model=Job)
@@ -1810,7 +4387,11 @@ async def apply_job(application: ApplicationCreate, payload: dict = Depends(veri
         raise HTTPException(status_code=400, detail="Already applied to this job")
     
     app_obj = Application(**application.model_dump(), applicant_id=payload['user_id'])
-    await db.applications.insert_one(app_obj.model_dump())
+    try:
+        await db.applications.insert_one(app_obj.model_dump())
+    except DuplicateKeyError:
+        # A concurrent request applied after the check above
+        raise HTTPException(status_code=400, detail="Already applied to this job")
     return app_obj
 
 @api_router.get("/applications/my", response_model=List[Application])
@@ -1846,12 +4427,19 @@ async def create_mentor_profile(profile: MentorProfileCreate, payload: dict = De
     return {"message": "Profile created"}
 
 @api_router.get("/mentors")
-async def get_mentors(skip: int = 0, limit: int = 20):
-    mentors = await db.mentor_profiles.find({}, {"_id": 0}).skip(skip).limit(limit).to_list(limit)
+async def get_mentors(
+    response: Response,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    users: UserLoader = Depends(user_loader)
+):
+    mentors, next_cursor = await read_page(db.mentor_profiles, {}, limit, cursor, skip, id_field="user_id")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
-    # Fetch user details for each mentor
-    for mentor in mentors:
-        user = await db.users.find_one({"id": mentor['user_id']}, {"_id": 0, "password": 0})
+    # Fetch user details for all mentors in one query
+    for mentor, user in zip(mentors, await users.load_many(mentor['user_id'] for mentor in mentors)):
         mentor['user'] = user
     
     return mentors
@@ -1974,12 +4562,14 @@ async def get_candidate_status(
     }
 
 @api_router.get("/mentors/{mentor_id}")
-async def get_mentor_profile(mentor_id: str):
-    mentor = await db.mentor_profiles.find_one({"user_id": mentor_id}, {"_id": 0})
+async def get_mentor_profile(mentor_id: str, users: UserLoader = Depends(user_loader)):
+    mentor, user = await asyncio.gather(
+        db.mentor_profiles.find_one({"user_id": mentor_id}, {"_id": 0}),
+        users.load(mentor_id)
+    )
     if not mentor:
         raise HTTPException(status_code=404, detail="Mentor not found")
     
-    user = await db.users.find_one({"id": mentor_id}, {"_id": 0, "password": 0})
     mentor['user'] = user
     return mentor
 
@@ -1998,50 +4588,388 @@ async def get_my_sessions(payload: dict = Depends(verify_token)):
         sessions = await db.sessions.find({"mentee_id": payload['user_id']}, {"_id": 0}).to_list(100)
     return sessions
 
+# Conversation Summaries
+# Each pair of users has one conversations document holding the last message,
+# last_activity and an unread count per participant, so the conversation list
+# is a single indexed query instead of a scan over the user's messages.
+CONVERSATION_MESSAGE_FIELDS = ['id', 'sender_id', 'receiver_id', 'content', 'created_at']
+
+def conversation_id(user_a: str, user_b: str) -> str:
+    """Canonical id for the conversation between two users, in either order"""
+    return ":".join(sorted((user_a, user_b)))
+
+async def record_conversation_message(message: dict):
+    """Fold a new message into its conversation summary
+
+    The upsert is keyed on the pair id alone, so it only ever inserts when the
+    conversation does not exist yet; last_message is then replaced only by a
+    newer message, so racing sends settle on the latest.
+    """
+    sender, receiver = message['sender_id'], message['receiver_id']
+    summary = {field: message[field] for field in CONVERSATION_MESSAGE_FIELDS}
+    key = conversation_id(sender, receiver)
+    update = {
+        "$setOnInsert": {"participants": sorted((sender, receiver)), "created_at": message['created_at']},
+        "$inc": {f"unread.{receiver}": 1}
+    }
+    try:
+        await db.conversations.update_one({"id": key}, update, upsert=True)
+    except DuplicateKeyError:
+        # A concurrent first message created the conversation
+        await db.conversations.update_one({"id": key}, update)
+    await db.conversations.update_one(
+        {"id": key, "$or": [{"last_activity": {"$lte": message['created_at']}}, {"last_activity": None}]},
+        {"$set": {"last_message": summary, "last_activity": message['created_at']}}
+    )
+
+async def backfill_conversations() -> int:
+    """Rebuild every conversation summary from the messages collection"""
+    pipeline = [
+        {"$sort": {"created_at": 1}},
+        {"$addFields": {
+            "first": {"$cond": [{"$lt": ["$sender_id", "$receiver_id"]}, "$sender_id", "$receiver_id"]},
+            "second": {"$cond": [{"$lt": ["$sender_id", "$receiver_id"]}, "$receiver_id", "$sender_id"]}
+        }},
+        {"$group": {
+            "_id": {"first": "$first", "second": "$second"},
+            "last_message": {"$last": {field: f"${field}" for field in CONVERSATION_MESSAGE_FIELDS}},
+            "created_at": {"$first": "$created_at"},
+            "unread_first": {"$sum": {"$cond": [
+                {"$and": [{"$ne": ["$read", True]}, {"$eq": ["$receiver_id", "$first"]}]}, 1, 0
+            ]}},
+            "unread_second": {"$sum": {"$cond": [
+                {"$and": [{"$ne": ["$read", True]}, {"$eq": ["$receiver_id", "$second"]}]}, 1, 0
+            ]}}
+        }}
+    ]
+    
+    written = 0
+    batch = []
+    async for group in db.messages.aggregate(pipeline, allowDiskUse=True):
+        first, second = group['_id']['first'], group['_id']['second']
+        doc = {
+            "id": conversation_id(first, second),
+            "participants": [first, second],
+            "last_message": group['last_message'],
+            "last_activity": group['last_message']['created_at'],
+            "unread": {first: group['unread_first'], second: group['unread_second']},
+            "created_at": group['created_at']
+        }
+        batch.append(ReplaceOne({"id": doc['id']}, doc, upsert=True))
+        if len(batch) >= 500:
+            await db.conversations.bulk_write(batch, ordered=False)
+            written += len(batch)
+            batch = []
+    if batch:
+        await db.conversations.bulk_write(batch, ordered=False)
+        written += len(batch)
+    return written
+
+# Messages are stamped with conversation_id when written. Ones written before
+# that, or by older workers during a rolling deploy, are stamped by a sweep
+# that runs every MESSAGE_STAMP_INTERVAL seconds; with nothing to stamp, a
+# pass is one indexed query.
+MESSAGE_STAMP_INTERVAL = int(os.environ.get('MESSAGE_STAMP_INTERVAL', '60'))
+
+async def stamp_message_conversations() -> int:
+    """Set conversation_id on messages that lack it; safe to run repeatedly"""
+    stamped = 0
+    batch = []
+    async for message in db.messages.find(
+        {"conversation_id": None}, {"_id": 1, "sender_id": 1, "receiver_id": 1}
+    ):
+        batch.append(UpdateOne(
+            {"_id": message['_id']},
+            {"$set": {"conversation_id": conversation_id(message['sender_id'], message['receiver_id'])}}
+        ))
+        if len(batch) >= 500:
+            stamped += (await db.messages.bulk_write(batch, ordered=False)).modified_count
+            batch = []
+    if batch:
+        stamped += (await db.messages.bulk_write(batch, ordered=False)).modified_count
+    return stamped
+
+async def message_stamper():
+    """Stamp messages missing a conversation_id, for the life of the process"""
+    while True:
+        try:
+            stamped = await stamp_message_conversations()
+            if stamped:
+                logging.info(f"Stamped {stamped} messages with their conversation_id")
+        except Exception as e:
+            logging.error(f"Message stamping failed: {str(e)}")
+        await asyncio.sleep(MESSAGE_STAMP_INTERVAL)
+
+MESSAGE_PAGE_SIZE = 50
+
+def decode_message_cursor(cursor: str) -> tuple:
+    values = decode_cursor(cursor)
+    if len(values) != 2:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return tuple(values)
+
+# Chat Delivery
+# Connected chat clients receive new messages over /api/ws/chat from an
+# in-process hub. Delivery is best effort: each socket has a bounded queue, and
+# a client that falls behind (or is connected to another worker) is told to
+# resync, fetching what it missed from the history endpoint with its after
+# cursor. Reconnecting clients do the same through a resume frame.
+CHAT_SOCKET_QUEUE_SIZE = int(os.environ.get('CHAT_SOCKET_QUEUE_SIZE', '100'))
+CHAT_HEARTBEAT_SECONDS = int(os.environ.get('CHAT_HEARTBEAT_SECONDS', '25'))
+CHAT_IDLE_TIMEOUT = int(os.environ.get('CHAT_IDLE_TIMEOUT', str(CHAT_HEARTBEAT_SECONDS * 3)))
+CHAT_AUTH_TIMEOUT = int(os.environ.get('CHAT_AUTH_TIMEOUT', '10'))
+# Close code for a socket whose session is missing or expired; clients stop
+# reconnecting and sign in again
+CHAT_CLOSE_UNAUTHORIZED = 4401
+
+class ChatHub:
+    """Per-user fan-out of chat events to this worker's open sockets"""
+
+    def __init__(self):
+        self._queues = {}
+        self.published = 0
+        self.overflows = 0
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=CHAT_SOCKET_QUEUE_SIZE)
+        self._queues.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        queues = self._queues.get(user_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._queues[user_id]
+
+    def publish(self, user_ids, event: dict):
+        """Queue an event for every socket of these users, never blocking the sender"""
+        for user_id in set(user_ids):
+            for queue in self._queues.get(user_id, ()):
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    # Drop the backlog; the client refetches from its cursor
+                    while not queue.empty():
+                        queue.get_nowait()
+                    queue.put_nowait({"type": "resync"})
+                    self.overflows += 1
+                self.published += 1
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self._queues),
+            "sockets": sum(len(queues) for queues in self._queues.values()),
+            "published": self.published,
+            "overflows": self.overflows,
+            "queue_size": CHAT_SOCKET_QUEUE_SIZE
+        }
+
+chat_hub = ChatHub()
+
+def message_cursor(message: dict) -> str:
+    return encode_cursor([message['created_at'], message['id']])
+
+async def read_messages_after(user_id: str, other_id: str, after: str, limit: int) -> List[dict]:
+    """Messages between two users newer than a cursor, oldest first"""
+    created_at, message_id = decode_message_cursor(after)
+    return await db.messages.find(
+        {
+            "conversation_id": conversation_id(user_id, other_id),
+            "$or": [{"created_at": {"$gt": created_at}}, {"created_at": created_at, "id": {"$gt": message_id}}]
+        },
+        {"_id": 0}
+    ).sort([("created_at", 1), ("id", 1)]).limit(limit).to_list(limit)
+
+async def mark_conversation_read(user_id: str, other_id: str):
+    """Mark everything the other user sent as read and reset the unread count
+
+    Reads the summary first and writes nothing when nothing is unread, so
+    polling an open conversation costs one indexed read.
+    """
+    unread = await db.conversations.find_one(
+        {"id": conversation_id(user_id, other_id), f"unread.{user_id}": {"$gt": 0}},
+        {"_id": 1}
+    )
+    if not unread:
+        return
+    await db.messages.update_many(
+        {"sender_id": other_id, "receiver_id": user_id, "read": False},
+        {"$set": {"read": True}}
+    )
+    await db.conversations.update_one(
+        {"id": conversation_id(user_id, other_id)},
+        {"$set": {f"unread.{user_id}": 0}}
+    )
+
+async def chat_socket_sender(websocket: WebSocket, queue: asyncio.Queue):
+    """Forward hub events to the socket, sending a ping when idle"""
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), CHAT_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                event = {"type": "ping"}
+            await websocket.send_json(event)
+    except (WebSocketDisconnect, RuntimeError):
+        pass  # the receive loop notices the closed socket and cleans up
+
+async def replay_chat_messages(websocket: WebSocket, user_id: str, other_id: str, after: str):
+    """Send what a resuming client missed, or ask it to resync if that is a lot"""
+    missed = await read_messages_after(user_id, other_id, after, MAX_PAGE_SIZE + 1)
+    if len(missed) > MAX_PAGE_SIZE:
+        await websocket.send_json({"type": "resync"})
+        return
+    for message in missed:
+        await websocket.send_json({"type": "message", "message": message, "cursor": message_cursor(message)})
+
+async def authenticate_chat_socket(websocket: WebSocket) -> Optional[dict]:
+    """The socket's user, from the session cookie or an auth frame
+
+    Browsers cannot set headers on sockets, and a token in the URL would end up
+    in access logs, so clients without a session cookie send
+    {"type": "auth", "token"} as their first frame.
+    """
+    try:
+        return await verify_session_token(websocket, None)
+    except HTTPException:
+        pass
+    try:
+        frame = await asyncio.wait_for(websocket.receive_json(), CHAT_AUTH_TIMEOUT)
+    except (asyncio.TimeoutError, ValueError):
+        return None
+    if not isinstance(frame, dict) or frame.get('type') != 'auth' or not frame.get('token'):
+        return None
+    try:
+        return await verify_session_token(websocket, f"Bearer {frame['token']}")
+    except HTTPException:
+        return None
+
+@api_router.websocket("/ws/chat")
+async def chat_socket(websocket: WebSocket):
+    """Push new messages to the user's open chats
+
+    The socket is accepted before authenticating, so an unauthenticated client
+    sees close code 4401 rather than a failed handshake. Clients send
+    {"type": "auth", "token"} first, then {"type": "resume", "user_id", "after"}
+    to replay a conversation from a cursor, {"type": "read", "user_id"} when
+    pushed messages have been shown, and answer pings with {"type": "pong"}.
+    """
+    await websocket.accept()
+    try:
+        user = await authenticate_chat_socket(websocket)
+    except WebSocketDisconnect:
+        return
+    if not user:
+        await websocket.close(code=CHAT_CLOSE_UNAUTHORIZED, reason="Not authenticated")
+        return
+    
+    queue = chat_hub.subscribe(user['id'])
+    sender = asyncio.create_task(chat_socket_sender(websocket, queue))
+    try:
+        while True:
+            frame = await asyncio.wait_for(websocket.receive_json(), CHAT_IDLE_TIMEOUT)
+            if not isinstance(frame, dict):
+                continue
+            if frame.get('type') == 'resume' and frame.get('user_id') and frame.get('after'):
+                try:
+                    await replay_chat_messages(websocket, user['id'], frame['user_id'], frame['after'])
+                except HTTPException:
+                    await websocket.send_json({"type": "resync"})
+            elif frame.get('type') == 'read' and frame.get('user_id'):
+                await mark_conversation_read(user['id'], frame['user_id'])
+    except (WebSocketDisconnect, asyncio.TimeoutError, ValueError):
+        pass
+    finally:
+        sender.cancel()
+        chat_hub.unsubscribe(user['id'], queue)
+        if websocket.client_state.name == "CONNECTED":
+            await websocket.close()
+
 # Message Routes
 @api_router.post("/messages", response_model=Message)
 async def send_message(message: MessageCreate, payload: dict = Depends(verify_token)):
-    msg_obj = Message(**message.model_dump(), sender_id=payload['user_id'])
+    msg_obj = Message(
+        **message.model_dump(),
+        sender_id=payload['user_id'],
+        conversation_id=conversation_id(payload['user_id'], message.receiver_id)
+    )
     await db.messages.insert_one(msg_obj.model_dump())
+    await record_conversation_message(msg_obj.model_dump())
+    chat_hub.publish(
+        [msg_obj.receiver_id, msg_obj.sender_id],
+        {"type": "message", "message": msg_obj.model_dump(), "cursor": message_cursor(msg_obj.model_dump())}
+    )
     return msg_obj
 
+
 @api_router.get("/messages/{user_id}", response_model=List[Message])
-async def get_conversation(user_id: str, payload: dict = Depends(verify_token)):
-    messages = await db.messages.find({
-        "$or": [
-            {"sender_id": payload['user_id'], "receiver_id": user_id},
-            {"sender_id": user_id, "receiver_id": payload['user_id']}
-        ]
-    }, {"_id": 0}).sort("created_at", 1).to_list(500)
+async def get_conversation(
+    user_id: str,
+    response: Response,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: int = MESSAGE_PAGE_SIZE,
+    payload: dict = Depends(verify_token)
+):
+    """Message history with another user, oldest first
+
+    Without a cursor this is the latest page. `before` pages back through older
+    history and `after` returns only messages newer than a previous page. The
+    X-Before-Cursor header is set while older messages remain, and
+    X-After-Cursor marks the newest message seen for the next poll.
+    """
+    if before and after:
+        raise HTTPException(status_code=400, detail="Use either before or after, not both")
+    limit = min(max(limit, 1), MAX_PAGE_SIZE)
+    query = {"conversation_id": conversation_id(payload['user_id'], user_id)}
+    
+    if after:
+        messages = await read_messages_after(payload['user_id'], user_id, after, limit)
+    else:
+        if before:
+            created_at, message_id = decode_message_cursor(before)
+            query["$or"] = [{"created_at": {"$lt": created_at}}, {"created_at": created_at, "id": {"$lt": message_id}}]
+        messages = await db.messages.find(query, {"_id": 0}).sort(
+            [("created_at", -1), ("id", -1)]
+        ).limit(limit + 1).to_list(limit + 1)
+        if len(messages) > limit:
+            messages = messages[:limit]
+            response.headers["X-Before-Cursor"] = message_cursor(messages[-1])
+        messages.reverse()
+    
+    if messages:
+        response.headers["X-After-Cursor"] = message_cursor(messages[-1])
+    elif after:
+        response.headers["X-After-Cursor"] = after
+    
+    if not before:
+        # Opening or polling a conversation reads everything the other user sent
+        await mark_conversation_read(payload['user_id'], user_id)
     return messages
 
 @api_router.get("/messages/conversations/list")
-async def get_conversations(payload: dict = Depends(verify_token)):
-    messages = await db.messages.find({
-        "$or": [{"sender_id": payload['user_id']}, {"receiver_id": payload['user_id']}]
-    }, {"_id": 0}).to_list(1000)
-    
-    # Get unique user IDs
-    user_ids = set()
-    for msg in messages:
-        if msg['sender_id'] != payload['user_id']:
-            user_ids.add(msg['sender_id'])
-        if msg['receiver_id'] != payload['user_id']:
-            user_ids.add(msg['receiver_id'])
-    
-    # Fetch user details
+async def get_conversations(
+    limit: int = 100,
+    payload: dict = Depends(verify_token),
+    users: UserLoader = Depends(user_loader)
+):
+    me = payload['user_id']
+    limit = min(max(limit, 1), MAX_PAGE_SIZE)
+    summaries = await db.conversations.find(
+        {"participants": me}, {"_id": 0}
+    ).sort("last_activity", -1).limit(limit).to_list(limit)
+    
+    partners = [next((user_id for user_id in summary['participants'] if user_id != me), me) for summary in summaries]
     conversations = []
-    for user_id in user_ids:
-        user = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0})
-        if user:
-            # Get last message
-            last_msg = await db.messages.find_one({
-                "$or": [
-                    {"sender_id": payload['user_id'], "receiver_id": user_id},
-                    {"sender_id": user_id, "receiver_id": payload['user_id']}
-                ]
-            }, {"_id": 0}, sort=[("created_at", -1)])
-            conversations.append({"user": user, "last_message": last_msg})
+    for summary, user in zip(summaries, await users.load_many(partners)):
+        if user and user['id'] != me:
+            conversations.append({
+                "user": user,
+                "last_message": summary['last_message'],
+                "last_activity": summary['last_activity'],
+                "unread": summary.get('unread', {}).get(me, 0)
+            })
     
     return conversations
 
@@ -2055,7 +4983,7 @@ async def match_jobs(payload: dict = Depends(verify_token)):
     jobs = await db.jobs.find({"status": "active"}, {"_id": 0}).limit(10).to_list(10)
     
     # Use AI to match jobs
-    chat = LlmChat(
+    chat = make_llm_chat(
         api_key=os.environ.get('EMERGENT_LLM_KEY'),
         session_id=f"match_{user['id']}",
         system_message="You are a job matching AI. Analyze user profile and recommend best matching jobs."
@@ -2097,6 +5025,7 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Before-Cursor", "X-After-Cursor"],
 )
 
 logging.basicConfig(
@@ -2105,6 +5034,72 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def startup_indexes():
+    run_in_background(ensure_indexes())
+
+@app.on_event("startup")
+async def startup_skill_index():
+    await ensure_indexes("skill_index")
+    run_in_background(rebuild_skill_index())
+
+@app.on_event("startup")
+async def startup_match_scores():
+    await ensure_indexes("match_scores", "match_state")
+
+@app.on_event("startup")
+async def startup_term_stats():
+    await ensure_indexes("term_stats")
+    if not await db.match_state.find_one({"key": "text_corpus"}):
+        run_in_background(rebuild_term_stats())
+
+@app.on_event("startup")
+async def startup_ann_indexes():
+    run_in_background(build_ann_indexes())
+
+@app.on_event("startup")
+async def startup_fanout():
+    await ensure_indexes("match_feed")
+    run_in_background(fanout_worker())
+    run_in_background(requeue_fanouts())
+
+@app.on_event("startup")
+async def startup_message_conversations():
+    await ensure_indexes("conversations", "messages")
+    run_in_background(message_stamper())
+
+@app.on_event("startup")
+async def startup_expiring_records():
+    run_in_background(expiry_sweeper())
+
+@app.on_event("startup")
+async def startup_insight_cache():
+    if INSIGHT_CACHE_MONGO:
+        await ensure_indexes("ai_insight_cache")
+
+@app.on_event("startup")
+async def startup_oauth_client():
+    get_oauth_client()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    client.close()
+
+@app.on_event("shutdown")
+async def shutdown_oauth_client():
+    if _oauth_client is not None:
+        await _oauth_client.aclose()
+
+@app.on_event("shutdown")
+async def shutdown_ann_indexes():
+    await save_ann_indexes()
+
+@app.on_event("shutdown")
+async def shutdown_scoring_pool():
+    if _scoring_pool is not None:
+        _scoring_pool.shutdown(cancel_futures=True)
+
+@app.on_event("shutdown")
+async def shutdown_password_pool():
+    if _password_pool is not None:
+        _password_pool.shutdown(cancel_futures=True)
\ No newline at end of file
@@ -51,6 +51,9 @@ export default function AIMatches() {
         headers: { Authorization: `Bearer ${localStorage.getItem('token')}` }
       });
       setMatches(response.data);
+      if (response.data.insights_status === 'pending' && response.data.insights_id) {
+        fetchInsights(response.data.insights_id);
+      }
     } catch (error) {
       if (error.response?.status === 400) {
         // No preferences completed yet
@@ -69,6 +72,27 @@ export default function AIMatches() {
     }
   };
 
+  const fetchInsights = async (insightsId) => {
+    // Insights are generated in the background; long-poll until they are ready
+    for (let attempt = 0; attempt < 3; attempt++) {
+      try {
+        const response = await axios.get(`${API}/ai/insights/${insightsId}?wait=25`, {
+          withCredentials: true,
+          headers: { Authorization: `Bearer ${localStorage.getItem('token')}` }
+        });
+        if (response.data.status === 'ready') {
+          setMatches((prev) => prev && prev.insights_id === insightsId
+            ? { ...prev, ai_insights: response.data.insight, insights_status: 'ready' }
+            : prev);
+          return;
+        }
+      } catch (error) {
+        console.error('Failed to load AI insights', error);
+        return;
+      }
+    }
+  };
+
   const handleRefresh = async () => {
     setRefreshing(true);
     await fetchMatches();
@@ -10,13 +10,19 @@ import { toast } from 'sonner';
 import { Send, Search, MessageCircle } from 'lucide-react';
 
 export default function Chat() {
-  const { user } = useAuth();
+  const { user, logout } = useAuth();
   const { userId } = useParams();
   const [conversations, setConversations] = useState([]);
   const [selectedUser, setSelectedUser] = useState(null);
   const [messages, setMessages] = useState([]);
   const [newMessage, setNewMessage] = useState('');
   const [searchQuery, setSearchQuery] = useState('');
+  const [olderCursor, setOlderCursor] = useState(null);
+  const [socketOpen, setSocketOpen] = useState(false);
+  const afterCursorRef = useRef(null);
+  const selectedUserRef = useRef(null);
+  const conversationsRef = useRef([]);
+  const socketRef = useRef(null);
   const messagesEndRef = useRef(null);
 
   useEffect(() => {
@@ -30,18 +36,125 @@ export default function Chat() {
     }
   }, [userId]);
 
+  useEffect(() => {
+    selectedUserRef.current = selectedUser;
+  }, [selectedUser]);
+
+  useEffect(() => {
+    conversationsRef.current = conversations;
+  }, [conversations]);
+
+  // New messages are pushed over the chat socket, which reconnects with backoff
+  // and resumes the open conversation from the last cursor we saw. A 4401 close
+  // means the session is gone, so instead of reconnecting we sign in again.
+  useEffect(() => {
+    if (!user) return;
+    let stopped = false;
+    let retries = 0;
+    let retryTimer;
+
+    const connect = () => {
+      const socket = new WebSocket(api.chatSocketUrl());
+      socketRef.current = socket;
+      socket.onopen = () => {
+        retries = 0;
+        setSocketOpen(true);
+        socket.send(JSON.stringify(api.chatSocketAuthFrame()));
+        const current = selectedUserRef.current;
+        if (current && afterCursorRef.current) {
+          socket.send(JSON.stringify({ type: 'resume', user_id: current.id, after: afterCursorRef.current }));
+        }
+      };
+      socket.onmessage = (event) => handleSocketEvent(JSON.parse(event.data));
+      socket.onclose = (event) => {
+        setSocketOpen(false);
+        if (event.code === 4401 && !stopped) {
+          stopped = true;
+          toast.error('Your session has expired. Please sign in again.');
+          logout();
+          return;
+        }
+        if (!stopped) {
+          retryTimer = setTimeout(connect, Math.min(30000, 1000 * 2 ** retries));
+          retries += 1;
+        }
+      };
+    };
+
+    connect();
+    return () => {
+      stopped = true;
+      clearTimeout(retryTimer);
+      socketRef.current?.close();
+    };
+  }, [user]);
+
+  // Poll quickly while the socket is down; the slow poll while it is up picks up
+  // messages sent through another server worker
   useEffect(() => {
     if (selectedUser) {
       const interval = setInterval(() => {
-        fetchMessages(selectedUser.id);
-      }, 3000);
+        fetchNewMessages(selectedUser.id);
+      }, socketOpen ? 30000 : 3000);
       return () => clearInterval(interval);
     }
-  }, [selectedUser]);
+  }, [selectedUser, socketOpen]);
+
+  const sendSocketFrame = (frame) => {
+    if (socketRef.current?.readyState === WebSocket.OPEN) {
+      socketRef.current.send(JSON.stringify(frame));
+    }
+  };
+
+  const handleSocketEvent = (event) => {
+    const current = selectedUserRef.current;
+    if (event.type === 'ping') {
+      sendSocketFrame({ type: 'pong' });
+    } else if (event.type === 'resync') {
+      if (current) fetchNewMessages(current.id);
+      fetchConversations();
+    } else if (event.type === 'message') {
+      const msg = event.message;
+      const partnerId = msg.sender_id === user.id ? msg.receiver_id : msg.sender_id;
+      const isOpen = current && current.id === partnerId;
+      if (isOpen) {
+        appendMessages([msg]);
+        afterCursorRef.current = event.cursor;
+        if (msg.sender_id !== user.id) sendSocketFrame({ type: 'read', user_id: partnerId });
+      }
+      if (!conversationsRef.current.some((conv) => conv.user.id === partnerId)) {
+        fetchConversations();
+        return;
+      }
+      setConversations((prev) =>
+        [...prev]
+          .map((conv) =>
+            conv.user.id === partnerId
+              ? {
+                  ...conv,
+                  last_message: msg,
+                  last_activity: msg.created_at,
+                  unread: isOpen || msg.sender_id === user.id ? conv.unread || 0 : (conv.unread || 0) + 1,
+                }
+              : conv
+          )
+          .sort((a, b) => (b.last_activity || '').localeCompare(a.last_activity || ''))
+      );
+    }
+  };
+
+  const appendMessages = (incoming) => {
+    setMessages((prev) => {
+      const seen = new Set(prev.map((msg) => msg.id));
+      return [...prev, ...incoming.filter((msg) => !seen.has(msg.id))];
+    });
+  };
+
+  const lastMessageId = messages.length ? messages[messages.length - 1].id : null;
 
   useEffect(() => {
     scrollToBottom();
-  }, [messages]);
+  }, [lastMessageId]);
 
   const scrollToBottom = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
@@ -66,26 +179,61 @@ export default function Chat() {
     }
   };
 
+  // Latest page of the conversation; older pages load on demand
   const fetchMessages = async (uid) => {
     try {
+      afterCursorRef.current = null;
       const response = await api.getConversation(uid);
       setMessages(response.data);
+      setOlderCursor(response.headers['x-before-cursor'] || null);
+      afterCursorRef.current = response.headers['x-after-cursor'] || null;
+    } catch (error) {
+      console.error('Failed to load messages', error);
+    }
+  };
+
+  // Only messages newer than the last one we have
+  const fetchNewMessages = async (uid) => {
+    if (!afterCursorRef.current) {
+      return fetchMessages(uid);
+    }
+    try {
+      const response = await api.getConversation(uid, { after: afterCursorRef.current });
+      afterCursorRef.current = response.headers['x-after-cursor'] || afterCursorRef.current;
+      if (response.data.length) {
+        appendMessages(response.data);
+      }
     } catch (error) {
       console.error('Failed to load messages', error);
     }
   };
 
+  const fetchOlderMessages = async () => {
+    if (!olderCursor || !selectedUser) return;
+    try {
+      const response = await api.getConversation(selectedUser.id, { before: olderCursor });
+      setMessages((prev) => [...response.data, ...prev]);
+      setOlderCursor(response.headers['x-before-cursor'] || null);
+    } catch (error) {
+      console.error('Failed to load older messages', error);
+    }
+  };
+
   const handleSendMessage = async (e) => {
     e.preventDefault();
     if (!newMessage.trim() || !selectedUser) return;
 
     try {
-      await api.sendMessage({
+      const response = await api.sendMessage({
         receiver_id: selectedUser.id,
         content: newMessage,
       });
       setNewMessage('');
-      fetchMessages(selectedUser.id);
+      if (socketOpen) {
+        appendMessages([response.data]);
+      } else {
+        fetchNewMessages(selectedUser.id);
+      }
     } catch (error) {
       toast.error('Failed to send message');
     }
@@ -134,6 +282,9 @@ export default function Chat() {
                     onClick={() => {
                       setSelectedUser(conv.user);
                       fetchMessages(conv.user.id);
+                      setConversations((prev) =>
+                        prev.map((c) => (c.user.id === conv.user.id ? { ...c, unread: 0 } : c))
+                      );
                     }}
                     className={`w-full p-4 border-b border-slate-100 hover:bg-slate-50 transition-colors text-left ${
                       selectedUser?.id === conv.user.id ? 'bg-indigo-50' : ''
@@ -144,7 +295,14 @@ export default function Chat() {
                         {conv.user.full_name.charAt(0)}
                       </div>
                       <div className="flex-1 min-w-0">
-                        <div className="font-semibold truncate">{conv.user.full_name}</div>
+                        <div className="flex items-center justify-between gap-2">
+                          <div className="font-semibold truncate">{conv.user.full_name}</div>
+                          {conv.unread > 0 && (
+                            <span className="text-xs font-semibold text-white bg-indigo-600 rounded-full px-2 py-0.5 flex-shrink-0">
+                              {conv.unread}
+                            </span>
+                          )}
+                        </div>
                         <div className="text-sm text-slate-600 truncate">
                           {conv.last_message?.content || 'No messages'}
                         </div>
@@ -175,6 +333,19 @@ export default function Chat() {
 
                 {/* Messages */}
                 <div className="flex-1 overflow-y-auto p-6 space-y-4">
+                  {olderCursor && (
+                    <div className="text-center">
+                      <Button
+                        variant="ghost"
+                        size="sm"
+                        data-testid="load-older-messages-button"
+                        onClick={fetchOlderMessages}
+                        className="text-slate-600"
+                      >
+                        Load earlier messages
+                      </Button>
+                    </div>
+                  )}
                   {messages.map((msg) => (
                     <div
                       key={msg.id}
@@ -14,6 +14,7 @@ export default function Dashboard() {
   const [loading, setLoading] = useState(true);
   const [hasPreferences, setHasPreferences] = useState(false);
   const [checkingPreferences, setCheckingPreferences] = useState(true);
+  const [newMatches, setNewMatches] = useState({ matches: [], unseen: 0 });
 
   useEffect(() => {
     fetchStats();
@@ -24,9 +25,10 @@ export default function Dashboard() {
 
   const checkPreferences = async () => {
     try {
-      const response = await api.get('/ai/job-seeker-preferences');
+      const response = await api.getJobSeekerPreferences();
       if (response.data.exists && response.data.preferences.completed) {
         setHasPreferences(true);
+        fetchNewMatches();
       }
     } catch (error) {
       console.error('Error checking preferences:', error);
@@ -35,6 +37,24 @@ export default function Dashboard() {
     }
   };
 
+  const fetchNewMatches = async () => {
+    try {
+      const response = await api.getNewMatches(3);
+      setNewMatches(response.data);
+    } catch (error) {
+      console.error('Error fetching new matches:', error);
+    }
+  };
+
+  const markNewMatchesSeen = async () => {
+    try {
+      await api.markNewMatchesSeen();
+      setNewMatches((prev) => ({ ...prev, unseen: 0 }));
+    } catch (error) {
+      console.error('Error marking new matches seen:', error);
+    }
+  };
+
   const fetchStats = async () => {
     try {
       const [jobsRes, appsRes, sessionsRes, convsRes] = await Promise.all([
@@ -185,6 +205,28 @@ export default function Dashboard() {
                       : 'Get personalized job recommendations powered by AI that match your skills, preferences, and career goals'
                     }
                   </p>
+                  {hasPreferences && newMatches.matches.length > 0 && (
+                    <div data-testid="new-matches-feed" className="mb-4 rounded-xl border border-blue-100 bg-white p-4">
+                      <div className="flex items-center justify-between mb-2">
+                        <span className="text-sm font-semibold text-slate-700">New jobs matching you</span>
+                        {newMatches.unseen > 0 && (
+                          <span className="px-2 py-0.5 bg-blue-600 text-white text-xs font-bold rounded-full">
+                            {newMatches.unseen} new
+                          </span>
+                        )}
+                      </div>
+                      <ul className="space-y-1">
+                        {newMatches.matches.map((match) => (
+                          <li key={match.job_id} className="flex items-center justify-between text-sm">
+                            <span className={match.seen ? 'text-slate-600' : 'font-medium text-slate-900'}>
+                              {match.job_title} · {match.company}
+                            </span>
+                            <span className="text-blue-600 font-semibold">{match.match_score}%</span>
+                          </li>
+                        ))}
+                      </ul>
+                    </div>
+                  )}
                   {checkingPreferences ? (
                     <Button
                       disabled
@@ -193,7 +235,7 @@ export default function Dashboard() {
                       Loading...
                     </Button>
                   ) : hasPreferences ? (
-                    <Link to="/ai-matches">
+                    <Link to="/ai-matches" onClick={newMatches.unseen > 0 ? markNewMatchesSeen : undefined}>
                       <Button
                         data-testid="goto-ai-matches-button"
                         className="rounded-full px-6 py-3 bg-gradient-to-r from-blue-600 to-indigo-600 hover:from-blue-700 hover:to-indigo-700 text-white font-semibold shadow-lg"
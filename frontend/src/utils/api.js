@@ -7,10 +7,14 @@ const getAuthHeader = () => {
   return token ? { Authorization: `Bearer ${token}` } : {};
 };
 
+const pageParams = (skip, limit, cursor) =>
+  cursor ? `cursor=${encodeURIComponent(cursor)}&limit=${limit}` : `skip=${skip}&limit=${limit}`;
+
 export const api = {
   // Jobs
-  getJobs: (skip = 0, limit = 20) =>
-    axios.get(`${API_URL}/jobs?skip=${skip}&limit=${limit}`, { headers: getAuthHeader() }),
+  // Pass the previous response's X-Next-Cursor header as cursor to fetch the next page
+  getJobs: (skip = 0, limit = 20, cursor = null) =>
+    axios.get(`${API_URL}/jobs?${pageParams(skip, limit, cursor)}`, { headers: getAuthHeader() }),
   getJob: (id) => axios.get(`${API_URL}/jobs/${id}`, { headers: getAuthHeader() }),
   createJob: (data) => axios.post(`${API_URL}/jobs`, data, { headers: getAuthHeader() }),
   getMyJobs: () => axios.get(`${API_URL}/jobs/my/posted`, { headers: getAuthHeader() }),
@@ -22,8 +26,8 @@ export const api = {
     axios.get(`${API_URL}/applications/job/${jobId}`, { headers: getAuthHeader() }),
 
   // Mentors
-  getMentors: (skip = 0, limit = 20) =>
-    axios.get(`${API_URL}/mentors?skip=${skip}&limit=${limit}`, { headers: getAuthHeader() }),
+  getMentors: (skip = 0, limit = 20, cursor = null) =>
+    axios.get(`${API_URL}/mentors?${pageParams(skip, limit, cursor)}`, { headers: getAuthHeader() }),
   getMentor: (id) => axios.get(`${API_URL}/mentors/${id}`, { headers: getAuthHeader() }),
   createMentorProfile: (data) =>
     axios.post(`${API_URL}/mentors/profile`, data, { headers: getAuthHeader() }),
@@ -34,10 +38,16 @@ export const api = {
 
   // Messages
   sendMessage: (data) => axios.post(`${API_URL}/messages`, data, { headers: getAuthHeader() }),
-  getConversation: (userId) =>
-    axios.get(`${API_URL}/messages/${userId}`, { headers: getAuthHeader() }),
+  // params: { before } for older history or { after } for messages since the last page;
+  // the X-Before-Cursor / X-After-Cursor response headers carry the next positions
+  getConversation: (userId, params = {}) =>
+    axios.get(`${API_URL}/messages/${userId}`, { params, headers: getAuthHeader() }),
   getConversations: () =>
     axios.get(`${API_URL}/messages/conversations/list`, { headers: getAuthHeader() }),
+  // Browsers cannot set headers on a WebSocket, and a token in the URL would end
+  // up in access logs, so the token is sent as the socket's first frame
+  chatSocketUrl: () => `${API_URL.replace(/^http/, 'ws')}/ws/chat`,
+  chatSocketAuthFrame: () => ({ type: 'auth', token: localStorage.getItem('token') }),
 
   // Profile
   updateProfile: (data) => axios.put(`${API_URL}/profile`, data, { headers: getAuthHeader() }),
@@ -45,6 +55,12 @@ export const api = {
 
   // AI
   matchJobs: () => axios.post(`${API_URL}/ai/match-jobs`, {}, { headers: getAuthHeader() }),
+  getJobSeekerPreferences: () =>
+    axios.get(`${API_URL}/ai/job-seeker-preferences`, { headers: getAuthHeader() }),
+  getNewMatches: (limit = 5) =>
+    axios.get(`${API_URL}/ai/new-matches?limit=${limit}`, { headers: getAuthHeader() }),
+  markNewMatchesSeen: () =>
+    axios.post(`${API_URL}/ai/new-matches/seen`, {}, { headers: getAuthHeader() }),
 
   // Payments
   createPaymentOrder: (data) =>
@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import httpx
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Configure the server before it is imported: an unused Mongo URL (tests swap
+# in mongomock), the offline LLM stub, inline scoring and a throwaway ANN dir
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'bharatvapari_test')
+os.environ['LLM_PROVIDER'] = 'stub'
+os.environ['LLM_STUB_DELAY'] = '0'
+os.environ['MATCH_POOL_WORKERS'] = '0'
+os.environ.setdefault('ANN_INDEX_DIR', tempfile.mkdtemp(prefix='ann_index_'))
+
+import server  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture
+def db():
+    """A fresh in-memory database in place of server.db, with in-process caches cleared"""
+    mongomock_motor = pytest.importorskip('mongomock_motor')
+    original = server.db
+    server.db = mongomock_motor.AsyncMongoMockClient()['test']
+    for cache in (server.session_cache, server.insight_cache, server.insight_results):
+        cache.clear()
+    server._term_idf.update(version=None, idf=None)
+    yield server.db
+    server.db = original
+
+
+@pytest.fixture
+def api(db):
+    """An HTTP client calling the app in process"""
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url='http://test')
+
+
+@pytest.fixture
+def auth_headers():
+    """Bearer headers for a user document"""
+    def headers(user: dict) -> dict:
+        return {"Authorization": f"Bearer {server.create_token(user['id'], user['email'], user['role'])}"}
+    return headers
@@ -0,0 +1,102 @@
+"""Insight and recommendation endpoints running against the offline LLM stub (LLM_PROVIDER=stub)"""
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+SEEKER = {"id": "seeker-1", "email": "seeker@example.com", "full_name": "Asha Rao", "role": "job_seeker", "skills": ["Python", "SQL"]}
+STARTUP = {"id": "startup-1", "email": "hiring@example.com", "full_name": "Acme", "role": "startup", "company": "Acme"}
+PREFERENCES = {
+    "user_id": SEEKER['id'],
+    "completed": True,
+    "hard_skills": ["Python", "FastAPI"],
+    "experience_level": "fresher",
+    "job_types": ["full-time"],
+    "work_type": ["remote"],
+    "career_goals": ["backend engineering"],
+    "updated_at": "2026-01-01T00:00:00+00:00"
+}
+
+
+def make_job(i: int) -> dict:
+    return {
+        "id": f"job-{i}",
+        "title": f"Backend Engineer {i}",
+        "company": "Acme",
+        "posted_by": STARTUP['id'],
+        "location": "Remote",
+        "requirements": ["Python", "SQL"] if i % 2 else ["Go"],
+        "description": "Fresher backend role",
+        "job_type": "full-time",
+        "salary_range": "5-8 LPA",
+        "status": "active",
+        "created_at": f"2026-01-0{i + 1}T00:00:00+00:00"
+    }
+
+
+@pytest.fixture
+async def seeded(db):
+    await db.users.insert_many([dict(SEEKER), dict(STARTUP)])
+    await db.job_seeker_preferences.insert_one(dict(PREFERENCES))
+    await db.jobs.insert_many([make_job(i) for i in range(4)])
+    return db
+
+
+def test_make_llm_chat_honours_llm_provider(monkeypatch):
+    assert server.llm_configured()
+    assert isinstance(server.make_llm_chat(api_key=None, model="gpt-4"), server.StubLlmChat)
+
+    monkeypatch.delenv('LLM_PROVIDER')
+    monkeypatch.delenv('EMERGENT_LLM_KEY', raising=False)
+    assert not server.llm_configured()
+
+
+async def test_job_matches_start_insight_and_serve_it_once_ready(seeded, api, auth_headers):
+    headers = auth_headers(SEEKER)
+
+    response = await api.get("/api/ai/job-matches", headers=headers)
+    assert response.status_code == 200
+    matches = response.json()
+    assert matches['total_matches'] == 4
+    assert matches['best_matches'] or matches['good_matches'] or matches['stretch_matches']
+    assert matches['insights_status'] == "pending"
+    assert matches['insights_id'].startswith(f"{SEEKER['id']}.")
+
+    response = await api.get(f"/api/ai/insights/{matches['insights_id']}", params={"wait": 5}, headers=headers)
+    assert response.json() == {
+        "insights_id": matches['insights_id'],
+        "status": "ready",
+        "insight": "Insight: Your profile lines up well with your top matches.\nTip: Keep your skills list up to date."
+    }
+
+    # The same inputs are answered from the insight cache without another LLM call
+    calls = server.insight_cache_counters['llm_calls']
+    response = await api.get("/api/ai/job-matches", headers=headers)
+    again = response.json()
+    assert again['insights_status'] == "ready"
+    assert again['insights_id'] == matches['insights_id']
+    assert again['ai_insights'].startswith("Insight:")
+    assert server.insight_cache_counters['llm_calls'] == calls
+
+
+async def test_insights_are_private_to_their_owner(seeded, api, auth_headers):
+    matches = (await api.get("/api/ai/job-matches", headers=auth_headers(SEEKER))).json()
+
+    response = await api.get(f"/api/ai/insights/{matches['insights_id']}", headers=auth_headers(STARTUP))
+    assert response.status_code == 404
+
+
+async def test_generate_insights_uses_stub_for_each_role(seeded, api, auth_headers):
+    for user in (SEEKER, STARTUP):
+        response = await api.post("/api/ai/generate-insights", headers=auth_headers(user))
+        assert response.status_code == 200
+        assert response.json()['insight'].startswith("Insight:")
+
+
+async def test_match_jobs_recommends_with_stub(seeded, api, auth_headers):
+    response = await api.post("/api/ai/match-jobs", headers=auth_headers(SEEKER))
+    assert response.status_code == 200
+    body = response.json()
+    assert body['recommendations'] == "Stub recommendation"
+    assert [job['id'] for job in body['jobs']] == [f"job-{i}" for i in range(4)]
@@ -0,0 +1,149 @@
+"""LSH nearest-neighbour indexes for jobs and job seekers"""
+import numpy as np
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+def unit_vectors(rng: np.random.Generator, n: int, dimensions: int) -> np.ndarray:
+    vectors = rng.standard_normal((n, dimensions)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def ann(monkeypatch, tmp_path):
+    """Fresh, empty indexes persisted under a per-test directory"""
+    monkeypatch.setattr(server, 'job_ann_index', server.LSHIndex("jobs"))
+    monkeypatch.setattr(server, 'seeker_ann_index', server.LSHIndex("seekers"))
+    monkeypatch.setattr(server, 'ANN_INDEX_DIR', tmp_path)
+    monkeypatch.setattr(server, 'run_in_background', lambda coro: coro.close())
+    monkeypatch.setattr(server, '_ann_last_sync', {"at": 0.0})
+    return tmp_path
+
+
+def test_queries_find_near_duplicates():
+    rng = np.random.default_rng(0)
+    vectors = unit_vectors(rng, 2000, 32)
+    index = server.LSHIndex("test", dimensions=32, tables=16, bits=8)
+    index.add_many([f"item-{i}" for i in range(2000)], vectors)
+    assert len(index) == 2000
+
+    queries = unit_vectors(rng, 50, 32) * 0.1 + vectors[:50]
+    found = [index.query(q / np.linalg.norm(q), 5) for q in queries]
+    assert sum(result[0] == f"item-{i}" for i, result in enumerate(found)) >= 48
+    assert all(len(result) <= 5 for result in found)
+
+    # Probing neighbouring buckets trades latency for recall
+    assert len(index.query(queries[0], 2000, probes=1)) > len(index.query(queries[0], 2000, probes=0))
+
+
+def test_removed_and_replaced_items_leave_the_buckets():
+    rng = np.random.default_rng(2)
+    vectors = unit_vectors(rng, 3, 16)
+    index = server.LSHIndex("test", dimensions=16, tables=4, bits=4)
+    index.add_many(["a", "b", "c"], vectors)
+
+    index.remove("b")
+    index.remove("missing")
+    assert len(index) == 2 and "b" not in index.query(vectors[1], 10, probes=4)
+    assert not any("b" in members for table in index.buckets for members in table.values())
+
+    # The freed slot is reused, and re-adding a key moves it rather than duplicating it
+    index.add("d", vectors[1])
+    index.add("a", vectors[2])
+    assert len(index) == 3 and len(index.keys) == 3
+    assert index.query(vectors[2], 2, probes=4) in (["a", "c"], ["c", "a"])
+    assert sum("a" in members for table in index.buckets for members in table.values()) == 4
+
+
+def test_saved_indexes_load_identically(tmp_path):
+    rng = np.random.default_rng(3)
+    vectors = unit_vectors(rng, 50, 24)
+    index = server.LSHIndex("jobs", dimensions=24, tables=8, bits=6)
+    index.add_many([f"job-{i}" for i in range(50)], vectors)
+    index.remove("job-7")
+    index.synced_at = "2026-01-01T00:00:00+00:00"
+    index.save(tmp_path)
+    index.save(tmp_path)
+    assert [p.name for p in tmp_path.iterdir()] == ["jobs.npz"]
+
+    loaded = server.LSHIndex("jobs", dimensions=24, tables=8, bits=6)
+    assert loaded.load(tmp_path)
+    assert len(loaded) == 49 and loaded.synced_at == index.synced_at
+    for i in range(0, 50, 5):
+        assert loaded.query(vectors[i], 5) == index.query(vectors[i], 5)
+
+    # An index built with other parameters, or never saved, is rebuilt instead
+    assert not server.LSHIndex("jobs", dimensions=24, tables=8, bits=7).load(tmp_path)
+    assert not server.LSHIndex("seekers", dimensions=24, tables=8, bits=6).load(tmp_path)
+
+
+def test_indexes_are_used_only_when_ready_and_large_enough(monkeypatch):
+    monkeypatch.setattr(server, 'ANN_MIN_ITEMS', 2)
+    index = server.LSHIndex("test", dimensions=8, tables=2, bits=2)
+    index.add_many(["a", "b"], unit_vectors(np.random.default_rng(4), 2, 8))
+    assert not index.usable()
+    index.ready = True
+    assert index.usable()
+    index.remove("a")
+    assert not index.usable()
+
+
+async def test_build_and_sync_follow_the_database(db, ann):
+    await db.jobs.insert_many([
+        {"id": "job-1", "title": "Engineer", "company": "Acme", "status": "active", "requirements": ["Python"], "location": "Remote", "created_at": "2026-01-01"},
+        {"id": "job-2", "title": "Designer", "company": "Acme", "status": "closed", "requirements": ["Figma"], "location": "Pune", "created_at": "2026-01-01"},
+    ])
+    await db.users.insert_many([
+        {"id": "seeker-1", "role": "job_seeker", "skills": ["Python"], "updated_at": "2026-01-01"},
+        {"id": "seeker-2", "role": "job_seeker", "skills": ["Go"], "updated_at": "2026-01-01"},
+    ])
+    await db.job_seeker_preferences.insert_many([
+        {"user_id": "seeker-1", "completed": True, "hard_skills": ["SQL"], "work_type": ["remote"], "updated_at": "2026-01-01"},
+        {"user_id": "seeker-2", "completed": False, "hard_skills": [], "updated_at": "2026-01-01"},
+    ])
+
+    await server.build_ann_indexes()
+    assert set(server.job_ann_index.slots) == {"job-1"}
+    assert set(server.seeker_ann_index.slots) == {"seeker-1"}
+    assert (ann / "jobs.npz").exists() and (ann / "seekers.npz").exists()
+
+    # Writes made by another worker are picked up on the next sync
+    await db.jobs.insert_one({"id": "job-3", "title": "Analyst", "company": "Acme", "status": "active", "requirements": ["SQL"], "location": "Remote", "created_at": "2999-01-01"})
+    await db.job_seeker_preferences.update_one({"user_id": "seeker-2"}, {"$set": {"completed": True, "updated_at": "2999-01-01"}})
+    await server.sync_ann_indexes()
+    assert "job-3" not in server.job_ann_index.slots
+    await server.sync_ann_indexes(force=True)
+    assert set(server.job_ann_index.slots) == {"job-1", "job-3"}
+    assert set(server.seeker_ann_index.slots) == {"seeker-1", "seeker-2"}
+
+    vector = server.seeker_ann_vector({"skills": ["Python"]}, {"hard_skills": ["SQL"], "work_type": ["remote"]})
+    assert np.allclose(server.seeker_ann_index.matrix[server.seeker_ann_index.slots["seeker-1"]], vector)
+
+    # A restarted worker loads what was saved instead of rebuilding
+    server.job_ann_index = server.LSHIndex("jobs")
+    server.seeker_ann_index = server.LSHIndex("seekers")
+    await db.jobs.delete_many({})
+    await server.build_ann_indexes()
+    assert set(server.job_ann_index.slots) == {"job-1"}
+
+
+async def test_seeker_matches_score_only_nearest_jobs_but_count_the_catalog(db, ann, monkeypatch):
+    monkeypatch.setattr(server, 'ANN_MIN_ITEMS', 1)
+    monkeypatch.setattr(server, 'ANN_CANDIDATES', 3)
+    skills = [["Python", "SQL"], ["Figma"], ["Go"], ["Python"], ["Sales"], ["Python", "SQL", "Docker"]]
+    await db.jobs.insert_many([
+        {"id": f"job-{i}", "title": f"Role {i}", "company": "Acme", "status": "active", "requirements": s, "location": "Remote", "created_at": "2026-01-01"}
+        for i, s in enumerate(skills)
+    ])
+    await db.users.insert_one({"id": "seeker-1", "role": "job_seeker", "skills": ["Python"], "updated_at": "2026-01-01"})
+    await db.job_seeker_preferences.insert_one({"user_id": "seeker-1", "completed": True, "hard_skills": ["SQL"], "work_type": ["remote"], "updated_at": "2026-01-01"})
+    await server.build_ann_indexes()
+
+    await server.recompute_seeker_matches("seeker-1")
+    state = await db.match_state.find_one({"key": "seeker:seeker-1"})
+    assert state['total'] == 6
+    assert await db.match_scores.count_documents({"user_id": "seeker-1", "side": "seeker"}) == 3
+    assert "job-0" in {row["job_id"] async for row in db.match_scores.find({"user_id": "seeker-1"})}
@@ -0,0 +1,121 @@
+"""In-process caches: TTLCache bounds and the resolved session cache"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+USER = {"id": "startup-1", "email": "hiring@example.com", "full_name": "Acme", "role": "startup"}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A controllable time.monotonic"""
+    now = [1000.0]
+    monkeypatch.setattr(server.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = server.TTLCache(maxsize=3, ttl=60)
+    for key in "abc":
+        cache.set(key, key.upper())
+
+    assert cache.get("a") == "A"  # a is now the most recent
+    cache.set("d", "D")
+
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in "acd"] == ["A", "C", "D"]
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 3
+
+
+def test_ttl_cache_expires_entries(clock):
+    cache = server.TTLCache(maxsize=10, ttl=60)
+    cache.set("default", 1)
+    cache.set("short", 2, ttl=5)
+
+    clock[0] += 10
+    assert cache.get("short") is None
+    assert cache.get("default") == 1
+
+    clock[0] += 60
+    assert cache.get("default", "gone") == "gone"
+    stats = cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"], stats["hit_rate"]) == (0, 1, 2, 0.3333)
+
+
+def test_ttl_cache_discard_where_and_disabled_cache():
+    cache = server.TTLCache(maxsize=10, ttl=60)
+    for i in range(6):
+        cache.set(f"token-{i}", {"id": f"user-{i % 2}"})
+
+    assert cache.discard_where(lambda user: user["id"] == "user-0") == 3
+    assert [cache.get(f"token-{i}") is None for i in range(6)] == [True, False] * 3
+
+    disabled = server.TTLCache(maxsize=0, ttl=60)
+    disabled.set("a", 1)
+    assert disabled.get("a") is None
+
+
+def test_cached_session_never_outlives_its_expiry(clock):
+    server.session_cache.clear()
+    server.cache_session("soon", dict(USER), datetime.now(timezone.utc) + timedelta(seconds=5))
+    server.cache_session("expired", dict(USER), datetime.now(timezone.utc) - timedelta(seconds=5))
+
+    assert server.session_cache.get("expired") is None
+    assert server.session_cache.get("soon") == USER
+    clock[0] += 6
+    assert server.session_cache.get("soon") is None
+
+
+@pytest.fixture
+async def session(db):
+    await db.users.insert_one(dict(USER, password="hashed"))
+    await db.user_sessions.insert_one({
+        "user_id": USER['id'],
+        "session_token": "session-1",
+        "expires_at": datetime.now(timezone.utc) + timedelta(days=7)
+    })
+    return {"Authorization": "Bearer session-1"}
+
+
+async def test_session_cache_skips_lookups_until_invalidated(db, api, session):
+    response = await api.get("/api/auth/me", headers=session)
+    assert response.json()['full_name'] == "Acme"
+    assert "password" not in response.json()
+
+    # Served from the cache, so a write behind the server's back is not seen
+    await db.users.update_one({"id": USER['id']}, {"$set": {"full_name": "Stale"}})
+    response = await api.get("/api/auth/me", headers=session)
+    assert response.json()['full_name'] == "Acme"
+
+    # A profile update drops the user's cached tokens
+    response = await api.put("/api/profile", json={"full_name": "Acme Labs"}, headers=session)
+    assert response.status_code == 200
+    assert server.session_cache.get("session-1") is None
+    response = await api.get("/api/auth/me", headers=session)
+    assert response.json()['full_name'] == "Acme Labs"
+
+
+async def test_logout_drops_the_cached_session(db, api, session):
+    assert (await api.get("/api/auth/me", headers=session)).status_code == 200
+    assert server.session_cache.get("session-1") is not None
+
+    assert (await api.post("/api/auth/logout", headers=session)).status_code == 200
+    response = await api.get("/api/auth/me", headers=session)
+    assert response.status_code == 401
+
+
+async def test_jwt_sessions_are_cached_and_invalidated_per_user(db, api, auth_headers):
+    await db.users.insert_one(dict(USER))
+    headers = auth_headers(USER)
+    assert (await api.get("/api/auth/me", headers=headers)).status_code == 200
+
+    await db.users.delete_one({"id": USER['id']})
+    assert (await api.get("/api/auth/me", headers=headers)).status_code == 200
+
+    assert server.invalidate_user_sessions(USER['id']) == 1
+    assert (await api.get("/api/auth/me", headers=headers)).status_code == 404
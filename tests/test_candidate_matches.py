@@ -0,0 +1,69 @@
+"""Candidate matches load the pool with one aggregation instead of per-seeker lookups"""
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+STARTUP = {"id": "startup-1", "email": "hiring@example.com", "full_name": "Acme", "role": "startup"}
+JOB = {
+    "id": "job-1",
+    "title": "Backend Engineer",
+    "company": "Acme",
+    "posted_by": STARTUP['id'],
+    "location": "Remote",
+    "requirements": ["Python"],
+    "description": "Fresher backend role",
+    "job_type": "full-time",
+    "status": "active"
+}
+JOB_PREFS = {"job_id": JOB['id'], "must_have_skills": [], "good_to_have_skills": [], "ideal_experience": "fresher", "updated_at": "2026-01-01T00:00:00+00:00"}
+
+
+def make_seeker(i: int, role: str = "job_seeker", completed: bool = True) -> tuple[dict, dict]:
+    user = {"id": f"user-{i}", "email": f"user{i}@example.com", "full_name": f"User {i}", "role": role, "password": "hashed", "skills": ["Python"]}
+    preferences = {"user_id": user['id'], "completed": completed, "hard_skills": ["Python"], "experience_level": "fresher", "work_type": ["remote"], "text_vector": {"1": 1.0}}
+    return user, preferences
+
+
+@pytest.fixture
+async def pool(db):
+    seekers = [make_seeker(i) for i in range(6)] + [make_seeker(6, completed=False), make_seeker(7, role="mentor")]
+    await db.users.insert_many([dict(STARTUP)] + [dict(user) for user, _ in seekers])
+    await db.job_seeker_preferences.insert_many([dict(prefs) for _, prefs in seekers])
+    await db.jobs.insert_one(dict(JOB))
+    await db.startup_job_preferences.insert_one(dict(JOB_PREFS))
+    return db
+
+
+async def test_pipeline_joins_completed_seekers_with_their_users(pool):
+    docs = await pool.job_seeker_preferences.aggregate(server.candidate_pool_pipeline()).to_list(None)
+
+    assert sorted(doc['user_id'] for doc in docs) == [f"user-{i}" for i in range(6)]
+    for doc in docs:
+        assert doc['user']['id'] == doc['user_id']
+        assert "password" not in doc['user'] and "_id" not in doc['user']
+        assert "_id" not in doc and "text_vector" not in doc
+
+    limited = await pool.job_seeker_preferences.aggregate(server.candidate_pool_pipeline(limit=2, include_text=True)).to_list(None)
+    assert len(limited) == 2 and all("text_vector" in doc for doc in limited)
+
+
+async def test_candidate_matches_make_no_per_seeker_lookups(pool, api, auth_headers, monkeypatch):
+    collection = type(pool.users)
+    find_one = collection.find_one
+    lookups = []
+
+    def counting_find_one(self, *args, **kwargs):
+        lookups.append(self.name)
+        return find_one(self, *args, **kwargs)
+
+    monkeypatch.setattr(collection, 'find_one', counting_find_one)
+    response = await api.get(f"/api/ai/candidate-matches/{JOB['id']}", headers=auth_headers(STARTUP))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['total_candidates'] == 6
+    assert sorted(match['user_id'] for match in body['matches']) == [f"user-{i}" for i in range(6)]
+    assert lookups.count("users") == 0
+    assert lookups.count("job_seeker_preferences") == 0
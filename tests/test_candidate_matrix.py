@@ -0,0 +1,112 @@
+"""Scoring a startup's jobs against one shared candidate pool"""
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+STARTUP = {"id": "startup-1", "email": "hiring@example.com", "full_name": "Acme", "role": "startup"}
+OTHER_STARTUP = {"id": "startup-2", "email": "jobs@example.com", "full_name": "Globex", "role": "startup"}
+SEEKER = {"id": "seeker-00", "email": "seeker@example.com", "full_name": "Seeker", "role": "job_seeker"}
+ROLES = {
+    "job-backend": (["Python", "SQL"], ["Docker"]),
+    "job-data": (["Python", "SQL"], ["Pandas"]),
+    "job-design": (["Figma"], []),
+}
+SKILL_SETS = [["Python", "SQL", "Docker"], ["Python", "SQL", "Pandas"], ["Figma"], ["Python"], ["Go"], []]
+
+
+def job(job_id: str, posted_by: str = STARTUP['id'], status: str = "active") -> dict:
+    return {
+        "id": job_id, "title": job_id.title(), "company": "Acme", "posted_by": posted_by, "status": status,
+        "location": "Remote", "requirements": ROLES.get(job_id, (["Python"], []))[0],
+        "description": "Fresher role", "job_type": "full-time", "created_at": "2026-01-01"
+    }
+
+
+def job_prefs(job_id: str) -> dict:
+    must_have, good_to_have = ROLES.get(job_id, (["Python"], []))
+    return {"job_id": job_id, "must_have_skills": must_have, "good_to_have_skills": good_to_have, "ideal_experience": "fresher", "immediate_joiner": True}
+
+
+@pytest.fixture
+async def catalog(db):
+    seekers = [
+        {"id": f"seeker-{i:02d}", "email": f"s{i}@example.com", "full_name": f"Seeker {i}", "role": "job_seeker", "skills": SKILL_SETS[i % 6]}
+        for i in range(18)
+    ]
+    await db.users.insert_many([dict(STARTUP), dict(OTHER_STARTUP)] + seekers)
+    await db.job_seeker_preferences.insert_many([
+        {"user_id": s['id'], "completed": True, "hard_skills": SKILL_SETS[i % 6], "experience_level": ["fresher", "3-5yrs"][i % 2], "availability": "immediate"}
+        for i, s in enumerate(seekers)
+    ])
+    await db.jobs.insert_many([job(job_id) for job_id in ROLES] + [job("job-unset"), job("job-closed", status="closed"), job("job-other", OTHER_STARTUP['id'])])
+    await db.startup_job_preferences.insert_many([job_prefs(job_id) for job_id in ROLES] + [job_prefs("job-closed"), job_prefs("job-other")])
+    return {u['id']: u for u in seekers}, {
+        p['user_id']: p async for p in db.job_seeker_preferences.find({}, {"_id": 0})
+    }
+
+
+async def test_only_startups_with_their_own_configured_jobs(db, api, auth_headers):
+    await db.users.insert_many([dict(STARTUP), dict(OTHER_STARTUP), dict(SEEKER)])
+    await db.jobs.insert_many([job("job-unset"), job("job-other", OTHER_STARTUP['id'])])
+    await db.startup_job_preferences.insert_one(job_prefs("job-other"))
+
+    response = await api.post("/api/ai/candidate-matrix", json={}, headers=auth_headers(SEEKER))
+    assert response.status_code == 403
+    assert (await api.post("/api/ai/candidate-matrix", json={})).status_code in (401, 403)
+
+    # Another startup's jobs are invisible, and jobs need candidate preferences
+    response = await api.post("/api/ai/candidate-matrix", json={"job_ids": ["job-other"]}, headers=auth_headers(STARTUP))
+    assert response.status_code == 404
+    response = await api.post("/api/ai/candidate-matrix", json={}, headers=auth_headers(STARTUP))
+    assert response.status_code == 400
+
+
+async def test_matrix_ranks_each_job_and_finds_multi_role_candidates(catalog, api, auth_headers, monkeypatch):
+    monkeypatch.setattr(server, 'MATRIX_FIT_SCORE', 60)
+    users, preferences = catalog
+    response = await api.post("/api/ai/candidate-matrix", json={"top_n": 4}, headers=auth_headers(STARTUP))
+    assert response.status_code == 200
+    body = response.json()
+
+    assert body['total_candidates'] == 18
+    assert body['missing_preferences'] == ["job-unset"]
+    assert sorted(result['job_id'] for result in body['jobs']) == sorted(ROLES)
+
+    # Each job's top candidates are the ones it would rank first on its own
+    scores = {}
+    for result in body['jobs']:
+        job_id = result['job_id']
+        scored = {
+            user_id: server.score_candidate(users[user_id], job(job_id), job_prefs(job_id), preferences[user_id])
+            for user_id in users
+        }
+        scores[job_id] = {user_id: min(score.total, 100) for user_id, score in scored.items()}
+        ranked = sorted(scores[job_id], key=lambda user_id: (-scores[job_id][user_id], user_id))[:4]
+        assert [match['user_id'] for match in result['matches']] == ranked
+        assert [match['match_score'] for match in result['matches']] == [scores[job_id][user_id] for user_id in ranked]
+        assert set(result['matches'][0]) == set(server.CandidateMatch.model_fields)
+
+    multi_role = {
+        user_id: {job_id for job_id in scores if scores[job_id][user_id] >= 60}
+        for user_id in users
+    }
+    expected = {user_id: fits for user_id, fits in multi_role.items() if len(fits) >= 2}
+    assert expected
+    assert {c['user_id']: {role['job_id'] for role in c['roles']} for c in body['multi_role_candidates']} == expected
+    for candidate in body['multi_role_candidates']:
+        assert [role['match_score'] for role in candidate['roles']] == sorted((role['match_score'] for role in candidate['roles']), reverse=True)
+
+
+async def test_requested_jobs_limit_the_matrix(catalog, api, auth_headers):
+    response = await api.post(
+        "/api/ai/candidate-matrix",
+        json={"job_ids": ["job-design", "job-closed", "job-other"], "top_n": 500},
+        headers=auth_headers(STARTUP)
+    )
+    body = response.json()
+    assert [result['job_id'] for result in body['jobs']] == ["job-design"]
+    assert body['missing_preferences'] == []
+    assert len(body['jobs'][0]['matches']) == 18
+    assert body['multi_role_candidates'] == []
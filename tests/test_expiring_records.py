@@ -0,0 +1,100 @@
+"""Expiring sessions and reset codes: native timestamps, TTL indexes and the sweeper"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+USER = {"id": "seeker-1", "email": "asha@example.com", "full_name": "Asha Rao", "role": "job_seeker"}
+
+
+def hours(n: float) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(hours=n)
+
+
+def test_stored_timestamps_read_as_aware_utc():
+    aware = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+    assert server.as_utc_datetime("2026-01-01T12:00:00+00:00") == aware
+    assert server.as_utc_datetime("2026-01-01T17:30:00+05:30") == aware
+    assert server.as_utc_datetime(datetime(2026, 1, 1, 12)) == aware
+    assert server.as_utc_datetime(aware) is aware
+
+
+async def test_migration_converts_iso_strings_once(db):
+    await db.user_sessions.insert_many([
+        {"session_token": "legacy", "expires_at": hours(2).isoformat()},
+        {"session_token": "native", "expires_at": hours(2)},
+    ])
+    await db.password_resets.insert_one({"email": USER['email'], "expires_at": hours(-1).isoformat()})
+
+    assert await server.migrate_expiry_timestamps() == 2
+    assert await server.migrate_expiry_timestamps() == 0
+    for name in server.EXPIRING_COLLECTIONS:
+        async for doc in db[name].find({}):
+            assert isinstance(doc['expires_at'], datetime)
+    legacy = await db.user_sessions.find_one({"session_token": "legacy"})
+    assert abs(server.as_utc_datetime(legacy['expires_at']) - hours(2)) < timedelta(minutes=1)
+
+
+async def test_sweeper_deletes_only_expired_records(db, monkeypatch):
+    await db.user_sessions.insert_many([
+        {"session_token": "expired", "expires_at": hours(-1)},
+        {"session_token": "expired-legacy", "expires_at": hours(-1).isoformat()},
+        {"session_token": "live", "expires_at": hours(1)},
+        {"session_token": "live-legacy", "expires_at": hours(1).isoformat()},
+    ])
+    await db.password_resets.insert_many([
+        {"email": "old@example.com", "expires_at": hours(-0.5)},
+        {"email": USER['email'], "expires_at": hours(0.1)},
+    ])
+
+    assert await server.sweep_expired_records() == {"user_sessions": 2, "password_resets": 1}
+    assert sorted(await db.user_sessions.distinct("session_token")) == ["live", "live-legacy"]
+    assert await db.password_resets.distinct("email") == [USER['email']]
+
+    # A failed sweep is logged and the loop carries on to the next interval
+    calls = []
+
+    async def sweep():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("primary stepped down")
+        raise asyncio.CancelledError
+
+    monkeypatch.setattr(server, 'sweep_expired_records', sweep)
+    monkeypatch.setattr(server, 'EXPIRY_SWEEP_INTERVAL', 0)
+    with pytest.raises(asyncio.CancelledError):
+        await server.expiry_sweeper()
+    assert len(calls) == 2
+
+
+async def test_expiry_fields_carry_ttl_indexes(db):
+    assert await server.ensure_indexes(*server.EXPIRING_COLLECTIONS) == 0
+    for name in server.EXPIRING_COLLECTIONS:
+        info = await db[name].index_information()
+        ttl = [index for index in info.values() if index['key'] == [("expires_at", 1)]]
+        assert len(ttl) == 1 and ttl[0]['expireAfterSeconds'] == 0
+
+
+@pytest.mark.parametrize("expires_at, status", [(hours(1).isoformat(), 200), (hours(-1).isoformat(), 401), (hours(1), 200)])
+async def test_sessions_written_before_the_migration_still_resolve(db, api, expires_at, status):
+    await db.users.insert_one(dict(USER))
+    await db.user_sessions.insert_one({"user_id": USER['id'], "session_token": "token-1", "expires_at": expires_at})
+
+    response = await api.get("/api/auth/me", headers={"Authorization": "Bearer token-1"})
+    assert response.status_code == status
+    assert await db.user_sessions.count_documents({}) == (1 if status == 200 else 0)
+
+
+async def test_reset_codes_are_written_as_datetimes(db, api):
+    await db.users.insert_one(dict(USER))
+    response = await api.post("/api/auth/forgot-password", json={"email": USER['email']})
+    assert response.status_code == 200
+
+    reset = await db.password_resets.find_one({"email": USER['email']})
+    expires_at = server.as_utc_datetime(reset['expires_at'])
+    assert isinstance(reset['expires_at'], datetime)
+    assert hours(0) < expires_at <= hours(1 / 6)
@@ -0,0 +1,131 @@
+"""Job fan-out: bounded queue slots, claims and match feed writes"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+STARTUP = {"id": "startup-1", "email": "hiring@example.com", "full_name": "Acme", "role": "startup"}
+JOB = {
+    "title": "Backend Engineer",
+    "company": "Acme",
+    "description": "Fresher backend role with Python and SQL",
+    "requirements": ["Python", "SQL"],
+    "location": "Remote",
+    "job_type": "full-time",
+    "salary_range": "5-8 LPA"
+}
+
+
+def make_seeker(i: int, skills: list) -> tuple[dict, dict]:
+    user = {"id": f"seeker-{i}", "email": f"seeker{i}@example.com", "full_name": f"Seeker {i}", "role": "job_seeker", "skills": skills}
+    preferences = {
+        "user_id": user['id'],
+        "completed": True,
+        "hard_skills": skills,
+        "experience_level": "fresher",
+        "job_types": ["full-time"],
+        "work_type": ["remote"]
+    }
+    return user, preferences
+
+
+@pytest.fixture
+async def fanout(db, monkeypatch):
+    """Fresh fan-out queue and slots bound to the test's event loop"""
+    monkeypatch.setattr(server, 'fanout_queue', asyncio.Queue())
+    monkeypatch.setattr(server, 'fanout_capacity', asyncio.Semaphore(2))
+    monkeypatch.setattr(server, 'FANOUT_ENQUEUE_TIMEOUT', 0.05)
+    monkeypatch.setattr(server, 'FANOUT_BATCH_SIZE', 2)
+    monkeypatch.setattr(server, 'FANOUT_BATCH_PAUSE', 0)
+    monkeypatch.setattr(server, 'run_in_background', lambda coro: coro.close())
+    seekers = [make_seeker(0, ["Python", "SQL"]), make_seeker(1, ["Python"]), make_seeker(2, ["Figma"]), make_seeker(3, ["SQL", "Python"])]
+    await db.users.insert_many([dict(STARTUP)] + [dict(user) for user, _ in seekers])
+    await db.job_seeker_preferences.insert_many([dict(prefs) for _, prefs in seekers])
+    return seekers
+
+
+async def run_worker_until_idle():
+    worker = asyncio.create_task(server.fanout_worker())
+    try:
+        for _ in range(200):
+            if server.fanout_queue.empty() and server.fanout_capacity._value == 2:
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError("fan-out worker did not drain the queue")
+    finally:
+        worker.cancel()
+
+
+async def test_posting_holds_a_slot_until_fanned_out(db, api, auth_headers, fanout):
+    headers = auth_headers(STARTUP)
+    first = (await api.post("/api/jobs", json=JOB, headers=headers)).json()
+    second = (await api.post("/api/jobs", json=JOB, headers=headers)).json()
+    assert server.fanout_capacity._value == 0
+
+    # With every slot taken, posting sheds load with 503
+    response = await api.post("/api/jobs", json=JOB, headers=headers)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == "30"
+    assert await db.jobs.count_documents({}) == 2
+
+    await run_worker_until_idle()
+    assert {job['fanout'] async for job in db.jobs.find()} == {"done"}
+    feed = {(entry['user_id'], entry['job_id']) async for entry in db.match_feed.find()}
+    assert {job_id for _, job_id in feed} == {first['id'], second['id']}
+
+
+async def test_failed_post_releases_its_slot(db, api, auth_headers, fanout, monkeypatch):
+    async def failing_catalog_change():
+        raise RuntimeError("catalog unavailable")
+
+    monkeypatch.setattr(server, 'job_catalog_changed', failing_catalog_change)
+    with pytest.raises(RuntimeError):
+        await api.post("/api/jobs", json=JOB, headers=auth_headers(STARTUP))
+    assert server.fanout_capacity._value == 2
+    assert server.fanout_queue.empty()
+
+
+async def test_fanout_writes_strong_matches_once(db, fanout, monkeypatch):
+    monkeypatch.setattr(server, 'FANOUT_MIN_SCORE', 70)
+    job = {**JOB, "id": "job-1", "posted_by": STARTUP['id'], "status": "active"}
+    delivered = await server.fanout_job(job)
+
+    expected = {}
+    for user, preferences in fanout:
+        match = server.calculate_job_match_score(job, preferences, user)
+        if match.match_score >= server.FANOUT_MIN_SCORE:
+            expected[user['id']] = match.model_dump()
+    assert 0 < delivered == len(expected) < len(fanout)
+
+    entries = {entry['user_id']: entry async for entry in db.match_feed.find({}, {"_id": 0})}
+    assert {user_id: entry['match'] for user_id, entry in entries.items()} == expected
+    assert all(not entry['seen'] and entry['score'] == entry['match']['match_score'] for entry in entries.values())
+
+    # A repeated fan-out leaves the existing entries untouched
+    await db.match_feed.update_many({}, {"$set": {"seen": True}})
+    await server.fanout_job(job)
+    assert await db.match_feed.count_documents({}) == len(expected)
+    assert await db.match_feed.count_documents({"seen": False}) == 0
+
+
+async def test_startup_claims_unheld_jobs_through_the_slots(db, fanout, monkeypatch):
+    monkeypatch.setattr(server, 'fanout_capacity', asyncio.Semaphore(3))
+    now = datetime.now(timezone.utc)
+    await db.jobs.insert_many([
+        {**JOB, "id": "legacy", "posted_by": STARTUP['id'], "status": "active", "fanout": "pending"},
+        {**JOB, "id": "abandoned", "posted_by": STARTUP['id'], "status": "active", "fanout": "running", "fanout_claimed_at": now - timedelta(hours=2)},
+        {**JOB, "id": "held", "posted_by": STARTUP['id'], "status": "active", "fanout": "running", "fanout_claimed_at": now},
+        {**JOB, "id": "finished", "posted_by": STARTUP['id'], "status": "active", "fanout": "done"}
+    ])
+
+    # Two workers starting together split the jobs instead of both taking them
+    first, second = await asyncio.gather(server.requeue_fanouts(), server.requeue_fanouts())
+    assert first + second == 2
+    queued = [server.fanout_queue.get_nowait() for _ in range(server.fanout_queue.qsize())]
+    assert sorted(queued) == ["abandoned", "legacy"]
+    assert server.fanout_capacity._value == 1
+    assert {job['id'] async for job in db.jobs.find({"fanout": "running", "fanout_claimed_at": {"$gte": now}})} == {"abandoned", "legacy", "held"}
@@ -0,0 +1,147 @@
+"""Index registry bootstrap, the index usage report and unique-key races"""
+import httpx
+import pytest
+from pymongo.errors import OperationFailure
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+ADMIN = {"id": "admin-1", "email": "admin@example.com", "full_name": "Admin", "role": "admin"}
+SEEKER = {"id": "seeker-1", "email": "seeker@example.com", "full_name": "Asha Rao", "role": "job_seeker"}
+
+
+def index_keys(info: dict) -> set:
+    return {tuple(field for field, _ in index['key']) for index in info.values()}
+
+
+async def test_ensure_indexes_creates_the_registry(db):
+    assert await server.ensure_indexes() == 0
+
+    for name in {name for name, _, _ in server.INDEXES} - server.OPTIONAL_INDEX_COLLECTIONS:
+        info = await db[name].index_information()
+        for collection, keys, options in server.INDEXES:
+            if collection != name:
+                continue
+            fields = (keys,) if isinstance(keys, str) else tuple(field for field, _ in keys)
+            assert fields in index_keys(info), (name, fields)
+    assert ("key",) not in index_keys(await db.ai_insight_cache.index_information())
+
+    users = await db.users.index_information()
+    assert any(index.get('unique') and index['key'] == [("email", 1)] for index in users.values())
+    sessions = await db.user_sessions.index_information()
+    assert any(index.get('expireAfterSeconds') == 0 for index in sessions.values())
+
+
+async def test_ensure_indexes_reports_failures_and_recovers(db):
+    await db.users.insert_many([{"id": "a", "email": "dup@example.com"}, {"id": "b", "email": "dup@example.com"}])
+
+    assert await server.ensure_indexes("users") == 1
+    assert "users.email" in server.index_failures
+
+    await db.users.delete_one({"id": "b"})
+    assert await server.ensure_indexes("users") == 0
+    assert "users.email" not in server.index_failures
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return self.docs
+
+
+class FakeAdmin:
+    async def command(self, name):
+        assert name == "serverStatus"
+        return {"metrics": {"queryExecutor": {"collectionScans": {"total": 7, "nonTailable": 7}}}}
+
+
+async def test_index_report(db, api, auth_headers, monkeypatch):
+    await db.users.insert_many([dict(ADMIN), dict(SEEKER)])
+    collection = type(db.users)
+
+    def aggregate(self, pipeline, *args, **kwargs):
+        if self.name == "users":
+            return FakeCursor([
+                {"name": "email_1", "key": {"email": 1}, "accesses": {"ops": 40, "since": "2026-01-01T00:00:00"}},
+                {"name": "_id_", "key": {"_id": 1}, "accesses": {"ops": 0, "since": "2026-01-01T00:00:00"}}
+            ])
+        raise OperationFailure("not authorized to read index stats")
+
+    monkeypatch.setattr(collection, 'aggregate', aggregate)
+    monkeypatch.setattr(type(db.system.profile), 'aggregate', aggregate)
+    monkeypatch.setattr(server, 'client', type("FakeClient", (), {"admin": FakeAdmin()})())
+    server.index_failures["jobs.id"] = "E11000 duplicate key"
+    try:
+        response = await api.get("/api/admin/indexes", headers=auth_headers(ADMIN))
+    finally:
+        server.index_failures.pop("jobs.id")
+    assert response.status_code == 200
+    report = response.json()
+
+    assert set(report['collections']) == {name for name, _, _ in server.INDEXES}
+    assert [index['name'] for index in report['collections']['users']['indexes']] == ["_id_", "email_1"]
+    assert report['collections']['jobs'] == {"error": "not authorized to read index stats"}
+    assert report['failed_indexes'] == {"jobs.id": "E11000 duplicate key"}
+    assert report['collection_scans']['server'] == {"total": 7, "nonTailable": 7}
+    assert "profiled_error" in report['collection_scans']
+
+    response = await api.get("/api/admin/indexes", headers=auth_headers(SEEKER))
+    assert response.status_code == 403
+
+
+@pytest.fixture
+def racing(db, monkeypatch):
+    """The first existence check for each email or application misses, as when a concurrent request wins the race"""
+    collection = type(db.users)
+    find_one = collection.find_one
+    missed = set()
+
+    async def find_one_racing(self, filter=None, *args, **kwargs):
+        key = (self.name, repr(sorted((filter or {}).items())))
+        if self.name in ("users", "applications") and {"email", "applicant_id"} & set(filter or {}) and key not in missed:
+            missed.add(key)
+            return None
+        return await find_one(self, filter, *args, **kwargs)
+
+    monkeypatch.setattr(collection, 'find_one', find_one_racing)
+
+
+async def test_racing_registration_is_a_400(db, api, racing):
+    await server.ensure_indexes("users")
+    body = {"email": "asha@example.com", "password": "Str0ng!Passw0rd", "full_name": "Asha Rao", "role": "job_seeker"}
+
+    await db.users.insert_one({"id": "seeker-0", "email": body['email'], "role": "job_seeker"})
+    response = await api.post("/api/auth/register", json=body)
+    assert response.status_code == 400
+    assert response.json()['detail'] == "Email already registered"
+    assert await db.users.count_documents({"email": body['email']}) == 1
+
+
+async def test_racing_application_is_a_400(db, api, auth_headers, racing):
+    await server.ensure_indexes("applications")
+    await db.users.insert_one(dict(SEEKER))
+    body = {"job_id": "job-1", "cover_letter": "Hello"}
+
+    await db.applications.insert_one({"id": "application-0", "job_id": "job-1", "applicant_id": SEEKER['id']})
+    response = await api.post("/api/applications", json=body, headers=auth_headers(SEEKER))
+    assert response.status_code == 400
+    assert response.json()['detail'] == "Already applied to this job"
+    assert await db.applications.count_documents({}) == 1
+
+
+async def test_racing_google_sign_in_continues_as_the_existing_user(db, api, racing, monkeypatch):
+    await server.ensure_indexes("users")
+    await db.users.insert_one(dict(SEEKER))
+
+    async def fetch_oauth_session(session_id):
+        return httpx.Response(200, json={"email": SEEKER['email'], "name": "Asha", "picture": None, "session_token": "oauth-token"})
+
+    monkeypatch.setattr(server, 'fetch_oauth_session', fetch_oauth_session)
+    response = await api.post("/api/auth/google/session", json={}, headers={"X-Session-ID": "session-id"})
+    assert response.status_code == 200, response.text
+    assert response.json()['user']['id'] == SEEKER['id']
+    assert await db.users.count_documents({"email": SEEKER['email']}) == 1
+    assert (await db.user_sessions.find_one({"session_token": "oauth-token"}))['user_id'] == SEEKER['id']
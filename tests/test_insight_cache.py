@@ -0,0 +1,71 @@
+"""AI insight caching by prompt fingerprint, in process and in the shared Mongo tier"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+USER = {"id": "seeker-1", "full_name": "Asha Rao"}
+PREFERENCES = {"experience_level": "fresher", "hard_skills": ["Python", "SQL"], "career_goals": ["backend"], "work_type": ["remote"], "updated_at": "2026-01-01"}
+MATCHES = [
+    {"job_id": f"job-{i}", "job_title": f"Engineer {i}", "company": "Acme", "match_score": 90 - i}
+    for i in range(4)
+]
+
+
+def test_fingerprint_covers_exactly_the_prompt_inputs():
+    fingerprint = server.insight_fingerprint(USER, PREFERENCES, MATCHES)
+    assert fingerprint == server.insight_fingerprint(dict(USER), dict(PREFERENCES), [dict(m) for m in MATCHES])
+
+    # Fields the prompt does not read leave the fingerprint alone
+    assert fingerprint == server.insight_fingerprint({**USER, "email": "x@example.com"}, {**PREFERENCES, "updated_at": "2026-02-01"}, MATCHES)
+    assert fingerprint == server.insight_fingerprint(USER, PREFERENCES, MATCHES[:3] + [{**MATCHES[3], "match_score": 10}])
+
+    assert fingerprint != server.insight_fingerprint({**USER, "full_name": "Asha R"}, PREFERENCES, MATCHES)
+    assert fingerprint != server.insight_fingerprint(USER, {**PREFERENCES, "hard_skills": ["Python"]}, MATCHES)
+    assert fingerprint != server.insight_fingerprint(USER, PREFERENCES, [{**MATCHES[0], "match_score": 50}] + MATCHES[1:])
+
+
+async def test_generated_insights_are_cached_in_process(db):
+    fingerprint = server.insight_fingerprint(USER, PREFERENCES, MATCHES)
+    calls = server.insight_cache_counters['llm_calls']
+
+    insight = await server.generate_job_match_insights(USER, PREFERENCES, MATCHES, fingerprint)
+    assert insight.startswith("Insight:")
+    assert server.insight_cache_counters['llm_calls'] == calls + 1
+
+    started = await server.start_job_match_insights(USER, PREFERENCES, MATCHES)
+    assert started == {"insights_id": f"{USER['id']}.{fingerprint}", "status": "ready", "insight": insight}
+    assert server.insight_cache_counters['llm_calls'] == calls + 1
+
+
+async def test_failed_generation_is_not_cached(db, monkeypatch):
+    class FailingChat:
+        async def aask(self, messages):
+            raise RuntimeError("provider down")
+
+    monkeypatch.setattr(server, 'make_llm_chat', lambda **kwargs: FailingChat())
+    fingerprint = server.insight_fingerprint(USER, PREFERENCES, MATCHES)
+
+    assert await server.generate_job_match_insights(USER, PREFERENCES, MATCHES, fingerprint) == "AI insights temporarily unavailable"
+    assert await server.get_cached_insight(fingerprint) is None
+
+
+async def test_mongo_tier_shares_insights_across_workers(db, monkeypatch):
+    monkeypatch.setattr(server, 'INSIGHT_CACHE_MONGO', True)
+    await server.store_cached_insight("shared", "Insight: shared")
+    stored = await db.ai_insight_cache.find_one({"key": "shared"})
+    assert stored['insight'] == "Insight: shared"
+    assert stored['expires_at'].replace(tzinfo=timezone.utc) > datetime.now(timezone.utc) + timedelta(seconds=server.INSIGHT_CACHE_TTL - 60)
+
+    # Another worker's process cache starts empty and fills from Mongo
+    server.insight_cache.clear()
+    hits = server.insight_cache_counters['mongo_hits']
+    assert await server.get_cached_insight("shared") == "Insight: shared"
+    assert await server.get_cached_insight("shared") == "Insight: shared"
+    assert server.insight_cache_counters['mongo_hits'] == hits + 1
+
+    await db.ai_insight_cache.insert_one({"key": "expired", "insight": "old", "expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)})
+    assert await server.get_cached_insight("expired") is None
@@ -0,0 +1,88 @@
+"""Write-time job features: salary parsing and stored feature versions"""
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+ADMIN = {"id": "admin-1", "email": "admin@example.com", "full_name": "Admin", "role": "admin"}
+
+
+@pytest.mark.parametrize("salary_range, expected", [
+    ("50k-80k", (50000, 80000)),
+    ("20000-30000", (20000, 30000)),
+    ("30000", (30000, 30000)),
+    ("₹15,000 per month", (15000, 15000)),
+    ("Rs 25000/month", (25000, 25000)),
+    ("5-8 LPA", (41666, 66666)),
+    ("12,00,000", (100000, 100000)),
+    ("10000 stipend for 6 months", (10000, 10000)),
+    ("Stipend: 10,000 for 3 months", (10000, 10000)),
+    ("Stipend 15000", (15000, 15000)),
+    ("stipend: 10000-15000/month", (10000, 15000)),
+    ("Salary: 8-12 LPA", (66666, 100000)),
+    ("Salary: Rs 25000 per month", (25000, 25000)),
+    ("CTC - 6 LPA", (50000, 50000)),
+    ("CTC: 12,00,000", (100000, 100000)),
+    ("Stipend: 3 months, 8000/month", (8000, 8000)),
+    ("6 months internship", (None, None)),
+    ("Salary: negotiable", (None, None)),
+    ("Competitive", (None, None)),
+    ("", (None, None)),
+    (None, (None, None))
+])
+def test_parse_salary_range(salary_range, expected):
+    assert server.parse_salary_range(salary_range) == expected
+
+
+def make_job(salary_range: str) -> dict:
+    return {
+        "id": "job-1",
+        "title": "Intern",
+        "company": "Acme",
+        "location": "Remote",
+        "requirements": ["Python", " python ", "SQL"],
+        "description": "Fresher internship",
+        "job_type": "Internship",
+        "salary_range": salary_range
+    }
+
+
+def test_labelled_salaries_keep_their_score_component():
+    job = make_job("Stipend: 10,000 for 3 months")
+    features = server.extract_job_features(job)
+    assert (features['salary_min'], features['salary_max']) == (10000, 10000)
+    assert features['skill_ids'] == ["python", "sql"]
+    assert features['version'] == server.JOB_FEATURES_VERSION
+
+    matrix = server.JobFeatureMatrix([{**job, "features": features}])
+    preferences = {"salary_min": 8000, "salary_max": 12000, "hard_skills": ["Python"]}
+    match = matrix.build_match(matrix.score(preferences, {}), 0)
+    assert match.salary_match > 0
+    assert match == server.calculate_job_match_score(job, preferences, {})
+
+
+def test_outdated_stored_features_are_reextracted():
+    job = make_job("Salary: 8-12 LPA")
+    stale = {**server.extract_job_features(job), "version": server.JOB_FEATURES_VERSION - 1, "salary_min": None, "salary_max": None}
+    assert server.job_features({**job, "features": stale})['salary_min'] == 66666
+
+    current = server.extract_job_features(job)
+    assert server.job_features({**job, "features": current}) is current
+
+
+async def test_backfill_updates_only_outdated_jobs(db, api, auth_headers):
+    await db.users.insert_one(dict(ADMIN))
+    current = make_job("Stipend 15000")
+    outdated = {**make_job("CTC: 12,00,000"), "id": "job-2"}
+    await db.jobs.insert_many([
+        {**current, "status": "active", "features": server.extract_job_features(current)},
+        {**outdated, "status": "active", "features": {"version": server.JOB_FEATURES_VERSION - 1}},
+        {**make_job("30000"), "id": "job-3", "status": "active"}
+    ])
+
+    response = await api.post("/api/admin/jobs/backfill-features", headers=auth_headers(ADMIN))
+    assert response.status_code == 200
+    features = {job['id']: job['features'] async for job in db.jobs.find({}, {"_id": 0})}
+    assert {job_id: f['version'] for job_id, f in features.items()} == dict.fromkeys(["job-1", "job-2", "job-3"], server.JOB_FEATURES_VERSION)
+    assert features['job-2']['salary_max'] == 100000
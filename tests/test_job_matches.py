@@ -0,0 +1,106 @@
+"""Whole-catalog job matching: bounded top-K rows paged by category"""
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+SEEKER = {"id": "seeker-1", "email": "seeker@example.com", "full_name": "Asha Rao", "role": "job_seeker", "skills": ["Python"]}
+PREFERENCES = {
+    "user_id": SEEKER['id'],
+    "completed": True,
+    "hard_skills": ["Python", "SQL", "Docker"],
+    "experience_level": "fresher",
+    "job_types": ["full-time"],
+    "work_type": ["remote"],
+    "updated_at": "2026-01-01T00:00:00+00:00"
+}
+REQUIREMENTS = [["Python", "SQL", "Docker"], ["Python", "SQL"], ["Python", "Go"], ["Go", "Rust"], []]
+
+
+def make_job(i: int, status: str = "active") -> dict:
+    return {
+        "id": f"job-{i:02d}",
+        "title": f"Engineer {i}",
+        "company": "Acme",
+        "posted_by": "startup-1",
+        "location": "Remote" if i % 2 else "Pune",
+        "requirements": REQUIREMENTS[i % len(REQUIREMENTS)],
+        "description": "Fresher backend role",
+        "job_type": "full-time" if i % 3 else "internship",
+        "salary_range": "5-8 LPA",
+        "status": status,
+        "created_at": "2026-01-01T00:00:00+00:00"
+    }
+
+
+@pytest.fixture
+async def catalog(db, monkeypatch):
+    monkeypatch.setattr(server, 'MATCH_TOP_K', 4)
+    monkeypatch.setattr(server, 'MATCH_BATCH_SIZE', 7)
+    await db.users.insert_one(dict(SEEKER))
+    await db.job_seeker_preferences.insert_one(dict(PREFERENCES))
+    await db.jobs.insert_many([make_job(i) for i in range(30)] + [make_job(i, "closed") for i in range(30, 35)])
+    return db
+
+
+async def read_category(api, headers, category: str, first_page: list, cursor) -> list:
+    matches = list(first_page)
+    while cursor:
+        response = await api.get("/api/ai/job-matches/more", params={"category": category, "cursor": cursor, "limit": 1}, headers=headers)
+        assert response.status_code == 200
+        body = response.json()
+        matches += body['matches']
+        cursor = body['next_cursor']
+    return matches
+
+
+async def test_job_matches_keep_top_k_per_category_and_count_the_catalog(catalog, api, auth_headers):
+    headers = auth_headers(SEEKER)
+    response = await api.get("/api/ai/job-matches", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body['total_matches'] == 30
+
+    # Every active job, scored one at a time, to compare the kept rows against
+    expected = {"best": [], "good": [], "stretch": []}
+    for i in range(30):
+        match = server.calculate_job_match_score(make_job(i), PREFERENCES, SEEKER)
+        expected[match.match_category].append(match)
+
+    for category in expected:
+        matches = await read_category(api, headers, category, body[f"{category}_matches"], body['next_cursors'][category])
+        best = sorted(expected[category], key=lambda m: (-m.match_score, m.job_id))[:server.MATCH_TOP_K]
+        assert [m['job_id'] for m in matches] == [m.job_id for m in best]
+        assert matches == [m.model_dump() for m in best]
+
+
+async def test_more_pages_by_cursor(catalog, api, auth_headers):
+    headers = auth_headers(SEEKER)
+    await api.get("/api/ai/job-matches", headers=headers)
+
+    first = (await api.get("/api/ai/job-matches/more", params={"category": "good", "limit": 2}, headers=headers)).json()
+    rest = (await api.get("/api/ai/job-matches/more", params={"category": "good", "limit": 50, "cursor": first['next_cursor']}, headers=headers)).json()
+    everything = (await api.get("/api/ai/job-matches/more", params={"category": "good", "limit": 50}, headers=headers)).json()
+
+    assert first['matches'] + rest['matches'] == everything['matches']
+    assert rest['next_cursor'] is None and everything['next_cursor'] is None
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    server.encode_cursor(["x"]),
+    server.encode_cursor([80, "job-01", "extra"]),
+    server.encode_cursor(["80", "job-01"]),
+    server.encode_cursor([80, 1]),
+    server.encode_cursor([True, "job-01"])
+])
+async def test_more_rejects_malformed_cursors(catalog, api, auth_headers, cursor):
+    response = await api.get("/api/ai/job-matches/more", params={"category": "best", "cursor": cursor}, headers=auth_headers(SEEKER))
+    assert response.status_code == 400
+    assert response.json()['detail'] == "Invalid cursor"
+
+
+async def test_more_rejects_unknown_categories(catalog, api, auth_headers):
+    response = await api.get("/api/ai/job-matches/more", params={"category": "all"}, headers=auth_headers(SEEKER))
+    assert response.status_code == 400
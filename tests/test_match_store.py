@@ -0,0 +1,151 @@
+"""Materialized match rows: version stamps, dirty flags and incremental refreshes"""
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+STARTUP = {"id": "startup-1", "email": "hiring@example.com", "full_name": "Acme", "role": "startup"}
+
+
+def make_seeker(i: int, skills: list) -> tuple[dict, dict]:
+    user = {"id": f"seeker-{i}", "email": f"seeker{i}@example.com", "full_name": f"Seeker {i}", "role": "job_seeker", "skills": [], "updated_at": "2026-01-01T00:00:00+00:00"}
+    preferences = {
+        "user_id": user['id'],
+        "completed": True,
+        "hard_skills": skills,
+        "experience_level": "fresher",
+        "job_types": ["full-time"],
+        "work_type": ["remote"],
+        "updated_at": "2026-01-01T00:00:00+00:00"
+    }
+    return user, preferences
+
+
+def make_job(i: int, skills: list) -> tuple[dict, dict]:
+    job = {
+        "id": f"job-{i}",
+        "title": f"Engineer {i}",
+        "company": "Acme",
+        "posted_by": STARTUP['id'],
+        "location": "Remote",
+        "requirements": skills,
+        "description": "Fresher backend role",
+        "job_type": "full-time",
+        "status": "active",
+        "created_at": "2026-01-01T00:00:00+00:00"
+    }
+    job_prefs = {
+        "job_id": job['id'],
+        "must_have_skills": skills,
+        "good_to_have_skills": [],
+        "ideal_experience": "fresher",
+        "skill_keys": server.job_skill_keys({"must_have_skills": skills}),
+        "updated_at": "2026-01-01T00:00:00+00:00"
+    }
+    return job, job_prefs
+
+
+@pytest.fixture
+async def market(db, monkeypatch):
+    monkeypatch.setattr(server, 'CANDIDATE_FALLBACK_POOL', 0)
+    seekers = [make_seeker(0, ["Python"]), make_seeker(1, ["Go"]), make_seeker(2, ["Figma"])]
+    jobs = [make_job(0, ["Python"]), make_job(1, ["Go"]), make_job(2, ["Rust"])]
+    await db.users.insert_many([dict(STARTUP)] + [dict(user) for user, _ in seekers])
+    await db.job_seeker_preferences.insert_many([dict(prefs) for _, prefs in seekers])
+    await db.jobs.insert_many([dict(job) for job, _ in jobs])
+    await db.startup_job_preferences.insert_many([dict(prefs) for _, prefs in jobs])
+    for user, _ in seekers:
+        await server.reindex_seeker_skills(user['id'])
+    return db
+
+
+async def startup_rows(db) -> set:
+    return {(row['job_id'], row['user_id']) async for row in db.match_scores.find({"side": "startup"})}
+
+
+async def test_seeker_rows_go_stale_when_an_input_changes(market, monkeypatch):
+    user, preferences = make_seeker(0, ["Python"])
+    assert await server.seeker_matches_stale(user, preferences)
+
+    await server.recompute_seeker_matches(user['id'])
+    assert not await server.seeker_matches_stale(user, preferences)
+
+    # A catalog change alone does not invalidate the stamp
+    await server.bump_job_catalog_version()
+    assert not await server.seeker_matches_stale(user, preferences)
+
+    assert await server.seeker_matches_stale(user, {**preferences, "updated_at": "2026-02-01T00:00:00+00:00"})
+    assert await server.seeker_matches_stale({**user, "updated_at": "2026-02-01T00:00:00+00:00"}, preferences)
+    monkeypatch.setattr(server, 'MATCH_ROW_FORMAT', server.MATCH_ROW_FORMAT + 1)
+    assert await server.seeker_matches_stale(user, preferences)
+
+
+async def test_dirty_flag_forces_a_recompute(market, monkeypatch):
+    monkeypatch.setattr(server, 'run_in_background', lambda coro: coro.close())
+    user, preferences = make_seeker(0, ["Python"])
+    await server.recompute_seeker_matches(user['id'])
+
+    await server.mark_seeker_matches_dirty(user['id'])
+    assert await server.seeker_matches_stale(user, preferences)
+    assert await market.match_scores.count_documents({"user_id": user['id'], "dirty": False}) == 0
+
+    await server.recompute_seeker_matches(user['id'])
+    assert not await server.seeker_matches_stale(user, preferences)
+
+
+async def test_catalog_refresh_only_rescores_seekers_behind_it(market):
+    for i in range(3):
+        await server.recompute_seeker_matches(f"seeker-{i}")
+    assert await server.refresh_all_seeker_matches() == 0
+
+    await server.bump_job_catalog_version()
+    assert await server.refresh_all_seeker_matches() == 3
+    assert await server.refresh_all_seeker_matches() == 0
+
+
+async def test_candidate_rows_go_stale_with_job_preferences(market):
+    job, job_prefs = make_job(0, ["Python"])
+    assert await server.candidate_matches_stale(job['id'], job_prefs)
+
+    await server.recompute_candidate_matches(job, job_prefs)
+    assert await startup_rows(market) == {("job-0", "seeker-0")}
+    assert not await server.candidate_matches_stale(job['id'], job_prefs)
+    assert await server.candidate_matches_stale(job['id'], {**job_prefs, "updated_at": "2026-02-01T00:00:00+00:00"})
+
+
+async def test_seeker_refresh_rescores_existing_rows_and_flags_pools_it_may_enter(market, api, auth_headers):
+    for i in range(2):
+        job, job_prefs = make_job(i, [["Python"], ["Go"]][i])
+        await server.recompute_candidate_matches(job, job_prefs)
+    assert await startup_rows(market) == {("job-0", "seeker-0"), ("job-1", "seeker-1")}
+
+    # seeker-0 picks up Go: their job-0 row is rescored, job-1 is flagged, no row is added
+    await market.job_seeker_preferences.update_one(
+        {"user_id": "seeker-0"},
+        {"$set": {"hard_skills": ["Python", "Go"], "updated_at": "2026-02-01T00:00:00+00:00"}}
+    )
+    await server.reindex_seeker_skills("seeker-0")
+    await server.refresh_seeker_match_scores("seeker-0")
+
+    assert await startup_rows(market) == {("job-0", "seeker-0"), ("job-1", "seeker-1")}
+    row = await market.match_scores.find_one({"job_id": "job-0", "user_id": "seeker-0", "side": "startup"})
+    assert row['version']['prefs'] == "2026-02-01T00:00:00+00:00"
+    flagged = {prefs['job_id'] async for prefs in market.startup_job_preferences.find({"pool_dirty": {"$exists": True}})}
+    assert flagged == {"job-1"}
+
+    # The next read regenerates job-1's pool, which now holds seeker-0, and settles the flag
+    response = await api.get("/api/ai/candidate-matches/job-1", headers=auth_headers(STARTUP))
+    assert response.status_code == 200
+    assert sorted(match['user_id'] for match in response.json()['matches']) == ["seeker-0", "seeker-1"]
+    assert await market.startup_job_preferences.count_documents({"pool_dirty": {"$exists": True}}) == 0
+    assert ("job-2", "seeker-0") not in await startup_rows(market)
+
+
+async def test_rebuilding_the_skill_index_backfills_job_skill_keys(market):
+    await market.startup_job_preferences.update_many({}, {"$unset": {"skill_keys": ""}})
+    await market.match_state.delete_many({"key": "skill_index"})
+
+    await server.rebuild_skill_index()
+    keys = {prefs['job_id']: prefs['skill_keys'] async for prefs in market.startup_job_preferences.find()}
+    assert keys == {"job-0": ["python"], "job-1": ["go"], "job-2": ["rust"]}
@@ -0,0 +1,87 @@
+"""Vectorized job scoring agrees with scoring one job at a time"""
+import random
+
+import numpy as np
+import pytest
+
+import server
+
+SKILLS = ['Python', 'python', ' React  JS ', 'SQL', 'Go', 'Java', 'Figma', 'Machine Learning']
+LOCATIONS = ['Remote', 'Pune', 'Hybrid - Delhi', 'Bangalore', 'Remote / Hybrid', '']
+WORDS = 'python react fresher backend developer data sql startup intern design cloud api'.split()
+SALARIES = ['', '5-8 LPA', '20000-30000', '₹15,000 per month', '10000 stipend for 6 months', '50k-80k', 'Competitive']
+
+
+def random_job(rng: random.Random, i: int) -> dict:
+    return {
+        "id": f"job-{i}",
+        "title": f"Role {i}",
+        "company": rng.choice(["Acme", "Globex"]),
+        "location": rng.choice(LOCATIONS),
+        "requirements": rng.sample(SKILLS, rng.randint(0, 4)),
+        "description": " ".join(rng.choices(WORDS, k=10)) + rng.choice(["", " fresher", " 1-3 years", " intern"]),
+        "job_type": rng.choice(["Full-time", "internship", "part-time", "contract"]),
+        "salary_range": rng.choice(SALARIES)
+    }
+
+
+def random_seeker(rng: random.Random, i: int) -> tuple[dict, dict]:
+    user = {"id": f"seeker-{i}", "skills": rng.sample(SKILLS, rng.randint(0, 3))}
+    preferences = {
+        "hard_skills": rng.sample(SKILLS, rng.randint(0, 3)),
+        "job_types": rng.sample(["full-time", "Internship", "part-time"], rng.randint(0, 2)),
+        "work_type": rng.sample(["Remote", "hybrid", "onsite"], rng.randint(0, 2)),
+        "preferred_locations": rng.sample(["pune", "delhi", "mumbai"], rng.randint(0, 2)),
+        "salary_min": rng.choice([None, 0, 10000, 25000, 32000, 60000, 70000]),
+        "salary_max": rng.choice([None, 30000, 90000]),
+        "experience_level": rng.choice(["student", "fresher", "1-3yrs", "3-5yrs"]),
+        "resume_text": " ".join(rng.choices(WORDS, k=12))
+    }
+    return user, preferences
+
+
+@pytest.fixture(params=[None, "idf"], ids=["lexical", "semantic"])
+def idf(request):
+    if request.param is None:
+        return None
+    return np.random.default_rng(0).uniform(1, 4, server.TEXT_DIMENSIONS)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_job_feature_matrix_matches_scalar_scoring(seed, idf):
+    rng = random.Random(seed)
+    jobs = [random_job(rng, i) for i in range(40)]
+    matrix = server.JobFeatureMatrix(jobs)
+
+    for i in range(15):
+        user, preferences = random_seeker(rng, i)
+        scores = matrix.score(preferences, user, idf)
+        for row, job in enumerate(jobs):
+            expected = server.calculate_job_match_score(job, preferences, user, idf)
+            assert matrix.build_match(scores, row) == expected, (job, preferences)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_seeker_feature_matrix_matches_job_feature_matrix(seed, idf):
+    rng = random.Random(seed)
+    seekers = [random_seeker(rng, i) for i in range(30)]
+    matrix = server.SeekerFeatureMatrix(seekers)
+
+    for i in range(15):
+        job = random_job(rng, i)
+        scores = matrix.score(job, idf)
+        for row, (user, preferences) in enumerate(seekers):
+            expected = server.calculate_job_match_score(job, preferences, user, idf)
+            assert matrix.build_match(job, scores, row) == expected, (job, preferences)
+
+
+def test_scores_round_trip_through_stored_records():
+    rng = random.Random(7)
+    jobs = [random_job(rng, i) for i in range(10)]
+    user, preferences = random_seeker(rng, 0)
+    matrix = server.JobFeatureMatrix(jobs)
+    scores = matrix.score(preferences, user)
+
+    for row in range(len(jobs)):
+        record = matrix.job_score(scores, row)
+        assert server.explain_job_score(server.JobScore.from_doc(record.to_doc())) == matrix.build_match(scores, row)
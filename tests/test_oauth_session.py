@@ -0,0 +1,76 @@
+"""OAuth session exchange over the shared client, with bounded retries"""
+import httpx
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+SESSION = {"email": "asha@example.com", "name": "Asha Rao", "picture": None, "session_token": "oauth-token"}
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """Serve the session-data endpoint from a scripted list of replies
+
+    Each reply is a status code, or an exception to raise as a transport error.
+    """
+    requests, replies = [], []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        reply = replies.pop(0) if len(replies) > 1 else replies[0]
+        if isinstance(reply, Exception):
+            raise reply
+        return httpx.Response(reply, json=SESSION if reply == 200 else {"detail": "error"})
+
+    client = httpx.AsyncClient(base_url=server.OAUTH_BASE_URL, transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(server, '_oauth_client', client)
+    monkeypatch.setattr(server, 'OAUTH_RETRIES', 2)
+    return requests, replies
+
+
+async def test_server_errors_are_retried_until_success(provider):
+    requests, replies = provider
+    replies.extend([503, 502, 200])
+
+    response = await server.fetch_oauth_session("session-1")
+    assert response.status_code == 200 and response.json() == SESSION
+    assert len(requests) == 3
+    assert {r.headers['X-Session-ID'] for r in requests} == {"session-1"}
+    assert requests[0].url.path == "/auth/v1/env/oauth/session-data"
+
+
+@pytest.mark.parametrize("reply, attempts", [(500, 3), (401, 1), (httpx.ConnectError("refused"), 3)])
+async def test_attempts_are_bounded_whatever_fails(db, api, provider, reply, attempts):
+    requests, replies = provider
+    replies.append(reply)
+
+    response = await api.post("/api/auth/google/session", json={}, headers={"X-Session-ID": "session-1"})
+    assert len(requests) == attempts
+    assert response.status_code == (500 if isinstance(reply, Exception) else 400)
+    assert await db.users.count_documents({}) == 0
+
+
+async def test_sign_in_creates_the_user_and_session(db, api, provider):
+    requests, replies = provider
+    replies.append(200)
+
+    response = await api.post("/api/auth/google/session", json={"role": "startup"}, headers={"X-Session-ID": "session-1"})
+    assert response.status_code == 200
+    assert response.json()['user']['role'] == "startup"
+    assert response.cookies['session_token'] == "oauth-token"
+    user = await db.users.find_one({"email": SESSION['email']})
+    assert (await db.user_sessions.find_one({"session_token": "oauth-token"}))['user_id'] == user['id']
+
+
+async def test_one_client_is_shared_until_closed(monkeypatch):
+    monkeypatch.setattr(server, '_oauth_client', None)
+    client = server.get_oauth_client()
+    assert server.get_oauth_client() is client
+    assert str(client.base_url).rstrip('/') == server.OAUTH_BASE_URL
+
+    await client.aclose()
+    replacement = server.get_oauth_client()
+    assert replacement is not client and not replacement.is_closed
+    await replacement.aclose()
@@ -0,0 +1,156 @@
+"""Keyset cursors walk a listing exactly once, newest first"""
+import random
+
+import pytest
+from fastapi import HTTPException
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+def make_rows(n: int, seed: int = 0) -> list:
+    """Rows with plenty of created_at ties and a few rows missing it"""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        created_at = rng.choice([None, "2026-01-01T00:00:00+00:00", "2026-01-02T00:00:00+00:00", "2026-01-03T00:00:00+00:00"])
+        row = {"id": f"row-{i:03d}", "status": "active" if i % 3 else "closed"}
+        if created_at is not None or rng.random() < 0.5:
+            row["created_at"] = created_at
+        rows.append(row)
+    return rows
+
+
+def expected_order(rows: list, id_field: str = "id") -> list:
+    dated = sorted((r for r in rows if r.get("created_at")), key=lambda r: (r["created_at"], r[id_field]), reverse=True)
+    undated = sorted((r for r in rows if not r.get("created_at")), key=lambda r: r[id_field], reverse=True)
+    return [r[id_field] for r in dated + undated]
+
+
+async def read_all(collection, query: dict, limit: int, **kwargs) -> list:
+    seen, cursor = [], None
+    while True:
+        docs, cursor = await server.read_page(collection, query, limit, cursor, **kwargs)
+        seen += docs
+        if not cursor:
+            return seen
+
+
+@pytest.mark.parametrize("limit", [1, 3, 7, 50])
+async def test_cursor_pages_cover_every_row_once_in_order(db, limit):
+    rows = make_rows(40)
+    await db.items.insert_many([dict(r) for r in rows])
+
+    seen = await read_all(db.items, {}, limit)
+    assert [doc["id"] for doc in seen] == expected_order(rows)
+    assert all("_id" not in doc for doc in seen)
+
+    active = [r for r in rows if r["status"] == "active"]
+    seen = await read_all(db.items, {"status": "active"}, limit)
+    assert [doc["id"] for doc in seen] == expected_order(active)
+
+
+async def test_cursor_pages_by_a_custom_id_field(db):
+    rows = [{"user_id": r["id"], **{k: v for k, v in r.items() if k != "id"}} for r in make_rows(20, seed=1)]
+    await db.mentors.insert_many([dict(r) for r in rows])
+
+    seen = await read_all(db.mentors, {}, 4, id_field="user_id")
+    assert [doc["user_id"] for doc in seen] == expected_order(rows, "user_id")
+
+
+async def test_last_page_has_no_cursor(db):
+    await db.items.insert_many([dict(r) for r in make_rows(5)])
+
+    docs, cursor = await server.read_page(db.items, {}, 5)
+    assert len(docs) == 5
+    assert cursor is None
+
+
+async def test_skip_is_honoured_without_a_cursor(db):
+    rows = make_rows(12)
+    await db.items.insert_many([dict(r) for r in rows])
+
+    docs, cursor = await server.read_page(db.items, {}, 4, skip=4)
+    assert [doc["id"] for doc in docs] == expected_order(rows)[4:8]
+
+    # A cursor takes precedence over skip
+    after, _ = await server.read_page(db.items, {}, 4, cursor, skip=4)
+    assert [doc["id"] for doc in after] == expected_order(rows)[8:12]
+
+
+async def test_limit_is_clamped(db):
+    await db.items.insert_many([{"id": f"row-{i:03d}", "created_at": "2026-01-01"} for i in range(server.MAX_PAGE_SIZE + 5)])
+
+    docs, cursor = await server.read_page(db.items, {}, 1000)
+    assert len(docs) == server.MAX_PAGE_SIZE
+    assert cursor
+
+    docs, _ = await server.read_page(db.items, {}, 0)
+    assert len(docs) == 1
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", server.encode_cursor({"a": 1}), server.encode_cursor(["only-one"])])
+async def test_invalid_cursor_is_rejected(db, cursor):
+    with pytest.raises(HTTPException) as raised:
+        await server.read_page(db.items, {}, 10, cursor)
+    assert raised.value.status_code == 400
+
+
+async def test_job_listing_pages_through_next_cursor_header(db, api):
+    rows = make_rows(30, seed=2)
+    await db.jobs.insert_many([
+        {
+            **r,
+            "created_at": r.get("created_at") or "2025-12-31T00:00:00+00:00",
+            "title": "Engineer",
+            "company": "Acme",
+            "description": "Backend role",
+            "requirements": ["Python"],
+            "location": "Remote",
+            "job_type": "full-time",
+            "posted_by": "startup-1"
+        }
+        for r in rows
+    ])
+    active = [r for r in rows if r["status"] == "active"]
+
+    seen, params = [], {"limit": 4}
+    while True:
+        response = await api.get("/api/jobs", params=params)
+        assert response.status_code == 200
+        seen += [job["id"] for job in response.json()]
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params = {"limit": 4, "cursor": response.headers["X-Next-Cursor"]}
+
+    assert sorted(seen) == sorted(r["id"] for r in active)
+    assert len(seen) == len(set(seen))
+
+    response = await api.get("/api/jobs", params={"cursor": "not base64!"})
+    assert response.status_code == 400
+
+
+async def test_seeker_matches_page_by_score_then_job_id(db):
+    jobs = [
+        {"id": f"job-{i}", "title": "Engineer", "company": "Acme", "location": "Remote", "job_type": "full-time", "requirements": ["Python"] if i % 2 else ["Go"], "description": "Backend role"}
+        for i in range(8)
+    ]
+    matrix = server.JobFeatureMatrix(jobs)
+    scores = matrix.score({"hard_skills": ["Python"], "work_type": ["remote"]}, {"skills": []})
+    records = [matrix.job_score(scores, row) for row in range(len(jobs))]
+    await db.match_scores.insert_many([
+        {"user_id": "seeker-1", "side": "seeker", "category": "best", "job_id": r.job_id, "score": r.total, "sub": r.to_doc()}
+        for r in records
+    ] + [{"user_id": "seeker-2", "side": "seeker", "category": "best", "job_id": "job-x", "score": 99, "sub": records[0].to_doc()}])
+
+    seen, cursor = [], None
+    while True:
+        matches, cursor = await server.read_seeker_matches("seeker-1", "best", 3, cursor)
+        seen += matches
+        if not cursor:
+            break
+
+    expected = sorted(records, key=lambda r: (-r.total, r.job_id))
+    assert [m["job_id"] for m in seen] == [r.job_id for r in expected]
+    assert [m["match_score"] for m in seen] == [r.total for r in expected]
@@ -0,0 +1,99 @@
+"""bcrypt on a bounded thread pool: load shedding and rehash on login"""
+import asyncio
+import threading
+
+import bcrypt
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+PASSWORD = "Sup3r$ecret!"
+USER = {"id": "seeker-1", "email": "asha@example.com", "full_name": "Asha Rao", "role": "job_seeker"}
+
+
+@pytest.fixture
+def password_pool(monkeypatch):
+    """A private one-thread hashing pool at a cheap bcrypt cost"""
+    monkeypatch.setattr(server, 'BCRYPT_ROUNDS', 4)
+    monkeypatch.setattr(server, 'PASSWORD_HASH_WORKERS', 1)
+    monkeypatch.setattr(server, '_password_pool', None)
+    monkeypatch.setattr(server, 'password_hash_counters', dict.fromkeys(server.password_hash_counters, 0))
+    yield
+    if server._password_pool is not None:
+        server._password_pool.shutdown()
+
+
+@pytest.fixture
+def background(monkeypatch):
+    """Background coroutines, collected to be awaited by the test"""
+    scheduled = []
+    monkeypatch.setattr(server, 'run_in_background', scheduled.append)
+    return scheduled
+
+
+async def test_hashes_verify_and_record_their_cost(password_pool):
+    hashed = await server.hash_password(PASSWORD)
+    assert hashed.startswith("$2b$04$")
+    assert await server.verify_password(PASSWORD, hashed)
+    assert not await server.verify_password("wrong", hashed)
+    assert not await server.verify_password(PASSWORD, None)
+
+    stats = server.password_hash_stats()
+    assert stats['rounds'] == 4 and stats['pending'] == 0
+    assert (stats['hashes'], stats['verifies'], stats['rejected']) == (1, 2, 0)
+    assert stats['hash_ms']['max'] > 0
+
+    assert not server.password_needs_rehash(hashed)
+    assert server.password_needs_rehash(bcrypt.hashpw(b"x", bcrypt.gensalt(5)).decode())
+    assert not server.password_needs_rehash("not-a-bcrypt-hash")
+
+
+async def test_saturated_pool_sheds_logins_with_503(db, api, password_pool, monkeypatch):
+    monkeypatch.setattr(server, 'PASSWORD_HASH_QUEUE_SIZE', 1)
+    await db.users.insert_one({**USER, "password": bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(4)).decode()})
+
+    # Hold the only slot with a call that blocks its worker thread
+    release = threading.Event()
+    held = asyncio.ensure_future(server.run_password_task(release.wait))
+    await asyncio.sleep(0)
+    assert server.password_hash_pending == 1
+
+    response = await api.post("/api/auth/login", json={"email": USER['email'], "password": PASSWORD})
+    assert response.status_code == 503
+    assert response.headers['retry-after'] == "5"
+    assert server.password_hash_counters['rejected'] == 1
+
+    release.set()
+    assert await held is True
+    assert server.password_hash_pending == 0
+    response = await api.post("/api/auth/login", json={"email": USER['email'], "password": PASSWORD})
+    assert response.status_code == 200
+
+
+async def test_login_rehashes_passwords_at_the_current_cost(db, api, password_pool, background, monkeypatch):
+    old_hash = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(5)).decode()
+    await db.users.insert_one({**USER, "password": old_hash})
+
+    response = await api.post("/api/auth/login", json={"email": USER['email'], "password": PASSWORD})
+    assert response.status_code == 200 and "password" not in response.json()['user']
+    assert len(background) == 1
+    await background.pop()
+
+    new_hash = (await db.users.find_one({"id": USER['id']}))['password']
+    assert new_hash.startswith("$2b$04$") and bcrypt.checkpw(PASSWORD.encode(), new_hash.encode())
+    assert server.password_hash_counters['rehashes'] == 1
+
+    # Current-cost hashes are left alone
+    response = await api.post("/api/auth/login", json={"email": USER['email'], "password": PASSWORD})
+    assert response.status_code == 200 and background == []
+
+
+async def test_rehash_never_overwrites_a_changed_password(db, password_pool):
+    old_hash = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(5)).decode()
+    await db.users.insert_one({**USER, "password": "changed-meanwhile"})
+
+    await server.rehash_password(USER['id'], PASSWORD, old_hash)
+    assert (await db.users.find_one({"id": USER['id']}))['password'] == "changed-meanwhile"
+    assert server.password_hash_counters['rehashes'] == 0
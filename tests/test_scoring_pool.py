@@ -0,0 +1,83 @@
+"""Scores computed on the process pool equal scores computed inline"""
+import random
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+SKILLS = ['Python', 'SQL', 'Go', 'React', 'Figma', 'Docker']
+
+
+@pytest.fixture
+def scoring_pool(monkeypatch):
+    """A real two-worker pool, used for any pool of at least one candidate"""
+    monkeypatch.setattr(server, 'MATCH_POOL_WORKERS', 2)
+    monkeypatch.setattr(server, 'MATCH_POOL_MIN_CANDIDATES', 1)
+    monkeypatch.setattr(server, 'MATCH_POOL_BATCH_SIZE', 7)
+    monkeypatch.setattr(server, '_scoring_pool', None)
+    yield
+    if server._scoring_pool is not None:
+        server._scoring_pool.shutdown()
+
+
+def random_candidates(rng: random.Random, n: int) -> list:
+    return [
+        server.compact_candidate(
+            {"id": f"seeker-{i}", "full_name": f"Seeker {i}", "skills": rng.sample(SKILLS, rng.randint(0, 3)), "password": "hashed"},
+            {
+                "user_id": f"seeker-{i}",
+                "hard_skills": rng.sample(SKILLS, rng.randint(0, 3)),
+                "experience_level": rng.choice(["student", "fresher", "1-3yrs", "3-5yrs"]),
+                "availability": rng.choice(["immediate", "1 month", None]),
+                "work_type": rng.sample(["remote", "hybrid", "onsite"], rng.randint(0, 2)),
+                "career_goals": rng.sample(["backend", "startup", "design"], rng.randint(0, 2)),
+                "resume_text": "ignored"
+            }
+        )
+        for i in range(n)
+    ]
+
+
+async def test_pooled_candidate_scores_equal_inline_scores(scoring_pool):
+    rng = random.Random(3)
+    records = random_candidates(rng, 40)
+    job = {"id": "job-1", "title": "Engineer", "location": "Remote / Pune", "requirements": ["Python"], "description": "Backend"}
+    job_prefs = {"must_have_skills": ["Python", "SQL"], "good_to_have_skills": ["Docker"], "ideal_experience": "fresher", "immediate_joiner": True}
+
+    pooled = await server.score_candidates(job, job_prefs, records)
+    assert server._scoring_pool is not None
+    assert pooled == server.score_candidate_batch(job, job_prefs, records)
+
+
+async def test_pooled_seeker_recompute_writes_the_same_rows(db, scoring_pool, monkeypatch):
+    rng = random.Random(5)
+    await db.users.insert_one({"id": "seeker-1", "role": "job_seeker", "skills": ["Python"], "updated_at": "2026-01-01"})
+    await db.job_seeker_preferences.insert_one({
+        "user_id": "seeker-1", "completed": True, "hard_skills": ["Python", "SQL"], "experience_level": "fresher",
+        "job_types": ["full-time"], "work_type": ["remote"], "salary_min": 30000, "updated_at": "2026-01-01"
+    })
+    await db.jobs.insert_many([
+        {
+            "id": f"job-{i:02d}", "title": f"Engineer {i}", "company": "Acme", "status": "active",
+            "location": rng.choice(["Remote", "Pune", "Hybrid - Delhi"]), "requirements": rng.sample(SKILLS, rng.randint(0, 3)),
+            "description": "Fresher backend role", "job_type": rng.choice(["full-time", "internship"]),
+            "salary_range": rng.choice(["", "5-8 LPA", "20000-40000"])
+        }
+        for i in range(30)
+    ])
+    monkeypatch.setattr(server, 'MATCH_BATCH_SIZE', 8)
+
+    async def rows() -> list:
+        return await db.match_scores.find({}, {"_id": 0, "updated_at": 0}).sort("job_id", 1).to_list(None)
+
+    await server.recompute_seeker_matches("seeker-1")
+    pooled = await rows()
+    assert server._scoring_pool is not None
+
+    await db.match_scores.delete_many({})
+    monkeypatch.setattr(server, 'MATCH_POOL_WORKERS', 0)
+    await server.recompute_seeker_matches("seeker-1")
+    assert pooled == await rows()
+    assert len(pooled) == 30
@@ -0,0 +1,74 @@
+"""Inverted skill index postings and candidate generation from them"""
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def add_seeker(db, i: int, skills: list, hard_skills: list = (), completed: bool = True, role: str = "job_seeker"):
+    await db.users.insert_one({"id": f"seeker-{i}", "email": f"seeker{i}@example.com", "full_name": f"Seeker {i}", "role": role, "skills": skills})
+    await db.job_seeker_preferences.insert_one({"user_id": f"seeker-{i}", "completed": completed, "hard_skills": list(hard_skills), "experience_level": "fresher"})
+    await server.reindex_seeker_skills(f"seeker-{i}")
+
+
+async def postings(db, user_id: str) -> dict:
+    return {p['skill']: p['active'] async for p in db.skill_index.find({"user_id": user_id})}
+
+
+async def test_postings_follow_profile_and_preferences(db):
+    await add_seeker(db, 0, ["Python", " React  JS "], ["python", "SQL"])
+    assert await postings(db, "seeker-0") == {"python": True, "react js": True, "sql": True}
+
+    await db.users.update_one({"id": "seeker-0"}, {"$set": {"skills": ["Go"]}})
+    await db.job_seeker_preferences.update_one({"user_id": "seeker-0"}, {"$set": {"completed": False}})
+    await server.reindex_seeker_skills("seeker-0")
+    assert await postings(db, "seeker-0") == {"go": False, "python": False, "sql": False}
+
+    await add_seeker(db, 1, ["Python"], role="mentor")
+    assert await postings(db, "seeker-1") == {}
+
+
+async def test_candidates_rank_full_overlap_first(db):
+    await add_seeker(db, 0, ["Python"])
+    await add_seeker(db, 1, ["Python", "SQL", "Go"])
+    await add_seeker(db, 2, ["SQL", "Go"])
+    await add_seeker(db, 3, ["Figma"])
+    await add_seeker(db, 4, ["Python", "SQL", "Go"], completed=False)
+
+    ranked = await server.candidate_ids_for_skills({"PYTHON", "sql", "go "})
+    assert ranked[0] == "seeker-1"
+    assert ranked[1:] == ["seeker-2", "seeker-0"]
+    assert await server.candidate_ids_for_skills({"python", "go"}, limit=1) == ["seeker-1"]
+    assert await server.candidate_ids_for_skills({"rust"}) == []
+
+
+async def test_posting_lists_are_read_newest_first_and_capped(db, monkeypatch):
+    monkeypatch.setattr(server, 'SKILL_POSTING_LIMIT', 2)
+    for i in range(4):
+        await add_seeker(db, i, ["Python"])
+        await db.skill_index.update_one({"user_id": f"seeker-{i}"}, {"$set": {"updated_at": f"2026-01-0{i + 1}T00:00:00+00:00"}})
+
+    assert sorted(await server.candidate_ids_for_skills({"python"})) == ["seeker-2", "seeker-3"]
+
+
+async def test_retrieval_uses_the_index_only_for_jobs_with_skills(db):
+    await add_seeker(db, 0, ["Python"])
+    job = {"id": "job-1", "location": "Remote"}
+
+    assert await server.retrieve_candidate_ids(job, {"must_have_skills": ["Python"], "good_to_have_skills": ["Docker"]}) == (["seeker-0"], True)
+    assert await server.retrieve_candidate_ids(job, {"must_have_skills": [], "good_to_have_skills": [" "]}) == (None, False)
+
+
+async def test_rebuild_indexes_existing_seekers_once(db):
+    await db.users.insert_one({"id": "seeker-0", "role": "job_seeker", "skills": ["Python"]})
+    await db.job_seeker_preferences.insert_one({"user_id": "seeker-0", "completed": True, "hard_skills": []})
+
+    await server.rebuild_skill_index()
+    assert await postings(db, "seeker-0") == {"python": True}
+
+    # Current-format indexes are left alone
+    await db.skill_index.delete_many({})
+    await db.skill_index.insert_one({"skill": "marker", "user_id": "nobody", "active": True})
+    await server.rebuild_skill_index()
+    assert await db.skill_index.count_documents({}) == 1
@@ -0,0 +1,96 @@
+"""TF-IDF similarity between resumes and job descriptions"""
+import numpy as np
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+JOBS = [
+    {"id": "job-0", "company": "Acme", "title": "Backend Engineer", "description": "Build REST APIs in Python and PostgreSQL for our payments team"},
+    {"id": "job-1", "company": "Acme", "title": "Product Designer", "description": "Design onboarding flows in Figma with the growth team"},
+    {"id": "job-2", "company": "Acme", "title": "Data Analyst", "description": "Python notebooks and SQL dashboards for the payments team"},
+    {"id": "job-3", "company": "Acme", "title": "Intern", "description": ""},
+]
+
+
+def dense(vector: dict, idf: np.ndarray) -> np.ndarray:
+    row = np.zeros(server.TEXT_DIMENSIONS)
+    row[vector['terms']] = np.array(vector['weights']) * idf[vector['terms']]
+    return row
+
+
+def test_text_vectors_drop_stopwords_and_damp_repeats():
+    vector = server.text_vector("The Python and the python", None, "PYTHON for APIs")
+    assert vector == server.text_vector("python python python apis")
+    assert vector['terms'] == sorted(vector['terms'])
+    assert sorted(vector['weights']) == [1.0, round(1 + np.log(3), 4)]
+
+    assert server.text_vector("a I the", "", None) == {"terms": [], "weights": []}
+    assert server.job_text_vector(JOBS[0]) == server.text_vector(JOBS[0]['title'], JOBS[0]['description'])
+
+
+def test_stored_seeker_vectors_are_preferred():
+    stored = server.text_vector("golang")
+    assert server.seeker_text_vector({"resume_text": "python", "text_vector": stored}) == stored
+    assert server.seeker_text_vector({"resume_text": "python", "bio": "sql"}) == server.text_vector("python", "sql")
+
+
+def test_batched_similarity_is_the_tfidf_cosine():
+    matrix = server.JobFeatureMatrix(JOBS)
+    idf = np.log(5 / (np.random.default_rng(0).integers(0, 4, server.TEXT_DIMENSIONS) + 1)) + 1
+    resume = server.text_vector("Python developer, built payments APIs with PostgreSQL and SQL")
+
+    similarity = matrix.text_similarity(resume, idf)
+    query = dense(resume, idf)
+    for row, job in enumerate(JOBS):
+        document = dense(server.job_text_vector(job), idf)
+        norms = np.linalg.norm(document) * np.linalg.norm(query)
+        assert similarity[row] == pytest.approx(document @ query / norms if norms else 0)
+
+    assert similarity[0] > similarity[2] > similarity[1] == 0
+    assert not matrix.text_similarity(server.text_vector(""), idf).any()
+
+
+async def test_incremental_document_frequencies_match_a_rebuild(db):
+    await db.jobs.insert_many([dict(job) for job in JOBS])
+    await server.index_job_terms(JOBS, 1)
+    await server.index_job_terms(JOBS[1:2], -1)
+    incremental = {s['term']: s['df'] async for s in db.term_stats.find({"df": {"$gt": 0}})}
+
+    await db.jobs.delete_one({"id": "job-1"})
+    await server.rebuild_term_stats()
+    assert incremental == {s['term']: s['df'] async for s in db.term_stats.find({})}
+    assert (await db.match_state.find_one({"key": "text_corpus"}))['documents'] == 3
+
+
+async def test_idf_weights_reload_with_the_catalog_version(db):
+    await db.jobs.insert_many([dict(job) for job in JOBS])
+    await server.rebuild_term_stats()
+    payments = server.text_vector("payments")['terms'][0]
+    figma = server.text_vector("figma")['terms'][0]
+
+    idf = await server.term_idf(1)
+    assert idf[payments] == pytest.approx(np.log(5 / 3) + 1)
+    assert idf[figma] == pytest.approx(np.log(5 / 2) + 1)
+
+    await server.index_job_terms([{"id": "job-4", "title": "Payments Lead"}], 1)
+    assert await server.term_idf(1) is idf
+    assert (await server.term_idf(2))[payments] == pytest.approx(np.log(6 / 4) + 1)
+
+
+async def test_resume_similarity_adds_semantic_points(db, monkeypatch):
+    monkeypatch.setattr(server, 'SEMANTIC_MATCH_WEIGHT', 10)
+    await db.jobs.insert_many([dict(job) for job in JOBS])
+    await server.rebuild_term_stats()
+    idf = await server.term_idf(1)
+    matrix = server.JobFeatureMatrix(JOBS)
+    preferences = {"resume_text": "Backend engineer: Python REST APIs, PostgreSQL, payments"}
+
+    plain = matrix.score(preferences, {})
+    semantic = matrix.score(preferences, {}, idf)
+    assert not plain['semantic_match'].any()
+    assert semantic['semantic_match'][0] > 30 and semantic['semantic_match'][1] == 0
+    bonus = semantic['total'] - plain['total']
+    assert 3 <= bonus[0] <= 10 and bonus[1] == 0 and bonus[3] == 0
+    assert "matches the job description" in " ".join(matrix.build_match(semantic, 0).reasons)
@@ -0,0 +1,105 @@
+"""Numeric ranking first; explanations only for the rows a response returns"""
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+STARTUP = {"id": "startup-1", "email": "hiring@example.com", "full_name": "Acme", "role": "startup"}
+JOB = {
+    "id": "job-1",
+    "title": "Backend Engineer",
+    "company": "Acme",
+    "posted_by": STARTUP['id'],
+    "location": "Remote",
+    "requirements": ["Python", "SQL", "Docker"],
+    "description": "Fresher backend role",
+    "job_type": "full-time",
+    "status": "active"
+}
+JOB_PREFS = {
+    "job_id": JOB['id'],
+    "must_have_skills": ["Python", "SQL"],
+    "good_to_have_skills": ["Docker"],
+    "ideal_experience": "fresher",
+    "immediate_joiner": True,
+    "updated_at": "2026-01-01T00:00:00+00:00"
+}
+SKILL_SETS = [["Python", "SQL", "Docker"], ["Python"], ["SQL", "Go"], []]
+
+
+def make_candidate(i: int) -> tuple[dict, dict]:
+    user = {"id": f"seeker-{i:02d}", "email": f"seeker{i}@example.com", "full_name": f"Seeker {i}", "role": "job_seeker", "skills": SKILL_SETS[i % 4]}
+    preferences = {
+        "user_id": user['id'],
+        "completed": True,
+        "hard_skills": SKILL_SETS[(i + 1) % 4],
+        "experience_level": ["fresher", "student", "1-3yrs"][i % 3],
+        "availability": ["immediate", "1 month"][i % 2],
+        "work_type": ["remote"],
+        "career_goals": ["backend"]
+    }
+    return user, preferences
+
+
+@pytest.fixture
+def counted(monkeypatch):
+    """Calls made to each explanation builder"""
+    calls = {"job": 0, "candidate": 0}
+    explain_job_score, explain_candidate_score = server.explain_job_score, server.explain_candidate_score
+
+    def job(*args, **kwargs):
+        calls["job"] += 1
+        return explain_job_score(*args, **kwargs)
+
+    def candidate(*args, **kwargs):
+        calls["candidate"] += 1
+        return explain_candidate_score(*args, **kwargs)
+
+    monkeypatch.setattr(server, 'explain_job_score', job)
+    monkeypatch.setattr(server, 'explain_candidate_score', candidate)
+    return calls
+
+
+def test_stored_candidate_records_explain_like_fresh_ones():
+    for i in range(8):
+        user, preferences = make_candidate(i)
+        score = server.score_candidate(user, JOB, JOB_PREFS, preferences)
+        restored = server.CandidateScore.from_doc(score.to_doc())
+        assert server.explain_candidate_score(restored, JOB) == server.explain_candidate_score(score, JOB)
+        assert restored.experience_match == score.experience_match
+
+
+async def test_candidate_matches_explain_only_the_returned_rows(db, api, auth_headers, counted, monkeypatch):
+    monkeypatch.setattr(server, 'CANDIDATE_FALLBACK_POOL', 100)
+    candidates = [make_candidate(i) for i in range(60)]
+    await db.users.insert_many([dict(STARTUP)] + [dict(user) for user, _ in candidates])
+    await db.job_seeker_preferences.insert_many([dict(prefs) for _, prefs in candidates])
+    await db.jobs.insert_one(dict(JOB))
+    await db.startup_job_preferences.insert_one(dict(JOB_PREFS))
+
+    response = await api.get(f"/api/ai/candidate-matches/{JOB['id']}", headers=auth_headers(STARTUP))
+    body = response.json()
+    assert body['total_candidates'] == 60
+    assert len(body['matches']) == 50
+    assert counted["candidate"] == 50
+
+    # The returned rows are the 50 best, ranked on the numeric phase alone
+    scores = sorted(
+        ((-server.score_candidate(user, JOB, JOB_PREFS, prefs).total, user['id']) for user, prefs in candidates)
+    )
+    assert [match['user_id'] for match in body['matches']] == [user_id for _, user_id in scores[:50]]
+
+
+async def test_seeker_match_pages_explain_only_their_rows(db, counted):
+    jobs = [{**JOB, "id": f"job-{i:02d}", "requirements": SKILL_SETS[i % 4]} for i in range(12)]
+    matrix = server.JobFeatureMatrix(jobs)
+    scores = matrix.score({"hard_skills": ["Python", "SQL"], "work_type": ["remote"]}, {"skills": []})
+    await db.match_scores.insert_many([
+        {"user_id": "seeker-1", "side": "seeker", "category": "good", "job_id": job['id'], "score": int(scores["total"][row]), "sub": matrix.job_score(scores, row).to_doc()}
+        for row, job in enumerate(jobs)
+    ])
+
+    matches, cursor = await server.read_seeker_matches("seeker-1", "good", 5)
+    assert len(matches) == 5 and cursor
+    assert counted["job"] == 5
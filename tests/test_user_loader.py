@@ -0,0 +1,85 @@
+"""UserLoader coalesces user lookups into batched $in queries"""
+import asyncio
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def users(db):
+    await db.users.insert_many([
+        {"id": f"user-{i}", "email": f"user{i}@example.com", "full_name": f"User {i}", "role": "mentor", "password": "hashed"}
+        for i in range(5)
+    ])
+    return db.users
+
+
+@pytest.fixture
+def user_queries(db, monkeypatch):
+    """The filters of every find() issued against db.users"""
+    queries = []
+    collection = type(db.users)
+    find = collection.find
+
+    def recording_find(self, *args, **kwargs):
+        if self.name == 'users':
+            queries.append(args[0] if args else kwargs.get('filter'))
+        return find(self, *args, **kwargs)
+
+    monkeypatch.setattr(collection, 'find', recording_find)
+    return queries
+
+
+async def test_load_many_is_one_query_in_order(users, user_queries):
+    loader = server.UserLoader()
+    loaded = await loader.load_many(["user-3", "missing", "user-0", "user-3"])
+
+    assert [user and user['id'] for user in loaded] == ["user-3", None, "user-0", "user-3"]
+    assert all("password" not in user and "_id" not in user for user in loaded if user)
+    assert len(user_queries) == 1
+    assert sorted(user_queries[0]['id']['$in']) == ["missing", "user-0", "user-3"]
+
+
+async def test_concurrent_loads_are_coalesced_and_remembered(users, user_queries):
+    loader = server.UserLoader()
+    first, second, third = await asyncio.gather(loader.load("user-1"), loader.load("user-2"), loader.load("user-1"))
+    assert (first['id'], second['id'], third['id']) == ("user-1", "user-2", "user-1")
+    assert len(user_queries) == 1
+
+    # Ids already fetched are not queried again; new ones go in a new batch
+    loaded = await loader.load_many(["user-2", "user-4"])
+    assert [user['id'] for user in loaded] == ["user-2", "user-4"]
+    assert [query['id']['$in'] for query in user_queries[1:]] == [["user-4"]]
+
+
+async def test_loader_projection(users):
+    loader = server.UserLoader({"_id": 0, "id": 1, "full_name": 1})
+    assert await loader.load("user-0") == {"id": "user-0", "full_name": "User 0"}
+
+
+async def test_query_errors_reach_every_waiter(users, monkeypatch):
+    loader = server.UserLoader()
+
+    def failing_find(self, *args, **kwargs):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(type(users), 'find', failing_find)
+    results = await asyncio.gather(loader.load("user-0"), loader.load("user-1"), return_exceptions=True)
+    assert [str(result) for result in results] == ["database unavailable"] * 2
+
+
+async def test_mentor_listing_loads_users_in_one_query(db, api, users, user_queries):
+    await db.mentor_profiles.insert_many([
+        {"user_id": f"user-{i}", "expertise": ["Product"], "created_at": f"2026-01-0{i + 1}T00:00:00+00:00"}
+        for i in range(4)
+    ])
+
+    response = await api.get("/api/mentors")
+    assert response.status_code == 200
+    mentors = response.json()
+    assert [mentor['user_id'] for mentor in mentors] == ["user-3", "user-2", "user-1", "user-0"]
+    assert [mentor['user']['full_name'] for mentor in mentors] == ["User 3", "User 2", "User 1", "User 0"]
+    assert len(user_queries) == 1